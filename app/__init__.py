@@ -4,7 +4,9 @@ from flask_bcrypt import Bcrypt
 from flask_login import LoginManager
 from flask_mail import Mail
 from config import Config
+import click
 import os
+import sys
 
 # Initialize extensions
 bcrypt = Bcrypt()
@@ -39,7 +41,8 @@ def create_app(config_class=Config):
         return Admin.get(admin_id)
 
     # Ensure upload folders exist based on the configuration
-    for folder_key in ['UPLOAD_FOLDER', 'RESUME_FOLDER', 'SCREENSHOT_FOLDER']:
+    for folder_key in ['UPLOAD_FOLDER', 'RESUME_FOLDER', 'SCREENSHOT_FOLDER', 'SCREENSHOT_THUMBNAIL_FOLDER',
+                       'TTS_CACHE_FOLDER']:
         folder_path = app.config.get(folder_key)
         if folder_path and not os.path.exists(folder_path):
             os.makedirs(folder_path)
@@ -56,6 +59,70 @@ def create_app(config_class=Config):
     app.register_blueprint(interview_bp, url_prefix='/api/interview')
     app.register_blueprint(main_bp)
 
+    from app.services.metrics import init_metrics
+    init_metrics(app)
+
+    from app.services.transcript_services import backfill_interview_turns
+
+    @app.cli.command('backfill-interview-turns')
+    def backfill_interview_turns_command():
+        """Copies legacy interviews.transcript_json blobs into the interview_turns table."""
+        migrated = backfill_interview_turns()
+        print(f"Migrated transcripts for {migrated} interviews.")
+
+    from app.services.dashboard_counters import rebuild_all_status_counts
+
+    @app.cli.command('rebuild-dashboard-counters')
+    def rebuild_dashboard_counters_command():
+        """Recomputes company_status_counts from the jobs and interviews tables."""
+        if rebuild_all_status_counts():
+            print("Dashboard counters rebuilt.")
+        else:
+            print("Database connection failed; counters not rebuilt.")
+
+    from app.services.migrations import upgrade, stamp, migration_status, MigrationError
+
+    @app.cli.command('db-upgrade')
+    @click.option('--to', 'target', type=int, default=None, help='Stop after this migration version.')
+    def db_upgrade_command(target):
+        """Applies pending schema migrations from MIGRATIONS_FOLDER."""
+        try:
+            applied = upgrade(target)
+        except MigrationError as e:
+            print(f"Migration failed: {e}")
+            sys.exit(1)
+        print(f"Applied {len(applied)} migration(s)." if applied else "Schema is up to date.")
+
+    @app.cli.command('db-status')
+    def db_status_command():
+        """Lists schema migrations and whether each has been applied."""
+        for migration in migration_status():
+            state = f"applied {migration['applied_at']}" if migration['applied'] else "pending"
+            if migration['modified']:
+                state += " (file changed since)"
+            print(f"{migration['version']:04d}_{migration['name']}: {state}")
+
+    @app.cli.command('db-stamp')
+    @click.argument('version', type=int)
+    def db_stamp_command(version):
+        """Marks migrations up to VERSION as applied without running them (for existing databases)."""
+        stamped = stamp(version)
+        print(f"Stamped {len(stamped)} migration(s) as applied.")
+
+    from app.services.query_plan_check import check_query_plans
+
+    @app.cli.command('db-check-indexes')
+    def db_check_indexes_command():
+        """EXPLAINs the hot queries and exits non-zero if any of them needs a full table scan."""
+        failures, warnings = check_query_plans()
+        for warning in warnings:
+            print(f"warning: {warning}")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if failures:
+            sys.exit(1)
+        print("All hot queries can use an index.")
+
     app.logger.info("Application created and blueprints registered.")
 
     return app
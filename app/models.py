@@ -1,5 +1,17 @@
+from flask import current_app
 from flask_login import UserMixin
 from app.services.db_services import get_db_connection
+from app.services.cache_utils import TTLCache
+
+
+def _get_admin_cache():
+    cache = current_app.extensions.get('admin_cache')
+    if cache is None:
+        cache = TTLCache(maxsize=current_app.config.get('ADMIN_CACHE_SIZE', 1024),
+                         ttl=current_app.config.get('ADMIN_CACHE_TTL', 300))
+        current_app.extensions['admin_cache'] = cache
+    return cache
+
 
 class Admin(UserMixin):
     def __init__(self, id, email, name, company_id):
@@ -10,13 +22,31 @@ class Admin(UserMixin):
 
     @staticmethod
     def get(admin_id):
+        """
+        Loads an admin for Flask-Login. Runs on every authenticated request, so admins are kept
+        in a bounded per-process TTL cache; call Admin.invalidate() after changing an admin's row.
+        """
+        cache = _get_admin_cache()
+        admin = cache.get(admin_id)
+        if admin is not None:
+            return admin
+
         conn = get_db_connection()
         if not conn:
             return None
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM admins WHERE id = %s", (admin_id,))
-        admin_data = cursor.fetchone()
-        conn.close()
+        try:
+            cursor.execute("SELECT id, email, name, company_id FROM admins WHERE id = %s", (admin_id,))
+            admin_data = cursor.fetchone()
+        finally:
+            conn.close()
         if admin_data:
-            return Admin(id=admin_data['id'], email=admin_data['email'], name=admin_data['name'], company_id=admin_data['company_id'])
+            admin = Admin(id=admin_data['id'], email=admin_data['email'], name=admin_data['name'], company_id=admin_data['company_id'])
+            cache.set(admin_id, admin)
+            return admin
         return None
+
+    @staticmethod
+    def invalidate(admin_id):
+        """Drops an admin from this process's cache (other workers expire it within ADMIN_CACHE_TTL)."""
+        _get_admin_cache().invalidate(admin_id)
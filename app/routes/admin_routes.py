@@ -1,13 +1,23 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, send_file
 from flask_login import login_required, current_user
-from app.services.db_services import get_db_connection, serialize_datetime_in_obj, generate_id
+from app.services.db_services import get_db_connection, serialize_datetime_in_obj, generate_id, get_pool_stats
+from app.services.job_queue import get_latest_job, ANALYSIS_JOB
+from app.services.tts_cache import get_tts_cache
+from app.services.transcript_services import load_transcript
+from app.services.screenshot_services import list_screenshots, generate_thumbnail
+from app.services.ai_services import get_http_client_stats
+from app.services.invite_services import create_invite_batch, get_invite_batch
+from app.services.pagination import encode_cursor, decode_cursor, keyset_condition
+from app.services.cache_utils import TTLCache
+from app.services.search_services import search_interviews, parse_search_terms
+from app.services.dashboard_counters import (read_dashboard_summary, record_job_created, record_job_status_change,
+                                             record_job_deleted, record_interview_status_change)
+from app.services.usage_services import usage_report, USAGE_GROUPS, USAGE_GRANULARITIES
 from flask import current_app
-from app import mail
-from flask_mail import Message
 import datetime
 import traceback
 import json
-import uuid
+import os
 
 admin_bp = Blueprint('admin_bp', __name__)
 
@@ -42,6 +52,7 @@ def manage_jobs():
                 current_user.id, company_id,
                 data.get('number_of_questions', 5), data.get('must_ask_topics')
             ))
+            record_job_created(cursor, company_id, data.get('status', 'Open'))
             conn.commit()
 
             cursor.execute("SELECT * FROM jobs WHERE id = %s", (new_job_id,))
@@ -52,9 +63,7 @@ def manage_jobs():
         if conn.is_connected(): conn.rollback()
         return jsonify({"message": "An unexpected error occurred"}), 500
     finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+        conn.close()
 
 
 @admin_bp.route('/jobs/<job_id>', methods=['GET', 'PUT', 'DELETE'])
@@ -67,7 +76,9 @@ def manage_job_detail(job_id):
 
     try:
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM jobs WHERE id = %s AND company_id = %s", (job_id, company_id))
+        # PUT/DELETE lock the row so concurrent edits adjust the counters from the status they actually replace.
+        locking = " FOR UPDATE" if request.method in ['PUT', 'DELETE'] else ""
+        cursor.execute(f"SELECT * FROM jobs WHERE id = %s AND company_id = %s{locking}", (job_id, company_id))
         job = cursor.fetchone()
         if not job: return jsonify({"message": "Job not found or access denied"}), 404
 
@@ -94,15 +105,20 @@ def manage_job_detail(job_id):
             values.append(company_id)
             query = f"UPDATE jobs SET {', '.join(fields_to_update)}, updated_at = %s WHERE id = %s AND company_id = %s"
             cursor.execute(query, tuple(values));
+            if 'status' in data: record_job_status_change(cursor, company_id, job['status'], data['status'])
             conn.commit()
 
             cursor.execute("SELECT * FROM jobs WHERE id = %s", (job_id,))
             return jsonify(serialize_datetime_in_obj(cursor.fetchone())), 200
 
         if request.method == 'DELETE':
+            record_job_deleted(cursor, company_id, job_id, job['status'])
             cursor.execute("DELETE FROM jobs WHERE id = %s AND company_id = %s", (job_id, company_id))
+            if cursor.rowcount == 0:
+                # Deleted concurrently: undo the counter adjustments made above.
+                conn.rollback()
+                return jsonify({"message": "Job not found or access denied"}), 404
             conn.commit()
-            if cursor.rowcount == 0: return jsonify({"message": "Job not found or access denied"}), 404
             return jsonify({"message": "Job deleted successfully"}), 200
 
     except Exception as err:
@@ -110,16 +126,19 @@ def manage_job_detail(job_id):
         if request.method in ['PUT', 'DELETE'] and conn.is_connected(): conn.rollback()
         return jsonify({"message": "An unexpected error occurred"}), 500
     finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+        conn.close()
 
 
 @admin_bp.route('/jobs/<job_id>/send-invites', methods=['POST'])
 @login_required
 def send_invites(job_id):
+    """
+    Creates the interviews and queues their invitation emails; delivery happens in the
+    background worker. Poll /jobs/<job_id>/invite-batches/<batchId> for per-address status.
+    """
     data = request.json
-    emails = [email.strip() for email in data.get('emails', '').split(',') if email.strip()]
+    # dict.fromkeys drops repeated addresses while keeping the order they were pasted in
+    emails = list(dict.fromkeys(email.strip() for email in data.get('emails', '').split(',') if email.strip()))
     if not emails:
         return jsonify({"message": "No valid email addresses provided"}), 400
 
@@ -135,47 +154,52 @@ def send_invites(job_id):
         if not job_info:
             return jsonify({"message": "Job not found or access denied"}), 404
 
-        sent_count = 0
-        failed_emails = []
-        for email in emails:
-            try:
-                interview_id = generate_id("int_")
-                invitation_link_guid = str(uuid.uuid4())
-
-                cursor.execute(
-                    "INSERT INTO interviews (id, job_id, company_id, invitation_link, status) VALUES (%s, %s, %s, %s, %s)",
-                    (interview_id, job_id, company_id, invitation_link_guid, 'Invited')
-                )
-
-                interview_link = f"http://localhost:5001/candidate_interview.html?invite={invitation_link_guid}"
-                msg = Message(
-                    subject=f"Invitation to Interview for {job_info['title']}",
-                    sender=current_app.config['MAIL_USERNAME'],
-                    recipients=[email]
-                )
-                msg.body = f"Hello,\n\nYou have been invited to an AI-powered screening interview for the {job_info['title']} position.\n\nPlease use the following link to begin your interview:\n{interview_link}\n\nBest regards,\nThe Hiring Team"
-                mail.send(msg)
-                sent_count += 1
-            except Exception as e:
-                current_app.logger.error(f"Failed to send invite to {email} for job {job_id}: {e}")
-                failed_emails.append(email)
-
+        batch_id = create_invite_batch(cursor, job_id, company_id, emails)
         conn.commit()
 
-        message = f"Successfully sent {sent_count} invites."
-        if failed_emails:
-            message += f" Failed to send to: {', '.join(failed_emails)}."
-
-        return jsonify({"message": message}), 200
+        return jsonify({"message": f"Queued {len(emails)} invites.", "batchId": batch_id, "queued": len(emails)}), 202
 
     except Exception as e:
         current_app.logger.error(f"Error sending invites for job {job_id}: {e}\n{traceback.format_exc()}")
         if conn.is_connected(): conn.rollback()
         return jsonify({"message": "An unexpected error occurred"}), 500
     finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+        conn.close()
+
+
+@admin_bp.route('/jobs/<job_id>/invite-batches/<batch_id>', methods=['GET'])
+@login_required
+def get_invite_batch_status(job_id, batch_id):
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        batch = get_invite_batch(cursor, batch_id, current_user.company_id)
+        if not batch:
+            return jsonify({"message": "Invite batch not found or access denied"}), 404
+        return jsonify(serialize_datetime_in_obj(batch)), 200
+    except Exception as e:
+        current_app.logger.error(f"Error fetching invite batch {batch_id}: {e}\n{traceback.format_exc()}")
+        return jsonify({"message": "An unexpected error occurred"}), 500
+    finally:
+        conn.close()
+
+
+# Columns returned by /interviews?view=summary: enough for list and comparison tables, without
+# the transcript, Q&A, screenshot and scorecard JSON blobs (those stay on /interviews/<id>).
+SCORECARD_CATEGORIES = ['technical_proficiency', 'communication_skills', 'alignment_with_values']
+INTERVIEW_SUMMARY_COLUMNS = ", ".join(
+    ["i.id", "i.job_id", "i.candidate_id", "i.status", "i.score", "i.interview_date", "i.created_at", "i.ai_summary"]
+    + [f"JSON_UNQUOTE(JSON_EXTRACT(i.detailed_scorecard_json, '$.{category}.score')) AS {category}_score"
+       for category in SCORECARD_CATEGORIES])
+
+
+def _parse_category_score(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None  # no scorecard yet ('null' or NULL)
 
 
 @admin_bp.route('/interviews', methods=['GET'])
@@ -192,10 +216,27 @@ def get_admin_interviews():
     sort_by = request.args.get('sort_by', 'score')
     sort_order = request.args.get('sort_order', 'desc')
     search_query = request.args.get('search', '')
+    view = request.args.get('view', 'full')
 
     allowed_sort_columns = ['score', 'interview_date', 'status']
     if sort_by not in allowed_sort_columns: sort_by = 'score'
-    if sort_order.lower() not in ['asc', 'desc']: sort_order = 'desc'
+    sort_order = sort_order.lower()
+    if sort_order not in ['asc', 'desc']: sort_order = 'desc'
+
+    # Cursor paging is opt-in (paginate=cursor, or a cursor from a previous page) so plain ?limit=N
+    # callers keep getting a list; limit+offset is kept for older callers.
+    cursor_token = request.args.get('cursor')
+    is_keyset_request = bool(cursor_token) or request.args.get('paginate') == 'cursor'
+    keyset_value = keyset_id = None
+    backwards = False
+    if is_keyset_request and (limit is None or offset is not None):
+        return jsonify({"message": "cursor paging requires limit and cannot be combined with offset"}), 400
+    if cursor_token:
+        try:
+            keyset_value, keyset_id, backwards = decode_cursor(cursor_token, sort_by, sort_order,
+                                                               datetime_columns=('interview_date',))
+        except ValueError as e:
+            return jsonify({"message": f"Invalid cursor: {e}"}), 400
 
     try:
         cursor = conn.cursor(dictionary=True)
@@ -223,21 +264,45 @@ def get_admin_interviews():
             cursor.execute(count_query, tuple(params))
             total_records = cursor.fetchone()['total']
 
+        final_params = list(params)
+        if cursor_token:
+            keyset_sql, keyset_params = keyset_condition(f"i.{sort_by}", "i.id", sort_order, keyset_value, keyset_id, backwards)
+            where_clause += f" AND {keyset_sql}"
+            final_params.extend(keyset_params)
+
+        # Walking backwards reads the preceding rows in reverse order and flips them afterwards.
+        query_order = sort_order if not backwards else ('asc' if sort_order == 'desc' else 'desc')
+        select_columns = INTERVIEW_SUMMARY_COLUMNS if view == 'summary' else "i.*"
         data_query_builder = [
-            f"SELECT i.*, j.title as job_title, c.name as candidate_name, c.email as candidate_email {base_query}{where_clause}",
-            f"ORDER BY {sort_by} {sort_order}"
+            f"SELECT {select_columns}, j.title as job_title, c.name as candidate_name, c.email as candidate_email {base_query}{where_clause}",
+            f"ORDER BY i.{sort_by} {query_order}, i.id {query_order}"
         ]
 
-        final_params = list(params)
         if is_paginated_request:
             data_query_builder.append("LIMIT %s OFFSET %s")
             final_params.extend([limit, offset])
+        elif is_keyset_request:
+            data_query_builder.append("LIMIT %s")
+            final_params.append(limit + 1)  # one extra row tells us whether another page exists
+        elif limit is not None:
+            data_query_builder.append("LIMIT %s")
+            final_params.append(limit)
 
         data_query = " ".join(data_query_builder)
         cursor.execute(data_query, tuple(final_params))
         interviews = cursor.fetchall()
 
+        has_more = False
+        if is_keyset_request:
+            has_more = len(interviews) > limit
+            interviews = interviews[:limit]
+            if backwards: interviews.reverse()
+
         for interview in interviews:
+            if view == 'summary':
+                for category in SCORECARD_CATEGORIES:
+                    interview[f"{category}_score"] = _parse_category_score(interview[f"{category}_score"])
+                continue
             for key in ['transcript_json', 'ai_questions_json', 'screenshot_paths_json', 'detailed_scorecard_json']:
                 if interview.get(key) and isinstance(interview[key], str):
                     try:
@@ -245,6 +310,23 @@ def get_admin_interviews():
                     except json.JSONDecodeError:
                         interview[key] = None
 
+        if is_keyset_request:
+            # A backwards page was reached from a later one, so it always has a next page.
+            has_next = True if backwards else has_more
+            has_prev = has_more if backwards else cursor_token is not None
+            next_cursor = prev_cursor = None
+            if interviews:
+                first, last = interviews[0], interviews[-1]
+                if has_next:
+                    next_cursor = encode_cursor(sort_by, sort_order, last[sort_by], last['id'])
+                if has_prev:
+                    prev_cursor = encode_cursor(sort_by, sort_order, first[sort_by], first['id'], backwards=True)
+            response = {"interviews": serialize_datetime_in_obj(interviews), "next_cursor": next_cursor,
+                        "prev_cursor": prev_cursor}
+            if request.args.get('include_total', 'true').lower() == 'true':
+                response["total"], response["total_is_cached"] = _count_interviews(
+                    cursor, company_id, job_id_filter, status_filter, search_query)
+            return jsonify(response), 200
         if is_paginated_request:
             return jsonify({"total": total_records, "interviews": serialize_datetime_in_obj(interviews)}), 200
         else:
@@ -253,9 +335,103 @@ def get_admin_interviews():
         current_app.logger.error(f"DB error in get_admin_interviews: {err}\n{traceback.format_exc()}")
         return jsonify({"message": "An unexpected error occurred"}), 500
     finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+        conn.close()
+
+
+def _count_interviews(cursor, company_id, job_id, status, search_query):
+    """
+    Total for the cursor-paged list, cached per filter for INTERVIEW_COUNT_CACHE_TTL seconds so
+    paging through a job does not re-count it on every page. Returns (total, served_from_cache).
+    """
+    cache = current_app.extensions.get('interview_count_cache')
+    if cache is None:
+        cache = TTLCache(maxsize=1024, ttl=current_app.config.get('INTERVIEW_COUNT_CACHE_TTL', 30))
+        current_app.extensions['interview_count_cache'] = cache
+    key = (company_id, job_id, status, search_query)
+    total = cache.get(key)
+    if total is not None:
+        return total, True
+
+    # Without a name search the joins cannot change the count, so it is answered from the interviews index alone.
+    query = "SELECT COUNT(*) AS total FROM interviews i"
+    if search_query:
+        query += " LEFT JOIN candidates c ON i.candidate_id = c.id"
+    conditions, params = ["i.company_id = %s"], [company_id]
+    if job_id:
+        conditions.append("i.job_id = %s")
+        params.append(job_id)
+    if status:
+        conditions.append("i.status = %s")
+        params.append(status)
+    if search_query:
+        conditions.append("c.name LIKE %s")
+        params.append(f"%{search_query}%")
+    cursor.execute(f"{query} WHERE {' AND '.join(conditions)}", tuple(params))
+    total = cursor.fetchone()['total']
+    cache.set(key, total)
+    return total, False
+
+
+@admin_bp.route('/search', methods=['GET'])
+@login_required
+def search():
+    """Ranked search across candidate names/emails, AI summaries and transcripts: ?q=kafka[&job_id=][&limit=]"""
+    query = request.args.get('q', '').strip()
+    if not parse_search_terms(query):
+        return jsonify({"message": "Enter at least one word of three or more characters"}), 400
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        results = search_interviews(cursor, current_user.company_id, query, limit, request.args.get('job_id'))
+        return jsonify({"query": query, "results": serialize_datetime_in_obj(results)}), 200
+    except Exception as err:
+        current_app.logger.error(f"DB error in search: {err}\n{traceback.format_exc()}")
+        return jsonify({"message": "An unexpected error occurred"}), 500
+    finally:
+        conn.close()
+
+
+@admin_bp.route('/usage', methods=['GET'])
+@login_required
+def get_usage():
+    """
+    LLM/TTS usage for the admin's company from the rollup tables:
+    ?group_by=tenant|job|interview[&from=YYYY-MM-DD][&to=YYYY-MM-DD][&granularity=total|day][&job_id=][&interview_id=][&limit=]
+    """
+    group_by = request.args.get('group_by', 'tenant')
+    granularity = request.args.get('granularity', 'total')
+    if group_by not in USAGE_GROUPS:
+        return jsonify({"message": f"group_by must be one of {', '.join(USAGE_GROUPS)}"}), 400
+    if granularity not in USAGE_GRANULARITIES:
+        return jsonify({"message": f"granularity must be one of {', '.join(USAGE_GRANULARITIES)}"}), 400
+    try:
+        end_date = datetime.date.fromisoformat(request.args['to']) if request.args.get('to') else datetime.datetime.utcnow().date()
+        start_date = datetime.date.fromisoformat(request.args['from']) if request.args.get('from') else end_date - datetime.timedelta(days=29)
+    except ValueError:
+        return jsonify({"message": "from and to must be dates in YYYY-MM-DD format"}), 400
+    if start_date > end_date:
+        return jsonify({"message": "from must not be after to"}), 400
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        rows = usage_report(cursor, current_user.company_id, group_by, start_date, end_date, granularity,
+                            request.args.get('job_id'), request.args.get('interview_id'), limit)
+        return jsonify({"group_by": group_by, "granularity": granularity if group_by != 'interview' else 'total',
+                        "from": start_date.isoformat(), "to": end_date.isoformat(),
+                        "rows": serialize_datetime_in_obj(rows)}), 200
+    except Exception as err:
+        current_app.logger.error(f"DB error in usage report: {err}\n{traceback.format_exc()}")
+        return jsonify({"message": "An unexpected error occurred"}), 500
+    finally:
+        conn.close()
 
 
 @admin_bp.route('/interviews/<interview_id>', methods=['GET'])
@@ -282,9 +458,15 @@ def get_admin_interview_detail(interview_id):
                     interview[key] = None
 
         # Aliasing for easier frontend access
-        interview['transcript'] = interview.get('transcript_json')
+        interview['transcript'] = load_transcript(cursor, interview_id, interview.get('transcript_json'))
+        conn.commit()  # persists a lazy migration of a legacy transcript_json, if one happened
         interview['questions'] = interview.get('ai_questions_json')
-        interview['screenshots'] = interview.get('screenshot_paths_json') or []
+        include_duplicates = request.args.get('include_duplicates', 'false').lower() == 'true'
+        interview['screenshots'] = list_screenshots(cursor, interview_id, interview.get('screenshot_paths_json'),
+                                                    include_duplicates)
+
+        analysis_job = get_latest_job(cursor, ANALYSIS_JOB, interview_id)
+        interview['analysis_status'] = analysis_job['status'] if analysis_job else None
 
         return jsonify(serialize_datetime_in_obj(interview)), 200
     except Exception as err:
@@ -292,9 +474,73 @@ def get_admin_interview_detail(interview_id):
             f"DB error in get_admin_interview_detail for {interview_id}: {err}\n{traceback.format_exc()}")
         return jsonify({"message": "An unexpected error occurred"}), 500
     finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+        conn.close()
+
+
+@admin_bp.route('/interviews/<interview_id>/analysis-status', methods=['GET'])
+@login_required
+def get_interview_analysis_status(interview_id):
+    """Lightweight poll target for the dashboard while the scorecard is being generated."""
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+
+    company_id = current_user.company_id
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT status FROM interviews WHERE id = %s AND company_id = %s", (interview_id, company_id))
+        interview = cursor.fetchone()
+        if not interview: return jsonify({"message": "Interview not found or access denied"}), 404
+
+        analysis_job = get_latest_job(cursor, ANALYSIS_JOB, interview_id)
+        return jsonify(serialize_datetime_in_obj({
+            "interview_status": interview['status'],
+            "analysis_status": analysis_job['status'] if analysis_job else None,
+            "attempts": analysis_job['attempts'] if analysis_job else 0,
+            "updated_at": analysis_job['updated_at'] if analysis_job else None,
+        })), 200
+    except Exception as err:
+        current_app.logger.error(
+            f"DB error in get_interview_analysis_status for {interview_id}: {err}\n{traceback.format_exc()}")
+        return jsonify({"message": "An unexpected error occurred"}), 500
+    finally:
+        conn.close()
+
+
+@admin_bp.route('/interviews/<interview_id>/screenshots/<int:screenshot_id>/thumbnail', methods=['GET'])
+@login_required
+def get_screenshot_thumbnail(interview_id, screenshot_id):
+    """Serves a screenshot's thumbnail, generating it on the spot if the background job has not yet."""
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+
+    company_id = current_user.company_id
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            "SELECT s.file_path, s.thumbnail_path FROM interview_screenshots s JOIN interviews i ON s.interview_id = i.id "
+            "WHERE s.id = %s AND s.interview_id = %s AND i.company_id = %s",
+            (screenshot_id, interview_id, company_id))
+        screenshot = cursor.fetchone()
+    finally:
+        conn.close()
+    if not screenshot: return jsonify({"message": "Screenshot not found or access denied"}), 404
+
+    thumbnail_path = None
+    if screenshot['thumbnail_path']:
+        thumbnail_path = os.path.join(current_app.config['SCREENSHOT_THUMBNAIL_FOLDER'],
+                                      os.path.basename(screenshot['thumbnail_path']))
+    if not thumbnail_path or not os.path.exists(thumbnail_path):
+        try:
+            thumbnail_path = generate_thumbnail(screenshot_id, screenshot['file_path'])
+        except Exception as err:
+            current_app.logger.error(f"Thumbnail generation failed for screenshot {screenshot_id}: {err}")
+            thumbnail_path = None
+    if not thumbnail_path: return jsonify({"message": "Thumbnail not available"}), 404
+
+    # Thumbnails never change once written.
+    return send_file(thumbnail_path, mimetype='image/webp', max_age=31536000)
 
 
 @admin_bp.route('/interviews/<interview_id>/score', methods=['POST'])
@@ -323,6 +569,7 @@ def score_interview(interview_id):
             params.append(data.get('feedback', ''))
 
         params.append(interview_id)
+        record_interview_status_change(cursor, interview_id, "Reviewed")
         query = f"UPDATE interviews SET {', '.join(update_fields)} WHERE id = %s"
         cursor.execute(query, tuple(params));
         conn.commit()
@@ -336,9 +583,7 @@ def score_interview(interview_id):
         if conn.is_connected(): conn.rollback()
         return jsonify({"message": "An unexpected error occurred"}), 500
     finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+        conn.close()
 
 
 @admin_bp.route('/dashboard-summary', methods=['GET'])
@@ -351,23 +596,32 @@ def get_dashboard_summary():
 
     try:
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT COUNT(*) as count FROM jobs WHERE status = 'Open' AND company_id = %s", (company_id,))
-        open_jobs = cursor.fetchone()['count']
-        cursor.execute("SELECT COUNT(*) as total_apps FROM interviews WHERE company_id = %s", (company_id,))
-        total_applications = cursor.fetchone()['total_apps']
-        cursor.execute("SELECT COUNT(*) as count FROM interviews WHERE status = 'Scheduled' AND company_id = %s",
-                       (company_id,))
-        interviews_scheduled = cursor.fetchone()['count']
-        cursor.execute("SELECT COUNT(*) as count FROM interviews WHERE status = 'Pending Review' AND company_id = %s",
-                       (company_id,))
-        pending_reviews = cursor.fetchone()['count']
-
-        return jsonify({"open_positions": open_jobs, "total_applications": total_applications,
-                        "interviews_scheduled": interviews_scheduled, "pending_reviews": pending_reviews}), 200
+        summary = read_dashboard_summary(cursor, company_id)
+        conn.commit()  # keeps the counters seeded on a company's first dashboard load
+        return jsonify(summary), 200
     except Exception as err:
         current_app.logger.error(f"DB error in get_dashboard_summary: {err}\n{traceback.format_exc()}")
         return jsonify({"message": "An unexpected error occurred"}), 500
     finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+        conn.close()
+
+
+@admin_bp.route('/system/db-pool', methods=['GET'])
+@login_required
+def get_db_pool_stats():
+    """Connection pool counters for the worker process that served this request."""
+    return jsonify(get_pool_stats()), 200
+
+
+@admin_bp.route('/system/tts-cache', methods=['GET'])
+@login_required
+def get_tts_cache_stats():
+    """TTS cache hit rate and bytes saved for the worker process that served this request."""
+    return jsonify(get_tts_cache().stats()), 200
+
+
+@admin_bp.route('/system/http-clients', methods=['GET'])
+@login_required
+def get_http_clients_stats():
+    """OpenAI connection reuse counters for the worker process that served this request."""
+    return jsonify(get_http_client_stats()), 200
@@ -1,7 +1,8 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_user, logout_user, login_required, current_user
 from app.services.db_services import get_db_connection, generate_id
 from app import bcrypt  # Import bcrypt from the app factory
+import traceback
 
 auth_bp = Blueprint('auth_bp', __name__)
 
@@ -47,7 +48,6 @@ def register():
         current_app.logger.error(f"Registration Error: {e}\n{traceback.format_exc()}")
         return jsonify({"message": "An unexpected error occurred during registration"}), 500
     finally:
-        cursor.close()
         conn.close()
 
 
@@ -72,6 +72,7 @@ def login():
             from app.models import Admin
             admin = Admin(id=admin_data['id'], email=admin_data['email'], name=admin_data['name'],
                           company_id=admin_data['company_id'])
+            Admin.invalidate(admin.id)  # start the session from the row just read, not a cached copy
             login_user(admin)
             return jsonify({
                 "message": "Login successful",
@@ -89,13 +90,14 @@ def login():
         current_app.logger.error(f"Login Error: {e}\n{traceback.format_exc()}")
         return jsonify({"message": "An unexpected error occurred during login"}), 500
     finally:
-        cursor.close()
         conn.close()
 
 
 @auth_bp.route('/logout', methods=['POST'])
 @login_required
 def logout():
+    from app.models import Admin
+    Admin.invalidate(current_user.id)
     logout_user()
     return jsonify({"message": "Logout successful"}), 200
 
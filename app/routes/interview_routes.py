@@ -1,26 +1,43 @@
-from flask import Blueprint, jsonify, request, Response
-from app.services.db_services import get_db_connection, generate_id, parse_resume_from_file
-from app.services.ai_services import get_llm, build_interview_messages, process_interview_results, get_openai_client
+from flask import Blueprint, jsonify, request, Response, stream_with_context, send_file
+from app.services.db_services import get_db_connection, generate_id, run_in_transaction
+from app.services.ai_services import get_llm, build_interview_messages, get_openai_client, CompletionMarkerFilter, \
+    COMPLETION_MARKER, split_into_sentences, synthesize_speech, TTS_MODEL, TTS_VOICE, TTS_FORMAT, get_resume_summary, \
+    select_prompt_history, count_tokens, invoke_llm, stream_llm, LLM_CALL_INTERVIEW_TURN
+from app.services.job_queue import enqueue_job, ANALYSIS_JOB, HISTORY_SUMMARY_JOB
+from app.services.tts_cache import get_tts_cache
+from app.services.resume_services import start_resume_extraction
+from app.services.transcript_services import append_turn, load_transcript, lock_interview_for_turns, last_turn_seq, \
+    StaleTurnError
+from app.services.dashboard_counters import record_interview_status_change
+from app.services.screenshot_services import save_screenshot_stream, store_screenshot, queue_thumbnail
+from app.services.metrics import record_tts_call, record_upload
+from app.services.usage_services import record_usage, USAGE_CALL_TTS
 import datetime
 import os
 import json
 import base64
+import io
+import struct
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app
 import uuid
 
 interview_bp = Blueprint('interview_bp', __name__)
 
 
+# Fetch company_id as well to display company-specific branding if needed
+INVITATION_LOOKUP_QUERY = "SELECT i.id as interview_id, i.status as interview_status, j.title as job_title, j.company_id FROM interviews i JOIN jobs j ON i.job_id = j.id WHERE i.invitation_link = %s"
+
+
 @interview_bp.route('/initiate/<invitation_link_guid>', methods=['GET'])
 def get_interview_by_link(invitation_link_guid):
     conn = get_db_connection()
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         cursor = conn.cursor(dictionary=True)
-        # Fetch company_id as well to display company-specific branding if needed
-        query = "SELECT i.id as interview_id, i.status as interview_status, j.title as job_title, j.company_id FROM interviews i JOIN jobs j ON i.job_id = j.id WHERE i.invitation_link = %s"
-        cursor.execute(query, (invitation_link_guid,))
+        cursor.execute(INVITATION_LOOKUP_QUERY, (invitation_link_guid,))
         data = cursor.fetchone()
         if not data: return jsonify({"message": "Invalid invitation link"}), 404
 
@@ -32,7 +49,7 @@ def get_interview_by_link(invitation_link_guid):
         current_app.logger.error(f"Error initiating interview: {e}\n{traceback.format_exc()}")
         return jsonify({"message": "An error occurred"}), 500
     finally:
-        if conn and conn.is_connected(): conn.close()
+        if conn: conn.close()
 
 
 @interview_bp.route('/<interview_id>/submit-details', methods=['POST'])
@@ -46,6 +63,7 @@ def submit_candidate_details_and_resume(interview_id):
         secure_name = str(uuid.uuid4()) + os.path.splitext(resume_file.filename)[1]
         resume_save_path = os.path.join(current_app.config['RESUME_FOLDER'], secure_name)
         resume_file.save(resume_save_path)
+        record_upload('resume', os.path.getsize(resume_save_path))
         resume_filepath_db = f"/uploads/resumes/{secure_name}"
 
         candidate_id = generate_id("cand_")
@@ -54,16 +72,139 @@ def submit_candidate_details_and_resume(interview_id):
         cursor.execute(
             "INSERT INTO candidates (id, name, email, resume_filename, created_at) VALUES (%s, %s, %s, %s, %s)",
             (candidate_id, request.form['candidateName'], request.form['candidateEmail'], resume_filepath_db, now_utc))
+        record_interview_status_change(cursor, interview_id, 'Resume Submitted')
         cursor.execute("UPDATE interviews SET candidate_id=%s, status='Resume Submitted', updated_at=%s WHERE id=%s",
                        (candidate_id, now_utc, interview_id))
         conn.commit()
+
+        # Text extraction runs in a separate process; the result lands in candidates.resume_text.
+        start_resume_extraction(candidate_id, resume_filepath_db)
         return jsonify({"message": "Details submitted.", "candidateId": candidate_id}), 200
     except Exception as e:
         current_app.logger.error(f"Error in submit-details: {e}\n{traceback.format_exc()}")
         if conn.is_connected(): conn.rollback()
         return jsonify({"message": "An error occurred."}), 500
     finally:
-        if conn and conn.is_connected(): conn.close()
+        if conn: conn.close()
+
+
+TURN_CONTEXT_QUERY = "SELECT i.transcript_json, i.history_summary, i.history_summary_upto_seq, j.description, j.number_of_questions, j.must_ask_topics, c.id as candidate_id, c.name as candidate_name, c.resume_text, c.resume_filename, c.resume_summary, c.resume_summary_version FROM interviews i JOIN jobs j ON i.job_id = j.id JOIN candidates c ON i.candidate_id = c.id WHERE i.id = %s"
+
+
+def _load_turn_context(cursor, interview_id):
+    """Loads the job, candidate and transcript needed to generate the next AI turn."""
+    cursor.execute(TURN_CONTEXT_QUERY, (interview_id,))
+    interview = cursor.fetchone()
+    if not interview: return None
+    interview['transcript'] = load_transcript(cursor, interview_id, interview.pop('transcript_json'))
+    interview['last_seq'] = last_turn_seq(interview['transcript'])
+    interview['resume_summary'] = get_resume_summary(interview)
+    return interview
+
+
+def _build_turn_messages(interview, transcript):
+    """Builds the prompt from the running summary plus recent turns, recording the verbatim history size."""
+    history_summary, recent_turns, interview['history_tokens'] = select_prompt_history(interview, transcript)
+    questions_asked = sum(1 for turn in transcript if turn['actor'] == 'ai')
+    return build_interview_messages(interview, interview['resume_summary'], interview['candidate_name'], recent_turns,
+                                    history_summary=history_summary, questions_asked=questions_asked)
+
+
+def _save_ai_turn(cursor, interview_id, response_text, starting, candidate_text=None, history_tokens=0,
+                  expected_last_seq=None):
+    """
+    Persists the candidate's answer (if any) and the AI's reply as single-row turn inserts.
+    Returns (question_text, status). Queues the post-interview analysis when the reply carries
+    the completion marker, and a history fold once the verbatim history outgrows its token budget.
+    Raises StaleTurnError if the transcript moved past expected_last_seq (a repeated submission).
+    """
+    lock_interview_for_turns(cursor, interview_id, expected_last_seq, candidate_text)
+    completed = COMPLETION_MARKER in response_text
+    question_text = response_text.replace(COMPLETION_MARKER, "").strip()
+    if candidate_text is not None:
+        append_turn(cursor, interview_id, 'candidate', candidate_text)
+    append_turn(cursor, interview_id, 'ai', question_text)
+
+    if starting:
+        record_interview_status_change(cursor, interview_id, 'In Progress')
+        cursor.execute("UPDATE interviews SET status='In Progress', updated_at=%s WHERE id=%s",
+                       (datetime.datetime.utcnow(), interview_id))
+        return question_text, 'In Progress'
+    if completed:
+        record_interview_status_change(cursor, interview_id, 'Completed')
+        cursor.execute("UPDATE interviews SET status=%s, updated_at=%s WHERE id=%s",
+                       ('Completed', datetime.datetime.utcnow(), interview_id))
+        enqueue_job(cursor, ANALYSIS_JOB, interview_id=interview_id)
+        return question_text, 'Completed'
+    if history_tokens + count_tokens(question_text) > current_app.config.get('HISTORY_VERBATIM_TOKEN_BUDGET', 1500):
+        enqueue_job(cursor, HISTORY_SUMMARY_JOB, interview_id=interview_id)
+    return question_text, 'In Progress'
+
+
+def _stale_turn_payload(error):
+    """Response body for a repeated submission: the reply stored the first time, or None if there is none."""
+    if error.replay is None:
+        return None
+    return {"question": {"text": error.replay}, "interview_status": error.status}
+
+
+STALE_TURN_MESSAGE = "This answer was already processed; reload the interview to continue."
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_ai_turn(interview_id, llm, messages, starting, candidate_text=None, history_tokens=0,
+                    expected_last_seq=None):
+    """
+    Yields the AI reply as Server-Sent Events ('token' per chunk, then 'done' or 'error').
+    The DB connection is not held while the model is generating; the turn is persisted
+    with a fresh connection once the stream has finished.
+    """
+    marker_filter = CompletionMarkerFilter()
+    parts = []
+    try:
+        for chunk in stream_llm(llm, messages, LLM_CALL_INTERVIEW_TURN, interview_id):
+            text = marker_filter.feed(chunk.content or "")
+            if text:
+                parts.append(text)
+                yield _sse('token', {"text": text})
+        tail = marker_filter.flush()
+        if tail:
+            parts.append(tail)
+            yield _sse('token', {"text": tail})
+    except Exception as e:
+        current_app.logger.error(f"LLM stream failed for interview {interview_id}: {e}\n{traceback.format_exc()}")
+        yield _sse('error', {"message": "AI service failed while responding."})
+        return
+
+    response_text = "".join(parts).strip()
+    if marker_filter.completed:
+        response_text += f"\n{COMPLETION_MARKER}"
+
+    conn = get_db_connection()
+    if not conn:
+        yield _sse('error', {"message": "Database connection failed"})
+        return
+    try:
+        question_text, status = run_in_transaction(conn, lambda cursor: _save_ai_turn(
+            cursor, interview_id, response_text, starting, candidate_text, history_tokens, expected_last_seq))
+        yield _sse('done', {"question": {"text": question_text}, "interview_status": status})
+    except StaleTurnError as e:
+        payload = _stale_turn_payload(e)
+        yield _sse('done', payload) if payload else _sse('error', {"message": STALE_TURN_MESSAGE})
+    except Exception as e:
+        current_app.logger.error(f"Error saving streamed turn for {interview_id}: {e}\n{traceback.format_exc()}")
+        if conn.is_connected(): conn.rollback()
+        yield _sse('error', {"message": "An error occurred."})
+    finally:
+        if conn: conn.close()
+
+
+def _event_stream(generator):
+    return Response(stream_with_context(generator), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @interview_bp.route('/<interview_id>/start', methods=['POST'])
@@ -76,26 +217,44 @@ def start_ai_interview(interview_id):
 
     try:
         cursor = conn.cursor(dictionary=True)
-        query = "SELECT j.description, j.number_of_questions, j.must_ask_topics, c.name as candidate_name, c.resume_filename FROM interviews i JOIN jobs j ON i.job_id = j.id JOIN candidates c ON i.candidate_id = c.id WHERE i.id = %s"
-        cursor.execute(query, (interview_id,))
-        job_data = cursor.fetchone()
-
+        job_data = _load_turn_context(cursor, interview_id)
         if not job_data: return jsonify({"message": "Interview data not found"}), 404
+        conn.commit()
 
-        resume_summary = parse_resume_from_file(job_data.get('resume_filename'))
-        messages = build_interview_messages(job_data, resume_summary, job_data['candidate_name'], [])
-        ai_response = llm.invoke(messages)
-        first_question = ai_response.content.strip()
+        ai_response = invoke_llm(llm, _build_turn_messages(job_data, []), LLM_CALL_INTERVIEW_TURN, interview_id)
+        try:
+            first_question, _ = run_in_transaction(conn, lambda cursor: _save_ai_turn(
+                cursor, interview_id, ai_response.content.strip(), starting=True,
+                expected_last_seq=job_data['last_seq']))
+        except StaleTurnError as e:
+            payload = _stale_turn_payload(e)
+            return (jsonify(payload), 200) if payload else (jsonify({"message": STALE_TURN_MESSAGE}), 409)
 
-        transcript = [{"actor": "ai", "text": first_question, "timestamp": datetime.datetime.utcnow().isoformat()}]
+        return jsonify({"question": {"text": first_question}}), 200
+    finally:
+        if conn: conn.close()
 
-        cursor.execute("UPDATE interviews SET status='In Progress', transcript_json=%s, updated_at=%s WHERE id=%s",
-                       (json.dumps(transcript), datetime.datetime.utcnow(), interview_id))
-        conn.commit()
 
-        return jsonify({"question": {"text": first_question}}), 200
+@interview_bp.route('/<interview_id>/start/stream', methods=['POST'])
+def start_ai_interview_stream(interview_id):
+    """Same as /start, but streams the greeting and first question token by token over SSE."""
+    llm = get_llm()
+    if not llm: return jsonify({"message": "AI service not available."}), 503
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        job_data = _load_turn_context(cursor, interview_id)
+        if not job_data: return jsonify({"message": "Interview data not found"}), 404
+        conn.commit()
     finally:
-        if conn and conn.is_connected(): conn.close()
+        if conn: conn.close()
+
+    messages = _build_turn_messages(job_data, [])
+    return _event_stream(_stream_ai_turn(interview_id, llm, messages, starting=True,
+                                         expected_last_seq=job_data['last_seq']))
 
 
 @interview_bp.route('/<interview_id>/next-question', methods=['POST'])
@@ -111,41 +270,61 @@ def process_candidate_response(interview_id):
 
     try:
         cursor = conn.cursor(dictionary=True)
-        query = "SELECT i.transcript_json, j.description, j.number_of_questions, j.must_ask_topics, c.name as candidate_name, c.resume_filename FROM interviews i JOIN jobs j ON i.job_id = j.id JOIN candidates c ON i.candidate_id = c.id WHERE i.id = %s"
-        cursor.execute(query, (interview_id,))
-        interview = cursor.fetchone()
+        interview = _load_turn_context(cursor, interview_id)
+        if not interview: return jsonify({"message": "Interview data not found"}), 404
+        # Commit a first-read legacy transcript migration and end the snapshot before the slow LLM call.
+        conn.commit()
 
-        transcript = json.loads(interview['transcript_json']) if isinstance(interview['transcript_json'], str) else \
-        interview['transcript_json'] or []
+        transcript = interview['transcript']
         transcript.append(
             {"actor": "candidate", "text": data['response_text'], "timestamp": datetime.datetime.utcnow().isoformat()})
 
-        resume_summary = parse_resume_from_file(interview.get('resume_filename'))
-        messages = build_interview_messages(interview, resume_summary, interview['candidate_name'], transcript)
-        ai_response = llm.invoke(messages)
-        response_text = ai_response.content.strip()
-
-        if "[INTERVIEW_COMPLETE]" in response_text:
-            next_question = response_text.replace("[INTERVIEW_COMPLETE]", "").strip()
-            new_status = 'Completed'
-            transcript.append(
-                {"actor": "ai", "text": next_question, "timestamp": datetime.datetime.utcnow().isoformat()})
-            cursor.execute("UPDATE interviews SET transcript_json=%s, status=%s WHERE id=%s",
-                           (json.dumps(transcript), new_status, interview_id))
-            conn.commit()
-            process_interview_results(interview_id)
-        else:
-            next_question = response_text
-            new_status = 'In Progress'
-            transcript.append(
-                {"actor": "ai", "text": next_question, "timestamp": datetime.datetime.utcnow().isoformat()})
-            cursor.execute("UPDATE interviews SET transcript_json=%s WHERE id=%s",
-                           (json.dumps(transcript), interview_id))
-            conn.commit()
+        ai_response = invoke_llm(llm, _build_turn_messages(interview, transcript), LLM_CALL_INTERVIEW_TURN,
+                                 interview_id)
+        try:
+            next_question, new_status = run_in_transaction(conn, lambda cursor: _save_ai_turn(
+                cursor, interview_id, ai_response.content.strip(), starting=False,
+                candidate_text=data['response_text'], history_tokens=interview['history_tokens'],
+                expected_last_seq=interview['last_seq']))
+        except StaleTurnError as e:
+            payload = _stale_turn_payload(e)
+            return (jsonify(payload), 200) if payload else (jsonify({"message": STALE_TURN_MESSAGE}), 409)
 
         return jsonify({"question": {"text": next_question}, "interview_status": new_status}), 200
     finally:
-        if conn and conn.is_connected(): conn.close()
+        if conn: conn.close()
+
+
+@interview_bp.route('/<interview_id>/next-question/stream', methods=['POST'])
+def process_candidate_response_stream(interview_id):
+    """
+    Streaming variant of /next-question. Emits 'token' events as the model generates,
+    then a 'done' event with the same payload /next-question returns.
+    """
+    llm = get_llm()
+    if not llm: return jsonify({"message": "AI service not available."}), 503
+
+    data = request.json
+    if not data.get('response_text'): return jsonify({"message": "Response missing"}), 400
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        interview = _load_turn_context(cursor, interview_id)
+        if not interview: return jsonify({"message": "Interview data not found"}), 404
+        conn.commit()
+    finally:
+        if conn: conn.close()
+
+    transcript = interview['transcript']
+    transcript.append(
+        {"actor": "candidate", "text": data['response_text'], "timestamp": datetime.datetime.utcnow().isoformat()})
+    messages = _build_turn_messages(interview, transcript)
+    return _event_stream(
+        _stream_ai_turn(interview_id, llm, messages, starting=False, candidate_text=data['response_text'],
+                        history_tokens=interview['history_tokens'], expected_last_seq=interview['last_seq']))
 
 
 @interview_bp.route('/<interview_id>/end', methods=['POST'])
@@ -161,22 +340,23 @@ def end_interview_manually(interview_id):
         if result and result['status'] in ['Completed', 'Pending Review', 'Reviewed']:
             return jsonify({"message": "Interview already completed."}), 200
 
+        record_interview_status_change(cursor, interview_id, 'Completed')
         cursor.execute("UPDATE interviews SET status=%s, updated_at=%s WHERE id=%s",
                        ('Completed', datetime.datetime.utcnow(), interview_id))
+        enqueue_job(cursor, ANALYSIS_JOB, interview_id=interview_id)
         conn.commit()
 
-        process_interview_results(interview_id)
-
-        return jsonify({"message": "Interview ended. Analysis initiated."}), 200
+        return jsonify({"message": "Interview ended. Analysis queued."}), 200
     except Exception as e:
         current_app.logger.error(f"Error manually ending interview {interview_id}: {e}\n{traceback.format_exc()}")
         return jsonify({"message": "Failed to end interview."}), 500
     finally:
-        if conn and conn.is_connected(): conn.close()
+        if conn: conn.close()
 
 
 @interview_bp.route('/<interview_id>/screenshot', methods=['POST'])
 def save_screenshot(interview_id):
+    """Legacy JSON/base64 ingest, kept for clients that have not moved to /screenshot/upload."""
     conn = get_db_connection()
     if not conn: return jsonify({"message": "Database connection failed"}), 500
 
@@ -185,36 +365,94 @@ def save_screenshot(interview_id):
         if not data or 'image' not in data:
             return jsonify({"message": "No image data provided"}), 400
 
-        image_data = data['image'].split(',')[1]
-        image_bytes = base64.b64decode(image_data)
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT id FROM interviews WHERE id = %s", (interview_id,))
+        if cursor.fetchone() is None: return jsonify({"message": "Interview not found"}), 404
 
-        filename = f"{interview_id}_{uuid.uuid4()}.jpg"
-        filepath = os.path.join(current_app.config['SCREENSHOT_FOLDER'], filename)
-        with open(filepath, 'wb') as f:
-            f.write(image_bytes)
+        image_bytes = base64.b64decode(data['image'].split(',')[1])
+        saved = save_screenshot_stream(io.BytesIO(image_bytes), interview_id,
+                                       current_app.config['SCREENSHOT_MAX_BYTES'])
+        if not saved: return jsonify({"message": "Invalid or oversized image"}), 400
+        record_upload('screenshot', saved[1])
 
-        db_path = f"/uploads/screenshots/{filename}"
+        screenshot_id, status = store_screenshot(cursor, interview_id, *saved)
+        conn.commit()
+        if status == 'kept': queue_thumbnail(screenshot_id, saved[0])
 
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT screenshot_paths_json FROM interviews WHERE id = %s", (interview_id,))
-        interview = cursor.fetchone()
+        return jsonify({"message": "Screenshot saved", "status": status}), 200
+    except Exception as e:
+        current_app.logger.error(f"Error saving screenshot for interview {interview_id}: {e}\n{traceback.format_exc()}")
+        if conn.is_connected(): conn.rollback()
+        return jsonify({"message": "Error saving screenshot"}), 500
+    finally:
+        if conn: conn.close()
+
+
+@interview_bp.route('/<interview_id>/screenshot/upload', methods=['POST'])
+def upload_screenshot(interview_id):
+    """
+    Binary screenshot ingest. Accepts either a raw 'image/jpeg' request body or a multipart form
+    with a 'screenshot' file part; the bytes are streamed to disk in chunks with a size cap.
+    """
+    max_bytes = current_app.config['SCREENSHOT_MAX_BYTES']
+    if request.content_length is not None and request.content_length > max_bytes:
+        return jsonify({"message": "Screenshot too large"}), 413
+
+    if request.mimetype == 'image/jpeg':
+        image_stream = request.stream
+    elif request.mimetype == 'multipart/form-data' and 'screenshot' in request.files:
+        image_stream = request.files['screenshot'].stream
+    else:
+        return jsonify({"message": "Send the screenshot as image/jpeg or as a multipart 'screenshot' file"}), 415
 
-        if interview is None: return jsonify({"message": "Interview not found"}), 404
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT id FROM interviews WHERE id = %s", (interview_id,))
+        if cursor.fetchone() is None: return jsonify({"message": "Interview not found"}), 404
 
-        paths = json.loads(interview['screenshot_paths_json']) if interview['screenshot_paths_json'] else []
-        paths.append(db_path)
+        saved = save_screenshot_stream(image_stream, interview_id, max_bytes)
+        if not saved: return jsonify({"message": "Invalid or oversized image"}), 400
+        record_upload('screenshot', saved[1])
 
-        cursor.execute("UPDATE interviews SET screenshot_paths_json = %s WHERE id = %s",
-                       (json.dumps(paths), interview_id))
+        screenshot_id, status = store_screenshot(cursor, interview_id, *saved)
         conn.commit()
+        if status == 'kept': queue_thumbnail(screenshot_id, saved[0])
 
-        return jsonify({"message": "Screenshot saved"}), 200
+        # A dropped near-duplicate is still a successful capture from the client's point of view.
+        return jsonify({"message": "Screenshot saved", "screenshotId": screenshot_id, "status": status}), 201
     except Exception as e:
-        current_app.logger.error(f"Error saving screenshot for interview {interview_id}: {e}\n{traceback.format_exc()}")
+        current_app.logger.error(f"Error uploading screenshot for interview {interview_id}: {e}\n{traceback.format_exc()}")
         if conn.is_connected(): conn.rollback()
         return jsonify({"message": "Error saving screenshot"}), 500
     finally:
-        if conn and conn.is_connected(): conn.close()
+        if conn: conn.close()
+
+
+# Synthesis is only charged to an interview the candidate is taking (or has just finished, for the
+# closing statement); these endpoints are public, so any other id is recorded unattributed.
+TTS_USAGE_COMPLETED_GRACE = datetime.timedelta(minutes=10)
+
+
+def _tts_usage_interview_id(interview_id):
+    """Returns interview_id if it names an interview in progress (or just completed), else None."""
+    if not interview_id or not isinstance(interview_id, str): return None
+    conn = get_db_connection()
+    if not conn: return None
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id FROM interviews WHERE id = %s AND (status = 'In Progress' OR "
+            "(status = 'Completed' AND updated_at >= %s))",
+            (interview_id, datetime.datetime.utcnow() - TTS_USAGE_COMPLETED_GRACE))
+        return interview_id if cursor.fetchone() else None
+    except Exception as e:
+        current_app.logger.error(f"Could not check interview {interview_id} for TTS usage: {e}")
+        return None
+    finally:
+        conn.close()
 
 
 @interview_bp.route('/text-to-speech', methods=['POST'])
@@ -224,9 +462,98 @@ def text_to_speech():
 
     text = request.json.get('text')
     if not text: return jsonify({"message": "No text provided"}), 400
+    # Optional: attributes the synthesis cost to the interview in the usage tables (checked on a cache miss)
+    requested_interview_id = request.json.get('interview_id')
+
+    tts_cache = get_tts_cache()
+    cache_key = tts_cache.make_key(text, TTS_VOICE, TTS_MODEL, TTS_FORMAT)
+    cached_path = tts_cache.lookup(cache_key, TTS_FORMAT)
+    if cached_path:
+        response = send_file(cached_path, mimetype="audio/mpeg", etag=cache_key,
+                             max_age=current_app.config.get('TTS_CACHE_MAX_AGE', 86400))
+        response.headers['X-TTS-Cache'] = 'HIT'
+        return response
+
+    interview_id = _tts_usage_interview_id(requested_interview_id)
+    started = time.perf_counter()
     try:
-        response = openai_client.audio.speech.create(model="tts-1", voice="alloy", input=text, response_format="mp3")
-        return Response(response.iter_bytes(chunk_size=4096), mimetype="audio/mpeg")
+        response = openai_client.audio.speech.create(model=TTS_MODEL, voice=TTS_VOICE, input=text,
+                                                     response_format=TTS_FORMAT)
+
+        def stream_and_cache():
+            # Tee the synthesized audio into the cache; only a fully streamed file is kept.
+            writer = tts_cache.open_writer(cache_key, TTS_FORMAT)
+            audio_bytes = 0
+            try:
+                for chunk in response.iter_bytes(chunk_size=4096):
+                    writer.write(chunk)
+                    audio_bytes += len(chunk)
+                    yield chunk
+            except BaseException:
+                writer.abort()
+                elapsed = time.perf_counter() - started
+                record_tts_call(elapsed, ok=False)
+                record_usage(USAGE_CALL_TTS, elapsed, interview_id, tts_characters=len(text), ok=False,
+                             model=TTS_MODEL)
+                raise
+            writer.commit()
+            elapsed = time.perf_counter() - started
+            record_tts_call(elapsed, audio_bytes)
+            record_usage(USAGE_CALL_TTS, elapsed, interview_id, tts_characters=len(text), model=TTS_MODEL)
+
+        return Response(stream_with_context(stream_and_cache()), mimetype="audio/mpeg",
+                        headers={'ETag': f'"{cache_key}"', 'X-TTS-Cache': 'MISS',
+                                 'Cache-Control': f"public, max-age={current_app.config.get('TTS_CACHE_MAX_AGE', 86400)}"})
     except Exception as e:
+        elapsed = time.perf_counter() - started
+        record_tts_call(elapsed, ok=False)
+        record_usage(USAGE_CALL_TTS, elapsed, interview_id, tts_characters=len(text), ok=False, model=TTS_MODEL)
         current_app.logger.error(f"TTS API call failed: {e}\n{traceback.format_exc()}")
         return jsonify({"message": "Failed to generate audio."}), 500
+
+
+@interview_bp.route('/text-to-speech/stream', methods=['POST'])
+def text_to_speech_pipelined():
+    """
+    Pipelined TTS: the text is split into sentences that are synthesized concurrently and
+    streamed back in order as soon as each one (and every sentence before it) is ready.
+    Each segment is framed as a 4-byte big-endian length followed by a complete MP3, so the
+    client can decode and start playing sentence one while later sentences are still synthesizing.
+    """
+    openai_client = get_openai_client()
+    if not openai_client: return jsonify({"message": "TTS service not available."}), 503
+
+    text = request.json.get('text')
+    if not text: return jsonify({"message": "No text provided"}), 400
+
+    interview_id = _tts_usage_interview_id(request.json.get('interview_id'))
+
+    sentences = split_into_sentences(text)
+    if not sentences: return jsonify({"message": "No text provided"}), 400
+    tts_cache = get_tts_cache()
+    max_workers = min(len(sentences), current_app.config.get('TTS_PIPELINE_CONCURRENCY', 4))
+    app = current_app._get_current_object()
+
+    def synthesize(sentence):
+        # Runs on a pool thread; usage recording needs the app context for its DB connection.
+        with app.app_context():
+            return synthesize_speech(openai_client, sentence, tts_cache, interview_id)
+
+    def generate_segments():
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tts')
+        try:
+            futures = [executor.submit(synthesize, sentence) for sentence in sentences]
+            for index, future in enumerate(futures):
+                try:
+                    audio_bytes = future.result()
+                except Exception as e:
+                    # Skip the sentence rather than abort playback of the rest of the question.
+                    current_app.logger.error(f"TTS failed for segment {index} of {len(sentences)}: {e}")
+                    continue
+                yield struct.pack('>I', len(audio_bytes)) + audio_bytes
+        finally:
+            # Client went away or we are done: don't synthesize sentences nobody will hear.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return Response(stream_with_context(generate_segments()), mimetype="application/octet-stream",
+                    headers={'X-Audio-Segments': str(len(sentences)), 'X-Accel-Buffering': 'no'})
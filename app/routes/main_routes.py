@@ -1,5 +1,7 @@
-from flask import Blueprint, send_from_directory, abort, current_app, render_template, redirect, url_for
+from flask import Blueprint, send_from_directory, abort, current_app, render_template, redirect, url_for, make_response
 from flask_login import current_user, login_required
+from app.services.db_services import get_db_connection
+import mimetypes
 import os
 
 main_bp = Blueprint('main_bp', __name__)
@@ -44,10 +46,56 @@ def candidate_interview():
     return render_template('candidate_interview.html')
 
 
+# Folders under UPLOAD_FOLDER that may be fetched over HTTP. The TTS cache lives there too but is
+# only ever served through the text-to-speech endpoints.
+SERVABLE_UPLOAD_FOLDERS = ('resumes', 'screenshots')
+
+
+def _upload_company_id(folder, filename):
+    """
+    Returns the company owning an uploaded file: the interview of the candidate whose resume it is,
+    or the interview the screenshot was captured in. None if no interview owns it.
+    """
+    db_path = f"/uploads/{folder}/{filename}"
+    conn = get_db_connection()
+    if not conn: abort(503)
+    try:
+        cursor = conn.cursor()
+        if folder == 'resumes':
+            cursor.execute("SELECT i.company_id FROM candidates c JOIN interviews i ON i.candidate_id = c.id "
+                           "WHERE c.resume_filename = %s LIMIT 1", (db_path,))
+        else:
+            cursor.execute("SELECT i.company_id FROM interview_screenshots s JOIN interviews i ON s.interview_id = i.id "
+                           "WHERE s.file_path = %s LIMIT 1", (db_path,))
+            row = cursor.fetchone()
+            if row: return row[0]
+            # Screenshots from before interview_screenshots are named '<interview_id>_<uuid>.jpg'.
+            cursor.execute("SELECT company_id FROM interviews WHERE id = %s", (filename.rsplit('_', 1)[0],))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def _cache_forever(response):
+    """Uploaded files are written once under UUID names, so a cached copy never goes stale."""
+    response.cache_control.max_age = current_app.config['UPLOADS_CACHE_MAX_AGE']
+    response.cache_control.public = False
+    response.cache_control.private = True  # behind login, so shared caches must not keep it
+    response.cache_control.immutable = True
+    return response
+
+
 @main_bp.route('/uploads/<path:folder>/<path:filename>')
+@login_required
 def serve_uploaded_file(folder, filename):
     if '..' in folder or '..' in filename:
         abort(404)
+    if folder not in SERVABLE_UPLOAD_FOLDERS:
+        abort(404)
+    # Admins may only fetch files belonging to their own company's interviews.
+    if _upload_company_id(folder, filename) != current_user.company_id:
+        abort(404)
 
     # Construct the full path securely
     safe_folder_path = os.path.abspath(os.path.join(current_app.config['UPLOAD_FOLDER'], folder))
@@ -56,7 +104,23 @@ def serve_uploaded_file(folder, filename):
     if not safe_folder_path.startswith(os.path.abspath(current_app.config['UPLOAD_FOLDER'])):
         abort(403)
 
+    offload = current_app.config.get('UPLOADS_OFFLOAD')
+    if offload:
+        # Flask only authorizes; the front-end server streams the bytes (and handles Range/304 itself).
+        file_path = os.path.join(safe_folder_path, filename)
+        if not os.path.isfile(file_path):
+            abort(404)
+        response = make_response('')
+        response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if offload == 'x-accel':
+            response.headers['X-Accel-Redirect'] = f"{current_app.config['UPLOADS_ACCEL_PREFIX'].rstrip('/')}/{folder}/{filename}"
+        else:
+            response.headers['X-Sendfile'] = os.path.abspath(file_path)
+        return _cache_forever(response)
+
     try:
-        return send_from_directory(safe_folder_path, filename)
+        # conditional=True answers If-None-Match / If-Modified-Since with 304 and Range with 206.
+        response = send_from_directory(safe_folder_path, filename, conditional=True, etag=True)
     except FileNotFoundError:
         abort(404)
+    return _cache_forever(response)
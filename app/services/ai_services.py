@@ -3,9 +3,20 @@ from langchain.prompts import ChatPromptTemplate
 from langchain.schema.messages import HumanMessage, SystemMessage
 from openai import OpenAI
 from flask import current_app
+import httpx
 import json
+import os
+import re
+import threading
+import time
 import traceback
-from app.services.db_services import get_db_connection, parse_resume_from_file
+from app.services.db_services import get_db_connection
+from app.services.resume_services import get_resume_text
+from app.services.transcript_services import load_transcript
+from app.services.dashboard_counters import record_interview_status_change
+from app.services.metrics import record_llm_call, record_tts_call
+from app.services.usage_services import record_usage, USAGE_CALL_TTS
+from app.services.job_queue import job_handler, job_failure_handler, ANALYSIS_JOB, RESUME_CONDENSATION_JOB, HISTORY_SUMMARY_JOB
 
 # --- Prompts ---
 INTERVIEW_SYSTEM_PROMPT = """
@@ -61,32 +72,360 @@ You must respond with a single, valid JSON object only. Do not include any other
 """
 
 
+RESUME_CONDENSE_SYSTEM_PROMPT = """
+You are an expert technical recruiter. Condense the candidate's resume into a compact, factual profile that an interviewer can scan in seconds.
+
+**Instructions:**
+1.  Only use facts stated in the resume. Do not guess or embellish.
+2.  List at most 15 skills, most relevant and most recent first.
+3.  List at most 4 notable projects or roles, each with a one-sentence summary of what the candidate built or owned.
+4.  If total years of professional experience cannot be determined, use null.
+
+**Output Format**:
+You must respond with a single, valid JSON object only. Do not include any other text, explanation, or markdown formatting like ```json.
+{
+  "headline": "One-line professional headline",
+  "years_experience": number_or_null,
+  "skills": ["skill", "..."],
+  "projects": [{"name": "Project or role", "summary": "One sentence."}],
+  "education": "Highest degree and institution, or null"
+}
+"""
+
+HISTORY_SUMMARY_SYSTEM_PROMPT = """
+You maintain a running summary of a technical screening interview so the interviewer can continue without re-reading the full conversation.
+
+**Instructions:**
+1.  You will be given the current summary (possibly empty) and the next turns of the conversation.
+2.  Return an updated summary that merges the new turns into the existing one.
+3.  Keep every question the interviewer asked (briefly), the topics covered, and the candidate's key technical claims, strengths and gaps.
+4.  Be factual and concise. Do not evaluate or score the candidate. Stay under 250 words.
+5.  Respond with the summary text only.
+"""
+
+# Bump when the condensation prompt or format changes; summaries with another tag are not used.
+RESUME_SUMMARY_VERSION = "v1"
+RESUME_SUMMARY_MAX_CHARS = 1500
+
+COMPLETION_MARKER = "[INTERVIEW_COMPLETE]"
+
+# Call-site labels for LLM metrics
+LLM_CALL_INTERVIEW_TURN = "interview_turn"
+LLM_CALL_ANALYSIS = "analysis"
+LLM_CALL_RESUME_CONDENSATION = "resume_condensation"
+LLM_CALL_HISTORY_SUMMARY = "history_summary"
+
+
+class CompletionMarkerFilter:
+    """
+    Removes the completion marker from a token stream.
+    The marker usually arrives split across several tokens, so any tail of the buffered
+    text that could still turn into the marker is held back until the next token decides it.
+    """
+
+    def __init__(self, marker=COMPLETION_MARKER):
+        self.marker = marker
+        self.completed = False
+        self._pending = ""
+
+    def feed(self, text):
+        """Adds a token and returns the text that is now safe to show to the candidate."""
+        if self.completed:
+            return ""
+        self._pending += text
+        marker_index = self._pending.find(self.marker)
+        if marker_index != -1:
+            self.completed = True
+            safe_text, self._pending = self._pending[:marker_index], ""
+            return safe_text
+
+        hold_back = 0
+        for length in range(min(len(self.marker) - 1, len(self._pending)), 0, -1):
+            if self._pending.endswith(self.marker[:length]):
+                hold_back = length
+                break
+        split_at = len(self._pending) - hold_back
+        safe_text, self._pending = self._pending[:split_at], self._pending[split_at:]
+        return safe_text
+
+    def flush(self):
+        """Returns whatever was held back once the stream has ended."""
+        remaining, self._pending = self._pending, ""
+        return remaining
+
+
+# --- API Clients ---
+# Clients are built once per process and share one httpx connection pool, so turns and TTS calls
+# reuse warm keep-alive connections instead of paying a TCP+TLS handshake each time. Gunicorn forks
+# workers after import, so everything is created lazily and discarded in a forked child.
+_clients = {}
+_http_client = None
+_clients_pid = None
+_clients_lock = threading.Lock()
+_http_stats = {"requests": 0, "connections_opened": 0}
+# Clients inherited across a fork share sockets with the parent; they are kept referenced, never closed.
+_inherited_http_clients = []
+
+
+def _trace_connection_events(event_name, info):
+    if event_name == "connection.connect_tcp.complete":
+        with _clients_lock:
+            _http_stats["connections_opened"] += 1
+
+
+def _count_request(request):
+    with _clients_lock:
+        _http_stats["requests"] += 1
+    request.extensions["trace"] = _trace_connection_events
+
+
+def _reset_clients_after_fork():
+    global _http_client, _clients_pid, _clients_lock
+    _clients_lock = threading.Lock()
+    if _http_client is not None:
+        _inherited_http_clients.append(_http_client)
+    _clients.clear()
+    _http_client = None
+    _clients_pid = None
+    for key in _http_stats:
+        _http_stats[key] = 0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_clients_after_fork)
+
+
+def _get_cached_client(key, factory):
+    """Returns the process-wide client for key, building it (and the shared httpx pool) on first use."""
+    global _http_client, _clients_pid
+    client = _clients.get(key) if _clients_pid == os.getpid() else None
+    if client is not None:
+        return client
+    with _clients_lock:
+        if _clients_pid != os.getpid():
+            if _http_client is not None:
+                _inherited_http_clients.append(_http_client)
+            _clients.clear()
+            _http_client = None
+            _clients_pid = os.getpid()
+        if _http_client is None:
+            config = current_app.config
+            _http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=config.get('OPENAI_HTTP_MAX_CONNECTIONS', 20),
+                                    max_keepalive_connections=config.get('OPENAI_HTTP_MAX_KEEPALIVE', 10),
+                                    keepalive_expiry=config.get('OPENAI_HTTP_KEEPALIVE_EXPIRY', 60)),
+                timeout=httpx.Timeout(config.get('OPENAI_TIMEOUT', 60), connect=config.get('OPENAI_CONNECT_TIMEOUT', 5)),
+                event_hooks={"request": [_count_request]},
+            )
+        if key not in _clients:
+            _clients[key] = factory(_http_client)
+        return _clients[key]
+
+
+def get_http_client_stats():
+    """Requests sent through the shared OpenAI connection pool and how many needed a new connection."""
+    with _clients_lock:
+        stats = dict(_http_stats)
+    stats["connections_reused"] = max(stats["requests"] - stats["connections_opened"], 0)
+    stats["cached_clients"] = len(_clients) if _clients_pid == os.getpid() else 0
+    stats["pid"] = os.getpid()
+    return stats
+
+
 def get_llm(temperature=0.7, json_mode=False):
-    """Initializes and returns the Langchain ChatOpenAI model."""
+    """Returns the process-wide Langchain ChatOpenAI model for these settings."""
     if not current_app.config.get('OPENAI_API_KEY') or current_app.config['OPENAI_API_KEY'] == "YOUR_OPENAI_API_KEY":
         return None
 
-    model_kwargs = {}
-    if json_mode:
-        model_kwargs["response_format"] = {"type": "json_object"}
+    def build(http_client):
+        model_kwargs = {}
+        if json_mode:
+            model_kwargs["response_format"] = {"type": "json_object"}
 
-    return ChatOpenAI(
-        temperature=temperature,
-        openai_api_key=current_app.config['OPENAI_API_KEY'],
-        model_name="gpt-4-turbo-preview",
-        model_kwargs=model_kwargs
-    )
+        return ChatOpenAI(
+            temperature=temperature,
+            openai_api_key=current_app.config['OPENAI_API_KEY'],
+            openai_api_base=current_app.config.get('OPENAI_BASE_URL'),
+            model_name="gpt-4-turbo-preview",
+            model_kwargs=model_kwargs,
+            http_client=http_client,
+            # Streamed responses end with a chunk carrying the billed token usage.
+            stream_usage=True
+        )
+
+    return _get_cached_client(("llm", temperature, json_mode), build)
+
+
+def _token_usage(messages, response_text, usage=None):
+    """
+    (input, output, estimated) tokens: the provider's usage report, or as a fallback an estimate
+    from count_tokens(), flagged with estimated=True.
+    """
+    if usage and usage.get('input_tokens') is not None:
+        return usage['input_tokens'], usage.get('output_tokens', 0), False
+    return sum(count_tokens(str(message.content)) for message in messages), count_tokens(response_text), True
+
+
+def invoke_llm(llm, messages, call_site, interview_id=None):
+    """llm.invoke() with its latency and token usage recorded under call_site (metrics and usage tables)."""
+    model = getattr(llm, 'model_name', None)
+    started = time.perf_counter()
+    try:
+        response = llm.invoke(messages)
+    except Exception:
+        elapsed = time.perf_counter() - started
+        record_llm_call(call_site, elapsed, ok=False)
+        record_usage(call_site, elapsed, interview_id, ok=False, model=model)
+        raise
+    elapsed = time.perf_counter() - started
+    input_tokens, output_tokens, estimated = _token_usage(messages, response.content, getattr(response, 'usage_metadata', None))
+    record_llm_call(call_site, elapsed, input_tokens, output_tokens)
+    record_usage(call_site, elapsed, interview_id, input_tokens, output_tokens, model=model, estimated=estimated)
+    return response
+
+
+def stream_llm(llm, messages, call_site, interview_id=None):
+    """llm.stream() that records time to first chunk, total latency and token usage once the stream ends."""
+    model = getattr(llm, 'model_name', None)
+    started = time.perf_counter()
+    first_chunk_at = None
+    parts, usage = [], None
+    try:
+        for chunk in llm.stream(messages):
+            if first_chunk_at is None:
+                first_chunk_at = time.perf_counter() - started
+            parts.append(chunk.content or "")
+            usage = getattr(chunk, 'usage_metadata', None) or usage
+            yield chunk
+    except Exception:
+        elapsed = time.perf_counter() - started
+        record_llm_call(call_site, elapsed, ok=False, first_token_seconds=first_chunk_at)
+        record_usage(call_site, elapsed, interview_id, ok=False, model=model)
+        raise
+    elapsed = time.perf_counter() - started
+    input_tokens, output_tokens, estimated = _token_usage(messages, "".join(parts), usage)
+    record_llm_call(call_site, elapsed, input_tokens, output_tokens, first_token_seconds=first_chunk_at)
+    record_usage(call_site, elapsed, interview_id, input_tokens, output_tokens, model=model, estimated=estimated)
+
+
+TTS_MODEL = "tts-1"
+TTS_VOICE = "alloy"
+TTS_FORMAT = "mp3"
+
+# A sentence ends at ., ! or ? followed by whitespace. Splitting "e.g. Kafka" mid-phrase is harmless for speech.
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def split_into_sentences(text, min_chars=40):
+    """
+    Splits text into sentence-sized chunks for pipelined speech synthesis.
+    Very short sentences ("Great.") are merged into the next one so each TTS call carries
+    enough text to be worth a round trip.
+    """
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if not sentence:
+            continue
+        current = f"{current} {sentence}" if current else sentence
+        if len(current) >= min_chars:
+            chunks.append(current)
+            current = ""
+    if current:
+        if chunks and len(current) < min_chars:
+            chunks[-1] = f"{chunks[-1]} {current}"
+        else:
+            chunks.append(current)
+    return chunks
+
+
+def synthesize_speech(openai_client, text, tts_cache=None, interview_id=None):
+    """
+    Synthesizes one piece of text and returns the complete MP3 bytes, going through tts_cache if given.
+    Cache misses are recorded as usage against interview_id.
+    """
+    cache_key = None
+    if tts_cache is not None:
+        cache_key = tts_cache.make_key(text, TTS_VOICE, TTS_MODEL, TTS_FORMAT)
+        cached = tts_cache.read(cache_key, TTS_FORMAT)
+        if cached is not None:
+            return cached
+
+    started = time.perf_counter()
+    try:
+        response = openai_client.audio.speech.create(model=TTS_MODEL, voice=TTS_VOICE, input=text,
+                                                     response_format=TTS_FORMAT)
+        audio_bytes = response.content
+    except Exception:
+        elapsed = time.perf_counter() - started
+        record_tts_call(elapsed, ok=False)
+        record_usage(USAGE_CALL_TTS, elapsed, interview_id, tts_characters=len(text), ok=False, model=TTS_MODEL)
+        raise
+    elapsed = time.perf_counter() - started
+    record_tts_call(elapsed, len(audio_bytes))
+    record_usage(USAGE_CALL_TTS, elapsed, interview_id, tts_characters=len(text), model=TTS_MODEL)
+    if tts_cache is not None:
+        tts_cache.store(cache_key, TTS_FORMAT, audio_bytes)
+    return audio_bytes
+
+
+_token_encoding = None
+
+
+def count_tokens(text):
+    """Counts tokens with tiktoken (installed with langchain-openai), falling back to ~4 characters per token."""
+    global _token_encoding
+    try:
+        if _token_encoding is None:
+            import tiktoken
+            _token_encoding = tiktoken.get_encoding("cl100k_base")
+        return len(_token_encoding.encode(text))
+    except Exception:
+        return len(text) // 4
+
+
+def _format_turns(turns):
+    return "\n".join([f"{msg['actor']}: {msg['text']}" for msg in turns])
+
+
+def select_prompt_history(interview, transcript):
+    """
+    Chooses what conversation history goes into the next prompt: the stored running summary
+    (which covers every turn up to history_summary_upto_seq) plus the turns after it verbatim.
+    Logs the history size with and without the summary. Returns (history_summary, recent_turns, recent_tokens).
+    """
+    summary = interview.get('history_summary')
+    upto_seq = interview.get('history_summary_upto_seq') or 0
+    if summary:
+        # Turns not yet persisted (e.g. the answer being submitted) have no seq and are always recent.
+        recent_turns = [turn for turn in transcript if turn.get('seq', upto_seq + 1) > upto_seq]
+    else:
+        recent_turns = transcript
+
+    recent_tokens = count_tokens(_format_turns(recent_turns))
+    if summary:
+        full_tokens = count_tokens(_format_turns(transcript))
+        sent_tokens = count_tokens(summary) + recent_tokens
+    else:
+        full_tokens = sent_tokens = recent_tokens
+    current_app.logger.info(
+        f"Prompt history tokens: full={full_tokens} sent={sent_tokens} "
+        f"(summary covers {upto_seq} turns, {len(recent_turns)} verbatim)")
+    return summary, recent_turns, recent_tokens
 
 
 def get_openai_client():
-    """Initializes and returns the direct OpenAI client for TTS."""
+    """Returns the process-wide direct OpenAI client for TTS."""
     try:
-        return OpenAI(api_key=current_app.config['OPENAI_API_KEY'])
+        return _get_cached_client(("openai",), lambda http_client: OpenAI(
+            api_key=current_app.config['OPENAI_API_KEY'], base_url=current_app.config.get('OPENAI_BASE_URL'),
+            http_client=http_client))
     except Exception:
         return None
 
 
-def build_interview_messages(job_data, resume_summary, candidate_name, conversation_history):
+def build_interview_messages(job_data, resume_summary, candidate_name, conversation_history, history_summary=None,
+                             questions_asked=None):
     messages = [SystemMessage(content=INTERVIEW_SYSTEM_PROMPT)]
 
     context = (
@@ -99,34 +438,41 @@ def build_interview_messages(job_data, resume_summary, candidate_name, conversat
         f"Conversation History:\n"
     )
 
-    if not conversation_history:
+    if history_summary:
+        # Older turns have been folded into a summary; the exact count keeps the question budget on track.
+        context += f"Summary of the earlier conversation:\n{history_summary}\n\n"
+        if questions_asked is not None:
+            context += f"Questions asked so far: {questions_asked}\n\n"
+        context += "Most recent turns:\n"
+
+    if not conversation_history and not history_summary:
         context += "The interview is just beginning. Greet the candidate and ask your first question based on the parameters."
     else:
-        history_str = "\n".join([f"{msg['actor']}: {msg['text']}" for msg in conversation_history])
-        context += history_str
+        context += _format_turns(conversation_history)
 
     messages.append(HumanMessage(content=context))
     return messages
 
 
 def process_interview_results(interview_id):
+    """
+    Runs the scorecard analysis for a finished interview.
+    Returns True when there is nothing left to do, False when the analysis should be retried.
+    """
     current_app.logger.info(f"Starting post-interview analysis for interview_id: {interview_id}")
     conn = get_db_connection()
-    if not conn: return
+    if not conn: return False
 
     cursor = conn.cursor(dictionary=True)
     try:
-        query = "SELECT i.transcript_json, j.description as jd, c.resume_filename FROM interviews i JOIN jobs j ON i.job_id = j.id LEFT JOIN candidates c ON i.candidate_id = c.id WHERE i.id = %s"
+        query = "SELECT i.transcript_json, j.description as jd, c.id as candidate_id, c.resume_text, c.resume_filename, c.resume_summary, c.resume_summary_version FROM interviews i JOIN jobs j ON i.job_id = j.id LEFT JOIN candidates c ON i.candidate_id = c.id WHERE i.id = %s"
         cursor.execute(query, (interview_id,))
         interview_data = cursor.fetchone()
 
-        if not interview_data or not interview_data.get('transcript_json'):
+        transcript = load_transcript(cursor, interview_id, interview_data.get('transcript_json')) if interview_data else []
+        if not transcript:
             current_app.logger.warning(f"No transcript found for interview {interview_id}. Aborting analysis.")
-            return
-
-        transcript = interview_data['transcript_json']
-        if isinstance(transcript, str):
-            transcript = json.loads(transcript)
+            return True
 
         questions_and_answers = []
         for i, turn in enumerate(transcript):
@@ -136,16 +482,16 @@ def process_interview_results(interview_id):
         llm = get_llm(temperature=0.2, json_mode=True)
         if not llm:
             current_app.logger.error("LLM not available for analysis.")
-            return
+            return False
 
-        resume_summary = parse_resume_from_file(interview_data.get('resume_filename'))
+        resume_summary = get_resume_summary(interview_data)
         full_transcript_text = "\n".join([f"{t['actor']}: {t['text']}" for t in transcript])
 
         analysis_context = (
             f"Job Description:\n{interview_data['jd']}\n\nCandidate Resume Summary:\n{resume_summary}\n\nFull Interview Transcript:\n{full_transcript_text}")
         analysis_messages = [SystemMessage(content=ANALYSIS_SYSTEM_PROMPT), HumanMessage(content=analysis_context)]
 
-        ai_response = llm.invoke(analysis_messages)
+        ai_response = invoke_llm(llm, analysis_messages, LLM_CALL_ANALYSIS, interview_id)
 
         try:
             analysis_result = json.loads(ai_response.content)
@@ -156,19 +502,165 @@ def process_interview_results(interview_id):
             update_query = "UPDATE interviews SET ai_summary = %s, score = %s, ai_questions_json = %s, detailed_scorecard_json = %s, status = %s WHERE id = %s"
             params = (overall_summary, overall_score, json.dumps(questions_and_answers), scorecard_json,
                       'Pending Review', interview_id)
+            record_interview_status_change(cursor, interview_id, 'Pending Review')
             cursor.execute(update_query, params)
             conn.commit()
             current_app.logger.info(f"Successfully analyzed and updated interview {interview_id}")
+            return True
 
         except (json.JSONDecodeError, TypeError) as e:
             current_app.logger.error(
                 f"Failed to decode AI analysis for {interview_id}. Raw Response: '{ai_response.content}'\n{traceback.format_exc()}")
+            record_interview_status_change(cursor, interview_id, 'Analysis Failed')
             cursor.execute("UPDATE interviews SET status = %s WHERE id = %s", ('Analysis Failed', interview_id))
             conn.commit()
+            return False
 
     except Exception as e:
         current_app.logger.error(
             f"Critical error during post-interview processing for {interview_id}: {e}\n{traceback.format_exc()}")
         if conn.is_connected(): conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+
+@job_handler(ANALYSIS_JOB)
+def run_analysis_job(job):
+    return process_interview_results(job['interview_id'])
+
+
+@job_failure_handler(ANALYSIS_JOB)
+def mark_analysis_failed(cursor, job):
+    """Out of attempts: an interview still waiting on its scorecard is moved off 'Completed' (shown as analyzing)."""
+    cursor.execute("SELECT status FROM interviews WHERE id = %s FOR UPDATE", (job['interview_id'],))
+    row = cursor.fetchone()
+    if not row or (row['status'] if isinstance(row, dict) else row[0]) != 'Completed':
+        return
+    record_interview_status_change(cursor, job['interview_id'], 'Analysis Failed')
+    cursor.execute("UPDATE interviews SET status = %s WHERE id = %s", ('Analysis Failed', job['interview_id']))
+
+
+def _render_resume_summary(profile):
+    """Turns the condensed JSON profile into the short text block that goes into prompts."""
+    lines = []
+    if profile.get("headline"):
+        lines.append(f"Headline: {str(profile['headline'])[:200]}")
+    if profile.get("years_experience") is not None:
+        lines.append(f"Years of experience: {profile['years_experience']}")
+    skills = [str(skill)[:40] for skill in (profile.get("skills") or [])[:15]]
+    if skills:
+        lines.append(f"Skills: {', '.join(skills)}")
+    projects = (profile.get("projects") or [])[:4]
+    if projects:
+        lines.append("Projects:")
+        for project in projects:
+            if isinstance(project, dict):
+                lines.append(f"- {str(project.get('name', ''))[:80]}: {str(project.get('summary', ''))[:250]}")
+    if profile.get("education"):
+        lines.append(f"Education: {str(profile['education'])[:200]}")
+    return "\n".join(lines)[:RESUME_SUMMARY_MAX_CHARS]
+
+
+def condense_resume(resume_text, interview_id=None):
+    """Produces a bounded-length structured summary of a resume. Returns None if the LLM is unavailable."""
+    llm = get_llm(temperature=0, json_mode=True)
+    if not llm: return None
+    messages = [SystemMessage(content=RESUME_CONDENSE_SYSTEM_PROMPT), HumanMessage(content=f"Resume:\n{resume_text}")]
+    ai_response = invoke_llm(llm, messages, LLM_CALL_RESUME_CONDENSATION, interview_id)
+    return _render_resume_summary(json.loads(ai_response.content))
+
+
+def get_resume_summary(candidate_row):
+    """
+    Returns the resume text to put into interview and analysis prompts: the condensed summary when
+    one exists for the current version, otherwise the extracted text cut to the same budget.
+    """
+    if candidate_row.get('resume_summary') and candidate_row.get('resume_summary_version') == RESUME_SUMMARY_VERSION:
+        return candidate_row['resume_summary']
+    return get_resume_text(candidate_row)[:RESUME_SUMMARY_MAX_CHARS * 2]
+
+
+@job_handler(RESUME_CONDENSATION_JOB)
+def run_resume_condensation_job(job):
+    candidate_id = (job.get('payload_json') or {}).get('candidate_id')
+    conn = get_db_connection()
+    if not conn: return False
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT c.resume_text, c.resume_summary_version, i.id AS interview_id FROM candidates c "
+                       "LEFT JOIN interviews i ON i.candidate_id = c.id WHERE c.id = %s LIMIT 1", (candidate_id,))
+        candidate = cursor.fetchone()
+        if not candidate or not candidate.get('resume_text'):
+            current_app.logger.warning(f"No resume text for candidate {candidate_id}; skipping condensation.")
+            return True
+        if candidate.get('resume_summary_version') == RESUME_SUMMARY_VERSION:
+            return True
+
+        try:
+            summary = condense_resume(candidate['resume_text'], candidate['interview_id'])
+        except (json.JSONDecodeError, TypeError, AttributeError) as e:
+            current_app.logger.error(f"Could not parse condensed resume for candidate {candidate_id}: {e}")
+            return False
+        if summary is None:
+            return False
+
+        cursor.execute("UPDATE candidates SET resume_summary = %s, resume_summary_version = %s WHERE id = %s",
+                       (summary, RESUME_SUMMARY_VERSION, candidate_id))
+        conn.commit()
+        current_app.logger.info(f"Condensed resume for candidate {candidate_id} to {len(summary)} chars.")
+        return True
+    finally:
+        conn.close()
+
+
+@job_handler(HISTORY_SUMMARY_JOB)
+def run_history_summary_job(job):
+    """
+    Folds the oldest unsummarized turns of an interview into its running summary, keeping the
+    most recent turns (up to half the verbatim budget, and at least the last exchange) verbatim.
+    """
+    interview_id = job['interview_id']
+    conn = get_db_connection()
+    if not conn: return False
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT history_summary, history_summary_upto_seq FROM interviews WHERE id = %s", (interview_id,))
+        interview = cursor.fetchone()
+        if not interview: return True
+        upto_seq = interview.get('history_summary_upto_seq') or 0
+
+        pending = [turn for turn in load_transcript(cursor, interview_id) if turn['seq'] > upto_seq]
+        keep_budget = current_app.config.get('HISTORY_VERBATIM_TOKEN_BUDGET', 1500) // 2
+        split_at = len(pending)
+        kept_tokens = 0
+        while split_at > 0:
+            turn_tokens = count_tokens(_format_turns([pending[split_at - 1]]))
+            if len(pending) - split_at >= 2 and kept_tokens + turn_tokens > keep_budget:
+                break
+            kept_tokens += turn_tokens
+            split_at -= 1
+        to_fold = pending[:split_at]
+        if not to_fold: return True
+
+        llm = get_llm(temperature=0)
+        if not llm: return False
+        summary_context = (f"Current summary:\n{interview.get('history_summary') or '(none yet)'}\n\n"
+                           f"New turns:\n{_format_turns(to_fold)}")
+        ai_response = invoke_llm(llm, [SystemMessage(content=HISTORY_SUMMARY_SYSTEM_PROMPT),
+                                       HumanMessage(content=summary_context)], LLM_CALL_HISTORY_SUMMARY,
+                                 interview_id)
+        new_summary = ai_response.content.strip()[:current_app.config.get('HISTORY_SUMMARY_MAX_CHARS', 2000)]
+
+        # Guard against a concurrent fold having moved the boundary in the meantime.
+        cursor.execute(
+            "UPDATE interviews SET history_summary = %s, history_summary_upto_seq = %s "
+            "WHERE id = %s AND COALESCE(history_summary_upto_seq, 0) = %s",
+            (new_summary, to_fold[-1]['seq'], interview_id, upto_seq))
+        conn.commit()
+        current_app.logger.info(
+            f"Folded turns {upto_seq + 1}-{to_fold[-1]['seq']} of interview {interview_id} into the running summary "
+            f"({count_tokens(_format_turns(to_fold))} -> {count_tokens(new_summary)} tokens).")
+        return True
     finally:
-        if conn.is_connected(): cursor.close(); conn.close()
+        conn.close()
@@ -0,0 +1,143 @@
+from flask import current_app
+from app.services.cache_utils import TTLCache
+from app.services.db_services import get_db_connection
+
+# Rows in company_status_counts are keyed by (company_id, entity, status).
+JOB_ENTITY = 'job'
+INTERVIEW_ENTITY = 'interview'
+
+
+def _value(row, key, index):
+    return row[key] if isinstance(row, dict) else row[index]
+
+
+def _get_summary_cache():
+    cache = current_app.extensions.get('dashboard_summary_cache')
+    if cache is None:
+        cache = TTLCache(maxsize=4096, ttl=current_app.config.get('DASHBOARD_SUMMARY_CACHE_TTL', 15))
+        current_app.extensions['dashboard_summary_cache'] = cache
+    return cache
+
+
+def _bump(cursor, company_id, entity, status, delta):
+    if not company_id or not delta: return
+    cursor.execute(
+        "INSERT INTO company_status_counts (company_id, entity, status, count) VALUES (%s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE count = count + VALUES(count)",
+        (company_id, entity, status or '', delta))
+    _get_summary_cache().invalidate(company_id)
+
+
+def record_interviews_created(cursor, company_id, status, count=1):
+    _bump(cursor, company_id, INTERVIEW_ENTITY, status, count)
+
+
+def record_interview_status_change(cursor, interview_id, new_status):
+    """
+    Call in the same transaction just before UPDATE-ing interviews.status. Locks the interview
+    row, so two concurrent transitions of one interview cannot both count from the same old status.
+    """
+    cursor.execute("SELECT company_id, status FROM interviews WHERE id = %s FOR UPDATE", (interview_id,))
+    row = cursor.fetchone()
+    if not row: return
+    company_id, old_status = _value(row, 'company_id', 0), _value(row, 'status', 1)
+    if old_status == new_status: return
+    _bump(cursor, company_id, INTERVIEW_ENTITY, old_status, -1)
+    _bump(cursor, company_id, INTERVIEW_ENTITY, new_status, 1)
+
+
+def record_job_created(cursor, company_id, status):
+    _bump(cursor, company_id, JOB_ENTITY, status, 1)
+
+
+def record_job_status_change(cursor, company_id, old_status, new_status):
+    """old_status must have been read with SELECT ... FOR UPDATE in the same transaction."""
+    if old_status == new_status: return
+    _bump(cursor, company_id, JOB_ENTITY, old_status, -1)
+    _bump(cursor, company_id, JOB_ENTITY, new_status, 1)
+
+
+def record_job_deleted(cursor, company_id, job_id, job_status):
+    """
+    Call just before DELETE FROM jobs, with job_status read FOR UPDATE. MySQL does not report rows
+    removed by ON DELETE CASCADE, so the job's interviews are subtracted here, grouped by status.
+    They are locked first, so an interview cannot change status between being counted and deleted.
+    """
+    cursor.execute("SELECT status FROM interviews WHERE job_id = %s FOR UPDATE", (job_id,))
+    totals = {}
+    for row in cursor.fetchall():
+        status = _value(row, 'status', 0)
+        totals[status] = totals.get(status, 0) + 1
+    for status, total in totals.items():
+        _bump(cursor, company_id, INTERVIEW_ENTITY, status, -total)
+    _bump(cursor, company_id, JOB_ENTITY, job_status, -1)
+
+
+def rebuild_status_counts(cursor, company_id=None):
+    """Recomputes the counters from jobs and interviews, for one company or all of them."""
+    scope, params = ("WHERE company_id = %s", (company_id,)) if company_id else ("WHERE company_id IS NOT NULL", ())
+    cursor.execute(f"DELETE FROM company_status_counts {scope}", params)
+    cursor.execute(
+        "INSERT INTO company_status_counts (company_id, entity, status, count) "
+        f"SELECT company_id, %s, COALESCE(status, ''), COUNT(*) FROM jobs {scope} GROUP BY company_id, status",
+        (JOB_ENTITY, *params))
+    cursor.execute(
+        "INSERT INTO company_status_counts (company_id, entity, status, count) "
+        f"SELECT company_id, %s, COALESCE(status, ''), COUNT(*) FROM interviews {scope} GROUP BY company_id, status",
+        (INTERVIEW_ENTITY, *params))
+    if company_id:
+        _get_summary_cache().invalidate(company_id)
+    else:
+        _get_summary_cache().clear()
+
+
+def rebuild_all_status_counts():
+    """Rebuilds every company's counters in one transaction. Returns False if the database is unavailable."""
+    conn = get_db_connection()
+    if not conn: return False
+    cursor = conn.cursor()
+    try:
+        rebuild_status_counts(cursor)
+        conn.commit()
+        return True
+    except Exception:
+        if conn.is_connected(): conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+SUMMARY_KEYS = ['open_positions', 'total_applications', 'interviews_scheduled', 'pending_reviews']
+
+
+def _read_summary(cursor, company_id):
+    cursor.execute(
+        "SELECT COUNT(*) AS counter_rows, "
+        "COALESCE(SUM(CASE WHEN entity = %s AND status = 'Open' THEN count ELSE 0 END), 0) AS open_positions, "
+        "COALESCE(SUM(CASE WHEN entity = %s THEN count ELSE 0 END), 0) AS total_applications, "
+        "COALESCE(SUM(CASE WHEN entity = %s AND status = 'Scheduled' THEN count ELSE 0 END), 0) AS interviews_scheduled, "
+        "COALESCE(SUM(CASE WHEN entity = %s AND status = 'Pending Review' THEN count ELSE 0 END), 0) AS pending_reviews "
+        "FROM company_status_counts WHERE company_id = %s",
+        (JOB_ENTITY, INTERVIEW_ENTITY, INTERVIEW_ENTITY, INTERVIEW_ENTITY, company_id))
+    row = cursor.fetchone()
+    return _value(row, 'counter_rows', 0), {key: int(_value(row, key, index + 1)) for index, key in enumerate(SUMMARY_KEYS)}
+
+
+def read_dashboard_summary(cursor, company_id):
+    """
+    Dashboard cards from the counter table in one conditional-SUM query over a handful of
+    rows, however many interviews the company has. Served from a short per-process TTL cache.
+    Companies that existed before the counters were introduced are seeded by migration 0004; a
+    company that still has no rows (nothing created yet) is rebuilt here, and the caller commits.
+    """
+    cache = _get_summary_cache()
+    summary = cache.get(company_id)
+    if summary is not None:
+        return summary
+
+    counter_rows, summary = _read_summary(cursor, company_id)
+    if not counter_rows:
+        rebuild_status_counts(cursor, company_id)
+        counter_rows, summary = _read_summary(cursor, company_id)
+    cache.set(company_id, summary)
+    return summary
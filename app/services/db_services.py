@@ -1,23 +1,323 @@
 import mysql.connector
 from flask import current_app
 import datetime
+import threading
+import queue
+import time
 import uuid
 import os
+from app.services.metrics import record_db_query
+
+# --- Connection Pool ---
+# One pool per worker process. Gunicorn forks workers after the app module is
+# imported, so the pool is created lazily and thrown away in the child after a fork.
+_pool = None
+_pool_lock = threading.Lock()
+_pool_stats = {
+    "checkouts": 0,          # connections handed out
+    "waits": 0,              # checkouts that had to wait for a connection to be returned
+    "exhausted": 0,          # checkouts that timed out waiting
+    "created": 0,            # physical connections opened
+    "health_check_failures": 0,  # idle connections found dead on borrow and replaced
+}
+# Connections inherited from the parent process across a fork. They share a socket with
+# the parent, so they must never be closed (that would send COM_QUIT on the parent's
+# session); keeping a reference stops them from being garbage collected.
+_inherited_connections = []
+
+
+# Client-side errors meaning the session is gone (server restart, wait_timeout, network drop)
+_CONNECTION_LOST_ERRORS = (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError)
+
+
+class TimedCursor:
+    """
+    Cursor proxy that reports the duration of every execute/executemany to the metrics module,
+    and marks its connection broken when a statement fails because the session was lost.
+    """
+
+    def __init__(self, raw_cursor, owner=None):
+        self._raw = raw_cursor
+        self._owner = owner
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def execute(self, operation, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._raw.execute(operation, *args, **kwargs)
+        except _CONNECTION_LOST_ERRORS:
+            if self._owner is not None: self._owner.broken = True
+            raise
+        finally:
+            record_db_query(operation, time.perf_counter() - started)
+
+    def executemany(self, operation, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._raw.executemany(operation, *args, **kwargs)
+        except _CONNECTION_LOST_ERRORS:
+            if self._owner is not None: self._owner.broken = True
+            raise
+        finally:
+            record_db_query(operation, time.perf_counter() - started)
+
+
+class PooledConnection:
+    """
+    Thin proxy around a mysql.connector connection that returns itself to the pool
+    on close() instead of tearing down the TCP session. Everything else is delegated,
+    so existing `conn.cursor()` / `conn.commit()` / `conn.close()` call sites work unchanged.
+    close() also closes the cursors opened on it, never raises and is idempotent, so callers
+    call it unconditionally in `finally`; that gives the pool slot back even when the server
+    has dropped the session.
+    """
+
+    def __init__(self, pool, raw_conn, created_at):
+        self._pool = pool
+        self._raw = raw_conn
+        self._created_at = created_at
+        self._released = False
+        self._cursors = []
+        self.broken = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = TimedCursor(self._raw.cursor(*args, **kwargs), self)
+        self._cursors.append(cursor)
+        return cursor
+
+    def is_connected(self):
+        if self._released:
+            return False
+        return self._raw.is_connected()
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        for cursor in self._cursors:
+            try:
+                cursor.close()
+            except Exception:
+                self.broken = True
+        self._cursors = []
+        self._pool.release(self._raw, self._created_at, self.broken)
+
+
+class ConnectionPool:
+    """A bounded, thread-safe pool of MySQL connections for a single process."""
+
+    def __init__(self, db_config, size, timeout, recycle):
+        self.db_config = db_config
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._open_count = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        raw_conn = mysql.connector.connect(**self.db_config)
+        with _pool_lock:
+            _pool_stats["created"] += 1
+        return raw_conn, time.monotonic()
+
+    def _discard(self, raw_conn):
+        with self._lock:
+            self._open_count -= 1
+        try:
+            raw_conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, raw_conn, created_at):
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            return False
+        try:
+            # is_connected() pings the server, catching connections killed by wait_timeout.
+            return raw_conn.is_connected()
+        except mysql.connector.Error:
+            return False
+
+    def acquire(self):
+        """Borrows a healthy connection, waiting up to `timeout` seconds. Returns None on exhaustion."""
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while True:
+            try:
+                raw_conn, created_at = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._open_count < self.size
+                    if can_open:
+                        self._open_count += 1
+                if can_open:
+                    try:
+                        raw_conn, created_at = self._connect()
+                    except mysql.connector.Error:
+                        with self._lock:
+                            self._open_count -= 1
+                        raise
+                else:
+                    if not waited:
+                        waited = True
+                        with _pool_lock:
+                            _pool_stats["waits"] += 1
+                    remaining = deadline - time.monotonic()
+                    try:
+                        if remaining <= 0:
+                            raise queue.Empty
+                        raw_conn, created_at = self._idle.get(timeout=remaining)
+                    except queue.Empty:
+                        with _pool_lock:
+                            _pool_stats["exhausted"] += 1
+                        return None
+
+            if not self._is_healthy(raw_conn, created_at):
+                with _pool_lock:
+                    _pool_stats["health_check_failures"] += 1
+                self._discard(raw_conn)
+                continue
+
+            with _pool_lock:
+                _pool_stats["checkouts"] += 1
+            return PooledConnection(self, raw_conn, created_at)
+
+    def release(self, raw_conn, created_at, broken=False):
+        """
+        Returns a connection to the pool, rolling back anything the caller left uncommitted.
+        A connection that lost its session (or fails the rollback) is discarded, freeing its slot.
+        """
+        if os.getpid() != self.pid:
+            return
+        if broken:
+            self._discard(raw_conn)
+            return
+        try:
+            if raw_conn.in_transaction:
+                raw_conn.rollback()
+        except Exception:
+            self._discard(raw_conn)
+            return
+        self._idle.put((raw_conn, created_at))
+
+    def abandon(self):
+        """Drops every idle connection without closing it (used in a freshly forked child)."""
+        while True:
+            try:
+                _inherited_connections.append(self._idle.get_nowait()[0])
+            except queue.Empty:
+                break
+
+    def stats(self):
+        with self._lock:
+            open_count = self._open_count
+        return {"size": self.size, "open": open_count, "idle": self._idle.qsize(), "in_use": open_count - self._idle.qsize()}
+
+
+def _reset_pool_after_fork():
+    global _pool, _pool_lock
+    # Another thread may have held the lock at fork time; the child gets a fresh one.
+    _pool_lock = threading.Lock()
+    if _pool is not None:
+        _pool.abandon()
+    _pool = None
+    for key in _pool_stats:
+        _pool_stats[key] = 0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
+
+def _get_pool():
+    global _pool
+    pool = _pool
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _pool_lock:
+        if _pool is not None and _pool.pid != os.getpid():
+            _pool.abandon()
+            _pool = None
+        if _pool is None:
+            config = current_app.config
+            _pool = ConnectionPool(
+                db_config={
+                    'host': config['DB_HOST'],
+                    'user': config['DB_USER'],
+                    'password': config['DB_PASSWORD'],
+                    'database': config['DB_NAME'],
+                },
+                size=config.get('DB_POOL_SIZE', 10),
+                timeout=config.get('DB_POOL_TIMEOUT', 10),
+                recycle=config.get('DB_POOL_RECYCLE', 3600),
+            )
+        return _pool
+
 
 def get_db_connection():
-    """Establishes a connection to the database."""
+    """
+    Borrows a connection from the per-process pool.
+    Callers call conn.close() in `finally`, unconditionally; that returns the connection to the pool.
+    """
     try:
-        conn = mysql.connector.connect(
-            host=current_app.config['DB_HOST'],
-            user=current_app.config['DB_USER'],
-            password=current_app.config['DB_PASSWORD'],
-            database=current_app.config['DB_NAME']
-        )
+        conn = _get_pool().acquire()
+        if conn is None:
+            current_app.logger.error(
+                f"MySQL connection pool exhausted after waiting {current_app.config.get('DB_POOL_TIMEOUT', 10)}s")
         return conn
     except mysql.connector.Error as err:
         current_app.logger.error(f"Error connecting to MySQL: {err}")
         return None
 
+
+# Errors for which MySQL aborts the whole transaction; the work can simply be run again.
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+RETRYABLE_TRANSACTION_ERRORS = (ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK)
+
+
+def run_in_transaction(conn, work, attempts=3):
+    """
+    Runs work(cursor) on a dictionary cursor and commits, re-running the whole transaction when MySQL
+    rolls it back with a deadlock or lock wait timeout. Other exceptions roll back and propagate.
+    Returns whatever work returns.
+    """
+    for attempt in range(attempts):
+        cursor = conn.cursor(dictionary=True)
+        try:
+            result = work(cursor)
+            conn.commit()
+            return result
+        except mysql.connector.Error as err:
+            conn.rollback()
+            if err.errno not in RETRYABLE_TRANSACTION_ERRORS or attempt == attempts - 1:
+                raise
+            current_app.logger.warning(f"Transaction aborted ({err.errno}), retrying (attempt {attempt + 2}/{attempts})")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+def get_pool_stats():
+    """Returns the pool counters for this worker process."""
+    with _pool_lock:
+        stats = dict(_pool_stats)
+    stats["pid"] = os.getpid()
+    if _pool is not None and _pool.pid == os.getpid():
+        stats.update(_pool.stats())
+    return stats
+
 def generate_id(prefix="item_"):
     """Generates a unique ID."""
     return prefix + str(uuid.uuid4())
@@ -31,15 +331,3 @@ def serialize_datetime_in_obj(obj):
     if isinstance(obj, datetime.datetime):
         return obj.isoformat()
     return obj
-
-def parse_resume_from_file(resume_filepath_db):
-    """
-    In a real app, this would use libraries like PyPDF2 or python-docx
-    to extract text from the actual resume file.
-    For this demo, we return placeholder text.
-    """
-    if not resume_filepath_db: return "No resume provided."
-    filename = os.path.basename(resume_filepath_db)
-    # This is a placeholder. A real implementation would involve text extraction.
-    return f"The candidate's resume ({filename}) indicates strong skills in Python, Flask, and project management. They have 5 years of experience in backend development."
-
@@ -0,0 +1,191 @@
+from flask import current_app
+from flask_mail import Message
+import datetime
+import smtplib
+import time
+import traceback
+import uuid
+from app import mail
+from app.services.db_services import get_db_connection, generate_id
+from app.services.job_queue import job_handler, job_failure_handler, enqueue_job, SEND_INVITES_JOB
+from app.services.dashboard_counters import record_interviews_created
+from app.services.metrics import record_smtp_send
+
+# Per-address delivery states stored in interviews.invite_status
+INVITE_PENDING = 'pending'
+INVITE_SENDING = 'sending'  # claimed by a send attempt; never picked up again, so never sent twice
+INVITE_SENT = 'sent'
+INVITE_FAILED = 'failed'
+UNCONFIRMED_ERROR = "Delivery could not be confirmed; the invitation was not re-sent."
+
+
+def create_invite_batch(cursor, job_id, company_id, emails):
+    """
+    Inserts one 'Invited' interview per address with a single executemany and queues the
+    send_invites job for them, all inside the caller's transaction. Returns the batch id.
+    """
+    batch_id = str(uuid.uuid4())
+    now_utc = datetime.datetime.utcnow()
+    rows = [(generate_id("int_"), job_id, company_id, str(uuid.uuid4()), 'Invited', email, batch_id, INVITE_PENDING, now_utc)
+            for email in emails]
+    cursor.executemany(
+        "INSERT INTO interviews (id, job_id, company_id, invitation_link, status, invite_email, invite_batch_id, "
+        "invite_status, created_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+        rows)
+    record_interviews_created(cursor, company_id, 'Invited', len(rows))
+    enqueue_job(cursor, SEND_INVITES_JOB, payload={"batch_id": batch_id, "job_id": job_id}, dedupe=False)
+    return batch_id
+
+
+def get_invite_batch(cursor, batch_id, company_id):
+    """Returns per-address delivery status for a batch, or None if it does not belong to the company."""
+    cursor.execute(
+        "SELECT id, invite_email, invite_status, invite_error, invite_sent_at FROM interviews "
+        "WHERE invite_batch_id = %s AND company_id = %s ORDER BY invite_email",
+        (batch_id, company_id))
+    rows = cursor.fetchall()
+    if not rows: return None
+    counts = {INVITE_PENDING: 0, INVITE_SENDING: 0, INVITE_SENT: 0, INVITE_FAILED: 0}
+    for row in rows:
+        counts[row['invite_status']] = counts.get(row['invite_status'], 0) + 1
+    return {
+        "batchId": batch_id,
+        "total": len(rows),
+        "counts": counts,
+        "done": counts[INVITE_PENDING] == 0 and counts[INVITE_SENDING] == 0,
+        "invites": [{"interviewId": row['id'], "email": row['invite_email'], "status": row['invite_status'],
+                     "error": row['invite_error'], "sentAt": row['invite_sent_at']} for row in rows],
+    }
+
+
+def _build_invite_message(job_title, email, invitation_link_guid):
+    interview_link = f"{current_app.config['INVITE_BASE_URL']}/candidate_interview.html?invite={invitation_link_guid}"
+    msg = Message(
+        subject=f"Invitation to Interview for {job_title}",
+        sender=current_app.config['MAIL_USERNAME'],
+        recipients=[email]
+    )
+    msg.body = f"Hello,\n\nYou have been invited to an AI-powered screening interview for the {job_title} position.\n\nPlease use the following link to begin your interview:\n{interview_link}\n\nBest regards,\nThe Hiring Team"
+    return msg
+
+
+def _record_results(results):
+    """
+    Stores (status, error, sent_at, interview_id) tuples for one chunk of sends.
+    Returns False if they could not be stored; those addresses stay pending and are retried.
+    """
+    conn = get_db_connection()
+    if not conn:
+        current_app.logger.error("Could not record invite delivery results; the addresses will be retried.")
+        return False
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(
+            "UPDATE interviews SET invite_status = %s, invite_error = %s, invite_sent_at = %s WHERE id = %s",
+            results)
+        conn.commit()
+        return True
+    except Exception as e:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        current_app.logger.error(f"Could not record invite delivery results; the addresses will be retried: {e}\n{traceback.format_exc()}")
+        return False
+    finally:
+        conn.close()
+
+
+def _claim_chunk(chunk):
+    """
+    Moves a chunk from pending to sending before its SMTP session opens. Returns the invites
+    claimed, or None if the database could not be updated.
+    """
+    conn = get_db_connection()
+    if not conn: return None
+    cursor = conn.cursor()
+    try:
+        claimed = []
+        for invite in chunk:
+            cursor.execute("UPDATE interviews SET invite_status = %s WHERE id = %s AND invite_status = %s",
+                           (INVITE_SENDING, invite['id'], INVITE_PENDING))
+            if cursor.rowcount: claimed.append(invite)
+        conn.commit()
+        return claimed
+    except Exception as e:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        current_app.logger.error(f"Could not claim invites for sending: {e}\n{traceback.format_exc()}")
+        return None
+    finally:
+        conn.close()
+
+
+@job_handler(SEND_INVITES_JOB)
+def run_send_invites_job(job):
+    """
+    Sends the batch's still-pending invitations, reusing one SMTP session for every
+    INVITE_SMTP_CHUNK_SIZE messages. Each chunk is marked 'sending' first, so an invitation is
+    sent at most once: addresses left 'sending' by an earlier attempt whose results were lost are
+    marked failed, not re-sent. An address the server rejects is marked failed and the rest
+    continue; a dropped connection puts the unsent addresses back to pending and ends the attempt
+    so the job queue retries them.
+    """
+    batch_id = job['payload_json']['batch_id']
+    conn = get_db_connection()
+    if not conn: return False
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            "UPDATE interviews SET invite_status = %s, invite_error = %s WHERE invite_batch_id = %s AND invite_status = %s",
+            (INVITE_FAILED, UNCONFIRMED_ERROR, batch_id, INVITE_SENDING))
+        conn.commit()
+        cursor.execute(
+            "SELECT i.id, i.invite_email, i.invitation_link, j.title FROM interviews i JOIN jobs j ON i.job_id = j.id "
+            "WHERE i.invite_batch_id = %s AND i.invite_status = %s ORDER BY i.id",
+            (batch_id, INVITE_PENDING))
+        pending = cursor.fetchall()
+    finally:
+        conn.close()
+
+    chunk_size = current_app.config.get('INVITE_SMTP_CHUNK_SIZE', 50)
+    for start in range(0, len(pending), chunk_size):
+        chunk = _claim_chunk(pending[start:start + chunk_size])
+        if chunk is None: return False
+        results = []
+        try:
+            with mail.connect() as smtp:
+                for invite in chunk:
+                    message = _build_invite_message(invite['title'], invite['invite_email'], invite['invitation_link'])
+                    started = time.perf_counter()
+                    try:
+                        smtp.send(message)
+                        record_smtp_send(time.perf_counter() - started)
+                        results.append((INVITE_SENT, None, datetime.datetime.utcnow(), invite['id']))
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                        record_smtp_send(time.perf_counter() - started, ok=False)
+                        current_app.logger.warning(f"Invite to {invite['invite_email']} rejected: {e}")
+                        results.append((INVITE_FAILED, str(e)[:1000], None, invite['id']))
+        except (smtplib.SMTPException, OSError) as e:
+            current_app.logger.error(f"SMTP session failed while sending invite batch {batch_id}: {e}\n{traceback.format_exc()}")
+            handled_ids = {result[3] for result in results}
+            results += [(INVITE_PENDING, None, None, invite['id']) for invite in chunk if invite['id'] not in handled_ids]
+            _record_results(results)
+            return False
+        if not _record_results(results):
+            return False
+
+    current_app.logger.info(f"Invite batch {batch_id}: processed {len(pending)} pending addresses.")
+    return True
+
+
+@job_failure_handler(SEND_INVITES_JOB)
+def fail_unsent_invites(cursor, job):
+    """Out of attempts: every address still pending (or unconfirmed) is reported as failed."""
+    cursor.execute(
+        "UPDATE interviews SET invite_status = %s, invite_error = COALESCE(invite_error, %s) "
+        "WHERE invite_batch_id = %s AND invite_status IN (%s, %s)",
+        (INVITE_FAILED, f"Not sent after {job['attempts']} attempts.",
+         job['payload_json']['batch_id'], INVITE_PENDING, INVITE_SENDING))
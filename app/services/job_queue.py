@@ -0,0 +1,262 @@
+from flask import current_app
+import datetime
+import json
+import os
+import signal
+import socket
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from app.services.db_services import get_db_connection
+
+# Job types
+ANALYSIS_JOB = 'interview_analysis'
+RESUME_CONDENSATION_JOB = 'resume_condensation'
+HISTORY_SUMMARY_JOB = 'history_summary'
+SEND_INVITES_JOB = 'send_invites'
+
+# Job statuses
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+CLAIM_NEXT_JOB_QUERY = ("SELECT * FROM background_jobs WHERE status = %s AND run_after <= %s ORDER BY id LIMIT 1 "
+                        "FOR UPDATE SKIP LOCKED")
+
+_handlers = {}
+_failure_handlers = {}
+
+
+def job_handler(job_type):
+    """
+    Registers a function as the handler for a job type.
+    The handler receives the job row (dict) and returns True on success, False to retry.
+    """
+    def decorator(func):
+        _handlers[job_type] = func
+        return func
+    return decorator
+
+
+def job_failure_handler(job_type):
+    """
+    Registers a function called with (cursor, job) when a job of this type has used up its attempts.
+    It runs in the transaction that marks the job failed, so its writes land together with that.
+    """
+    def decorator(func):
+        _failure_handlers[job_type] = func
+        return func
+    return decorator
+
+
+def enqueue_job(cursor, job_type, interview_id=None, payload=None, max_attempts=None, dedupe=True):
+    """
+    Queues a job using the caller's cursor, so the job only becomes visible when the
+    caller's transaction commits. With dedupe=True an already queued or running job of the
+    same type for the same interview is reused instead of inserting a second one.
+    Returns the job id.
+    """
+    if dedupe and interview_id:
+        cursor.execute(
+            "SELECT id FROM background_jobs WHERE job_type = %s AND interview_id = %s AND status IN (%s, %s) LIMIT 1",
+            (job_type, interview_id, JOB_QUEUED, JOB_RUNNING))
+        existing = cursor.fetchone()
+        if existing:
+            return existing['id'] if isinstance(existing, dict) else existing[0]
+
+    if max_attempts is None:
+        max_attempts = current_app.config.get('JOB_MAX_ATTEMPTS', 3)
+    now_utc = datetime.datetime.utcnow()
+    cursor.execute(
+        "INSERT INTO background_jobs (job_type, interview_id, payload_json, status, max_attempts, run_after, created_at, updated_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+        (job_type, interview_id, json.dumps(payload) if payload is not None else None, JOB_QUEUED, max_attempts,
+         now_utc, now_utc, now_utc))
+    return cursor.lastrowid
+
+
+def get_latest_job(cursor, job_type, interview_id):
+    """Returns the most recent job of a type for an interview, or None."""
+    cursor.execute(
+        "SELECT id, status, attempts, max_attempts, last_error, created_at, updated_at FROM background_jobs "
+        "WHERE job_type = %s AND interview_id = %s ORDER BY id DESC LIMIT 1",
+        (job_type, interview_id))
+    return cursor.fetchone()
+
+
+def _claim_next_job(worker_id):
+    """Atomically moves the oldest runnable job to 'running'. Returns the job row or None."""
+    conn = get_db_connection()
+    if not conn: return None
+    cursor = conn.cursor(dictionary=True)
+    try:
+        now_utc = datetime.datetime.utcnow()
+        stale_before = now_utc - datetime.timedelta(seconds=current_app.config.get('JOB_LOCK_TIMEOUT', 600))
+        # Jobs whose worker died mid-run go back on the queue once their lock is stale.
+        cursor.execute(
+            "UPDATE background_jobs SET status = %s, locked_by = NULL, locked_at = NULL, updated_at = %s "
+            "WHERE status = %s AND locked_at < %s",
+            (JOB_QUEUED, now_utc, JOB_RUNNING, stale_before))
+
+        cursor.execute(CLAIM_NEXT_JOB_QUERY, (JOB_QUEUED, now_utc))
+        job = cursor.fetchone()
+        if not job:
+            conn.commit()
+            return None
+
+        cursor.execute(
+            "UPDATE background_jobs SET status = %s, attempts = attempts + 1, locked_by = %s, locked_at = %s, updated_at = %s WHERE id = %s",
+            (JOB_RUNNING, worker_id, now_utc, now_utc, job['id']))
+        conn.commit()
+        job['attempts'] += 1
+        job['locked_by'] = worker_id
+        if job.get('payload_json') and isinstance(job['payload_json'], str):
+            job['payload_json'] = json.loads(job['payload_json'])
+        return job
+    except Exception as e:
+        current_app.logger.error(f"Failed to claim background job: {e}\n{traceback.format_exc()}")
+        if conn.is_connected(): conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+
+def _refresh_locks(worker_id):
+    """Heartbeat: marks every job this worker is running as still alive so it is not requeued as stale."""
+    conn = get_db_connection()
+    if not conn:
+        current_app.logger.error(f"Could not refresh job locks for worker {worker_id}.")
+        return
+    cursor = conn.cursor()
+    try:
+        now_utc = datetime.datetime.utcnow()
+        cursor.execute(
+            "UPDATE background_jobs SET locked_at = %s, updated_at = %s WHERE status = %s AND locked_by = %s",
+            (now_utc, now_utc, JOB_RUNNING, worker_id))
+        conn.commit()
+    except Exception as e:
+        current_app.logger.error(f"Failed to refresh job locks for worker {worker_id}: {e}\n{traceback.format_exc()}")
+        if conn.is_connected(): conn.rollback()
+    finally:
+        conn.close()
+
+
+def _finish_job(job, succeeded, error=None):
+    """
+    Records a job's outcome, but only while this worker still holds its lock; a job that was
+    requeued as stale and claimed by another worker is left to that worker.
+    """
+    conn = get_db_connection()
+    if not conn:
+        current_app.logger.error(f"Could not record result of background job {job['id']}; it will be retried after its lock expires.")
+        return
+    cursor = conn.cursor()
+    try:
+        now_utc = datetime.datetime.utcnow()
+        owned = "id = %s AND status = %s AND locked_by = %s"
+        owner = (job['id'], JOB_RUNNING, job['locked_by'])
+        if succeeded:
+            cursor.execute(
+                "UPDATE background_jobs SET status = %s, last_error = NULL, locked_by = NULL, locked_at = NULL, updated_at = %s "
+                f"WHERE {owned}",
+                (JOB_SUCCEEDED, now_utc, *owner))
+        elif job['attempts'] < job['max_attempts']:
+            # Exponential backoff: base, 2*base, 4*base, ...
+            delay = current_app.config.get('JOB_RETRY_BACKOFF', 30) * (2 ** (job['attempts'] - 1))
+            cursor.execute(
+                "UPDATE background_jobs SET status = %s, last_error = %s, run_after = %s, locked_by = NULL, locked_at = NULL, updated_at = %s "
+                f"WHERE {owned}",
+                (JOB_QUEUED, error, now_utc + datetime.timedelta(seconds=delay), now_utc, *owner))
+        else:
+            cursor.execute(
+                "UPDATE background_jobs SET status = %s, last_error = %s, locked_by = NULL, locked_at = NULL, updated_at = %s "
+                f"WHERE {owned}",
+                (JOB_FAILED, error, now_utc, *owner))
+        owned_by_us = cursor.rowcount > 0
+        if owned_by_us and not succeeded and job['attempts'] >= job['max_attempts'] \
+                and job['job_type'] in _failure_handlers:
+            _run_failure_handler(cursor, job)
+        if not owned_by_us:
+            current_app.logger.warning(
+                f"Background job {job['id']} is no longer locked by {job['locked_by']}; its result was discarded.")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _run_failure_handler(cursor, job):
+    # A failing hook must not stop the job from being recorded as failed; its own writes are undone.
+    cursor.execute("SAVEPOINT job_failure_handler")
+    try:
+        _failure_handlers[job['job_type']](cursor, job)
+    except Exception as e:
+        current_app.logger.error(f"Failure handler for background job {job['id']} raised: {e}\n{traceback.format_exc()}")
+        cursor.execute("ROLLBACK TO SAVEPOINT job_failure_handler")
+
+
+def _run_job(app, job):
+    with app.app_context():
+        handler = _handlers.get(job['job_type'])
+        if handler is None:
+            current_app.logger.error(f"No handler registered for job type '{job['job_type']}' (job {job['id']}).")
+            _finish_job(job, False, "No handler registered")
+            return
+
+        current_app.logger.info(f"Running {job['job_type']} job {job['id']} (attempt {job['attempts']}/{job['max_attempts']})")
+        try:
+            succeeded = bool(handler(job))
+            error = None if succeeded else "Handler reported failure"
+        except Exception as e:
+            current_app.logger.error(f"Background job {job['id']} raised: {e}\n{traceback.format_exc()}")
+            succeeded, error = False, str(e)
+        _finish_job(job, succeeded, error)
+
+
+def run_worker(app, concurrency=None, poll_interval=None):
+    """
+    Polls the background_jobs table and runs jobs on a bounded thread pool until SIGINT/SIGTERM.
+    Run several of these processes to scale out; SKIP LOCKED keeps them from claiming the same job.
+    """
+    concurrency = concurrency or app.config.get('JOB_WORKER_CONCURRENCY', 4)
+    poll_interval = poll_interval or app.config.get('JOB_POLL_INTERVAL', 2)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    slots = threading.BoundedSemaphore(concurrency)
+    stopping = threading.Event()
+
+    def request_stop(signum, frame):
+        app.logger.info(f"Worker {worker_id} received signal {signum}, finishing in-flight jobs.")
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    worker_done = threading.Event()
+
+    def heartbeat():
+        while not worker_done.wait(app.config.get('JOB_HEARTBEAT_INTERVAL', 60)):
+            with app.app_context():
+                _refresh_locks(worker_id)
+
+    threading.Thread(target=heartbeat, name='job-heartbeat', daemon=True).start()
+
+    def run_and_release(job):
+        try:
+            _run_job(app, job)
+        finally:
+            slots.release()
+
+    app.logger.info(f"Background worker {worker_id} started with concurrency {concurrency}.")
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='job-worker') as executor:
+        while not stopping.is_set():
+            if not slots.acquire(timeout=poll_interval):
+                continue
+            with app.app_context():
+                job = _claim_next_job(worker_id)
+            if job is None:
+                slots.release()
+                stopping.wait(poll_interval)
+                continue
+            executor.submit(run_and_release, job)
+    worker_done.set()
+    app.logger.info(f"Background worker {worker_id} stopped.")
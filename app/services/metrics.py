@@ -0,0 +1,159 @@
+from flask import current_app, g, has_request_context, request, Response, abort
+import hmac
+import ipaddress
+import os
+import time
+
+# Prometheus metrics. prometheus_client is optional: without it every metric below is a no-op and
+# /metrics answers 503. Under gunicorn, PROMETHEUS_MULTIPROC_DIR (set by gunicorn.conf.py) must be in
+# the environment before this module is imported so each worker writes its samples to shared files.
+try:
+    import prometheus_client
+    from prometheus_client import Histogram, CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST, multiprocess
+except ImportError:
+    prometheus_client = None
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+
+def _histogram(name, documentation, labelnames=(), buckets=None):
+    if prometheus_client is None:
+        return _NoopMetric()
+    kwargs = {"buckets": buckets} if buckets else {}
+    return Histogram(name, documentation, labelnames, **kwargs)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SLOW_CALL_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+BYTE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+HTTP_REQUEST_SECONDS = _histogram(
+    'http_request_duration_seconds', 'Request latency, including streamed bodies',
+    ('blueprint', 'endpoint', 'method', 'status'), LATENCY_BUCKETS)
+DB_QUERY_SECONDS = _histogram(
+    'db_query_duration_seconds', 'Time spent in cursor.execute/executemany', ('operation',), QUERY_BUCKETS)
+DB_QUERIES_PER_REQUEST = _histogram(
+    'db_queries_per_request', 'Queries executed while serving one request', ('endpoint',), COUNT_BUCKETS)
+DB_SECONDS_PER_REQUEST = _histogram(
+    'db_time_per_request_seconds', 'Total query time while serving one request', ('endpoint',), LATENCY_BUCKETS)
+LLM_CALL_SECONDS = _histogram(
+    'llm_call_duration_seconds', 'LLM call latency (whole stream for streamed calls)', ('call_site', 'outcome'),
+    SLOW_CALL_BUCKETS)
+LLM_FIRST_TOKEN_SECONDS = _histogram(
+    'llm_time_to_first_token_seconds', 'Time until a streamed LLM call yields its first chunk', ('call_site',),
+    SLOW_CALL_BUCKETS)
+LLM_TOKENS = _histogram(
+    'llm_tokens', 'Tokens per LLM call', ('call_site', 'direction'), TOKEN_BUCKETS)
+TTS_CALL_SECONDS = _histogram(
+    'tts_call_duration_seconds', 'Speech synthesis latency (cache misses only)', ('outcome',), SLOW_CALL_BUCKETS)
+TTS_AUDIO_BYTES = _histogram('tts_audio_bytes', 'Size of synthesized audio', (), BYTE_BUCKETS)
+SMTP_SEND_SECONDS = _histogram('smtp_send_duration_seconds', 'Time to send one email', ('outcome',), SLOW_CALL_BUCKETS)
+UPLOAD_BYTES = _histogram('upload_size_bytes', 'Size of accepted uploads', ('kind',), BYTE_BUCKETS)
+
+
+def _outcome(ok):
+    return 'ok' if ok else 'error'
+
+
+def record_db_query(operation, seconds):
+    """Called by the pooled cursors for every statement; also accumulates per-request totals."""
+    verb = operation.lstrip().split(None, 1)[0].upper() if operation else ''
+    DB_QUERY_SECONDS.labels(verb if verb in ('SELECT', 'INSERT', 'UPDATE', 'DELETE') else 'OTHER').observe(seconds)
+    if has_request_context():
+        g.metrics_db_queries = g.get('metrics_db_queries', 0) + 1
+        g.metrics_db_seconds = g.get('metrics_db_seconds', 0.0) + seconds
+
+
+def record_llm_call(call_site, seconds, input_tokens=None, output_tokens=None, ok=True, first_token_seconds=None):
+    LLM_CALL_SECONDS.labels(call_site, _outcome(ok)).observe(seconds)
+    if first_token_seconds is not None:
+        LLM_FIRST_TOKEN_SECONDS.labels(call_site).observe(first_token_seconds)
+    if input_tokens is not None:
+        LLM_TOKENS.labels(call_site, 'input').observe(input_tokens)
+    if output_tokens is not None:
+        LLM_TOKENS.labels(call_site, 'output').observe(output_tokens)
+
+
+def record_tts_call(seconds, audio_bytes=None, ok=True):
+    TTS_CALL_SECONDS.labels(_outcome(ok)).observe(seconds)
+    if audio_bytes is not None:
+        TTS_AUDIO_BYTES.observe(audio_bytes)
+
+
+def record_smtp_send(seconds, ok=True):
+    SMTP_SEND_SECONDS.labels(_outcome(ok)).observe(seconds)
+
+
+def record_upload(kind, size):
+    UPLOAD_BYTES.labels(kind).observe(size)
+
+
+def _start_request_timer():
+    g.metrics_started = time.perf_counter()
+
+
+def _remember_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+
+def _observe_request(exc=None):
+    # teardown_request runs once a streamed body has been fully sent, so streams are timed end to end.
+    started = g.get('metrics_started')
+    if started is None:
+        return
+    endpoint = request.endpoint or 'unmatched'
+    if endpoint == 'metrics':
+        return
+    status = g.get('metrics_status', 500)
+    HTTP_REQUEST_SECONDS.labels(request.blueprint or 'app', endpoint, request.method, str(status)).observe(
+        time.perf_counter() - started)
+    DB_QUERIES_PER_REQUEST.labels(endpoint).observe(g.get('metrics_db_queries', 0))
+    DB_SECONDS_PER_REQUEST.labels(endpoint).observe(g.get('metrics_db_seconds', 0.0))
+
+
+def _client_allowed(allowed_ips):
+    try:
+        client = ipaddress.ip_address(request.remote_addr or '')
+    except ValueError:
+        return False
+    return any(client in ipaddress.ip_network(network, strict=False) for network in allowed_ips)
+
+
+def metrics_view():
+    # Closed unless configured: a token, an IP allow-list, or both (then both must match).
+    token = current_app.config.get('METRICS_TOKEN')
+    allowed_ips = current_app.config.get('METRICS_ALLOWED_IPS') or []
+    if not token and not allowed_ips:
+        abort(404)
+    if allowed_ips and not _client_allowed(allowed_ips):
+        abort(403)
+    if token and not hmac.compare_digest(request.headers.get('Authorization', '').encode(), f"Bearer {token}".encode()):
+        abort(401)
+    if prometheus_client is None:
+        return Response("prometheus_client is not installed\n", status=503, mimetype='text/plain')
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    """Registers the request timing hooks and the /metrics endpoint."""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    app.before_request(_start_request_timer)
+    app.after_request(_remember_status)
+    app.teardown_request(_observe_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
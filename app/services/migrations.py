@@ -0,0 +1,138 @@
+from flask import current_app
+import hashlib
+import os
+import re
+from app.services.db_services import get_db_connection
+
+_MIGRATION_FILE_RE = re.compile(r'^(\d+)_([\w-]+)\.sql$')
+
+SCHEMA_VERSION_DDL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+class MigrationError(Exception):
+    pass
+
+
+def discover_migrations(folder=None):
+    """Returns [(version, name, path), ...] for NNNN_name.sql files, in version order."""
+    folder = folder or current_app.config['MIGRATIONS_FOLDER']
+    migrations = []
+    for filename in os.listdir(folder):
+        match = _MIGRATION_FILE_RE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(folder, filename)))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f"Duplicate migration versions in {folder}")
+    return migrations
+
+
+def split_statements(sql):
+    """
+    Splits a migration into statements on lines ending with ';', dropping full-line '--' comments.
+    Enough for DDL; migrations must not define procedures or triggers with inner semicolons.
+    """
+    statements, current = [], []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('--'):
+            continue
+        current.append(line)
+        if stripped.endswith(';'):
+            statements.append("\n".join(current).rstrip().rstrip(';'))
+            current = []
+    if current:
+        statements.append("\n".join(current))
+    return statements
+
+
+def _checksum(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _applied_versions(cursor):
+    cursor.execute(SCHEMA_VERSION_DDL)
+    cursor.execute("SELECT version, name, checksum, applied_at FROM schema_version ORDER BY version")
+    return {row[0]: row for row in cursor.fetchall()}
+
+
+def migration_status():
+    """Returns [{"version", "name", "applied", "applied_at", "modified"}, ...] for every migration file."""
+    conn = get_db_connection()
+    if not conn: raise MigrationError("Database connection failed")
+    cursor = conn.cursor()
+    try:
+        applied = _applied_versions(cursor)
+        return [{"version": version, "name": name, "applied": version in applied,
+                 "applied_at": applied[version][3] if version in applied else None,
+                 "modified": version in applied and applied[version][2] != _checksum(path)}
+                for version, name, path in discover_migrations()]
+    finally:
+        conn.close()
+
+
+def upgrade(target=None, log=print):
+    """
+    Applies pending migrations in order, up to and including target (default: latest).
+    MySQL commits each DDL statement implicitly, so a migration that fails part-way is left
+    partly applied and is not recorded; fix the cause and make the remaining statements re-runnable.
+    Returns the versions applied.
+    """
+    conn = get_db_connection()
+    if not conn: raise MigrationError("Database connection failed")
+    cursor = conn.cursor()
+    applied_now = []
+    try:
+        applied = _applied_versions(cursor)
+        for version, name, path in discover_migrations():
+            if target is not None and version > target:
+                break
+            if version in applied:
+                if applied[version][2] != _checksum(path):
+                    log(f"warning: migration {version:04d}_{name} was edited after it was applied")
+                continue
+            with open(path, encoding='utf-8') as f:
+                statements = split_statements(f.read())
+            log(f"Applying {version:04d}_{name} ({len(statements)} statements)")
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                except Exception as e:
+                    raise MigrationError(f"{version:04d}_{name} failed on:\n{statement}\n{e}") from e
+            cursor.execute("INSERT INTO schema_version (version, name, checksum) VALUES (%s, %s, %s)",
+                           (version, name, _checksum(path)))
+            conn.commit()
+            applied_now.append(version)
+        return applied_now
+    finally:
+        conn.close()
+
+
+def stamp(version):
+    """Records every migration up to version as applied without running it (for pre-existing databases)."""
+    conn = get_db_connection()
+    if not conn: raise MigrationError("Database connection failed")
+    cursor = conn.cursor()
+    try:
+        applied = _applied_versions(cursor)
+        stamped = []
+        for migration_version, name, path in discover_migrations():
+            if migration_version > version:
+                break
+            if migration_version not in applied:
+                cursor.execute("INSERT INTO schema_version (version, name, checksum) VALUES (%s, %s, %s)",
+                               (migration_version, name, _checksum(path)))
+                stamped.append(migration_version)
+        conn.commit()
+        return stamped
+    finally:
+        conn.close()
@@ -0,0 +1,48 @@
+import base64
+import datetime
+import json
+
+
+def encode_cursor(sort_by, sort_order, value, row_id, backwards=False):
+    """
+    Builds an opaque cursor pointing just past a row. The sort key travels with it so a cursor
+    issued for one ordering is rejected under another.
+    """
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+    payload = {"s": sort_by, "o": sort_order, "v": value, "id": row_id, "b": backwards}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, sort_by, sort_order, datetime_columns=()):
+    """Returns (value, row_id, backwards). Raises ValueError for a malformed or mismatched cursor."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        value, row_id, backwards = payload['v'], payload['id'], bool(payload.get('b'))
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if payload.get('s') != sort_by or payload.get('o') != sort_order:
+        raise ValueError("Cursor does not match the requested sort order")
+    if value is not None and sort_by in datetime_columns:
+        value = datetime.datetime.fromisoformat(value)
+    return value, row_id, backwards
+
+
+def keyset_condition(column, id_column, sort_order, value, row_id, backwards=False):
+    """
+    Returns (sql, params) selecting rows after (value, row_id) in ORDER BY column, id_column.
+    NULLs are placed where MySQL puts them (first ascending, last descending), so the walk
+    follows a (..., column, id) index exactly. With backwards=True it selects the rows before
+    the cursor instead; the caller then reverses the ORDER BY and the fetched rows.
+    """
+    ascending = (sort_order == 'asc') != backwards
+    op = '>' if ascending else '<'
+    if value is None:
+        if ascending:
+            # NULLs sort first: later NULLs by id, then every non-NULL value.
+            return f"(({column} IS NULL AND {id_column} {op} %s) OR {column} IS NOT NULL)", [row_id]
+        return f"({column} IS NULL AND {id_column} {op} %s)", [row_id]
+    sql = f"({column} {op} %s OR ({column} = %s AND {id_column} {op} %s)"
+    if not ascending:
+        sql += f" OR {column} IS NULL"  # NULLs sort last when walking downwards
+    return sql + ")", [value, value, row_id]
@@ -0,0 +1,97 @@
+from app.services.db_services import get_db_connection
+from app.services.job_queue import CLAIM_NEXT_JOB_QUERY, JOB_QUEUED
+from app.routes.interview_routes import INVITATION_LOOKUP_QUERY, TURN_CONTEXT_QUERY
+
+# The queries every request path depends on, with representative parameters. Each must be
+# answerable from an index; `flask db-check-indexes` EXPLAINs them against the live schema.
+# Where a query is a module constant it is imported, so the check follows the code; keep the
+# inline ones in step with the queries in app/routes and app/services.
+HOT_QUERIES = [
+    ("invitation lookup", INVITATION_LOOKUP_QUERY, ('guid',)),
+    ("interview turn context", TURN_CONTEXT_QUERY, ('int_x',)),
+    ("transcript turns",
+     "SELECT seq, actor, text, created_at FROM interview_turns WHERE interview_id = %s ORDER BY seq", ('int_x',)),
+    ("next transcript seq",
+     "SELECT COALESCE(MAX(seq), 0) + 1 FROM interview_turns WHERE interview_id = %s", ('int_x',)),
+    ("kept screenshots",
+     "SELECT id, file_path FROM interview_screenshots WHERE interview_id = %s AND is_duplicate = FALSE ORDER BY id",
+     ('int_x',)),
+    ("last kept screenshot hash",
+     "SELECT phash FROM interview_screenshots WHERE interview_id = %s AND is_duplicate = FALSE "
+     "AND phash IS NOT NULL ORDER BY id DESC LIMIT 1", ('int_x',)),
+    ("tenant interview list for a job",
+     "SELECT i.id, i.score, j.title, c.name FROM interviews i JOIN jobs j ON i.job_id = j.id "
+     "LEFT JOIN candidates c ON i.candidate_id = c.id WHERE i.company_id = %s AND i.job_id = %s "
+     "ORDER BY i.score DESC, i.id DESC LIMIT 51", ('comp_x', 'job_x')),
+    ("tenant interview list",
+     "SELECT i.id, i.score, j.title FROM interviews i JOIN jobs j ON i.job_id = j.id "
+     "WHERE i.company_id = %s ORDER BY i.score DESC, i.id DESC LIMIT 6", ('comp_x',)),
+    ("tenant interview count",
+     "SELECT COUNT(*) FROM interviews i WHERE i.company_id = %s AND i.job_id = %s", ('comp_x', 'job_x')),
+    ("tenant job list",
+     "SELECT * FROM jobs WHERE company_id = %s ORDER BY created_at DESC", ('comp_x',)),
+    ("interview status counts",
+     "SELECT company_id, status, COUNT(*) FROM interviews WHERE company_id = %s GROUP BY company_id, status",
+     ('comp_x',)),
+    ("job status counts",
+     "SELECT company_id, status, COUNT(*) FROM jobs WHERE company_id = %s GROUP BY company_id, status", ('comp_x',)),
+    ("job interviews by status",
+     "SELECT status, COUNT(*) FROM interviews WHERE job_id = %s GROUP BY status", ('job_x',)),
+    ("dashboard counters",
+     "SELECT entity, status, count FROM company_status_counts WHERE company_id = %s", ('comp_x',)),
+    ("invite batch",
+     "SELECT id, invite_email, invite_status FROM interviews WHERE invite_batch_id = %s AND company_id = %s",
+     ('batch_x', 'comp_x')),
+    ("job queue claim", CLAIM_NEXT_JOB_QUERY, (JOB_QUEUED, '2024-01-01 00:00:00')),
+    ("job queue stale locks",
+     "SELECT id FROM background_jobs WHERE status = %s AND locked_at < NOW()", ('running',)),
+    ("latest job for interview",
+     "SELECT id, status FROM background_jobs WHERE job_type = %s AND interview_id = %s ORDER BY id DESC LIMIT 1",
+     ('interview_analysis', 'int_x')),
+    ("usage context for interviews",
+     "SELECT id, company_id, job_id FROM interviews WHERE id IN (%s, %s)", ('int_x', 'int_y')),
+    ("tenant usage by day",
+     "SELECT usage_date, call_type, SUM(calls) FROM llm_usage_daily WHERE company_id = %s "
+     "AND usage_date BETWEEN %s AND %s GROUP BY usage_date, call_type", ('comp_x', '2024-01-01', '2024-01-31')),
+    ("job usage",
+     "SELECT job_id, call_type, SUM(calls) FROM llm_usage_daily WHERE company_id = %s AND job_id = %s "
+     "AND usage_date BETWEEN %s AND %s GROUP BY job_id, call_type", ('comp_x', 'job_x', '2024-01-01', '2024-01-31')),
+    ("recent interview usage",
+     "SELECT interview_id FROM llm_usage_interviews WHERE company_id = %s AND last_used_at >= %s "
+     "GROUP BY interview_id ORDER BY MAX(last_used_at) DESC LIMIT 100", ('comp_x', '2024-01-01')),
+    ("resume owner",
+     "SELECT i.company_id FROM candidates c JOIN interviews i ON i.candidate_id = c.id "
+     "WHERE c.resume_filename = %s LIMIT 1", ('/uploads/resumes/x.pdf',)),
+    ("screenshot owner",
+     "SELECT i.company_id FROM interview_screenshots s JOIN interviews i ON s.interview_id = i.id "
+     "WHERE s.file_path = %s LIMIT 1", ('/uploads/screenshots/x.jpg',)),
+    ("admin by id", "SELECT id, email, name, company_id FROM admins WHERE id = %s", ('admin_x',)),
+    ("admin by email", "SELECT * FROM admins WHERE email = %s", ('a@example.com',)),
+]
+
+
+def check_query_plans():
+    """
+    EXPLAINs every hot query. Returns (failures, warnings) as lists of strings.
+    A full table scan with no usable index is a failure. A scan the optimizer chose although an
+    index was available (usual on near-empty tables) is only a warning.
+    """
+    conn = get_db_connection()
+    if not conn: raise RuntimeError("Database connection failed")
+    cursor = conn.cursor(dictionary=True)
+    failures, warnings = [], []
+    try:
+        for name, query, params in HOT_QUERIES:
+            cursor.execute(f"EXPLAIN {query}", params)
+            for row in cursor.fetchall():
+                access_type = row.get('type')
+                if access_type not in ('ALL', 'index'):
+                    continue
+                description = f"{name}: {access_type} scan of {row.get('table')} (~{row.get('rows')} rows)"
+                if access_type == 'ALL' and not row.get('possible_keys'):
+                    failures.append(f"{description}, no usable index")
+                else:
+                    warnings.append(f"{description}, possible keys: {row.get('possible_keys')}")
+        return failures, warnings
+    finally:
+        conn.close()
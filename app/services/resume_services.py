@@ -0,0 +1,154 @@
+from flask import current_app
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import re
+import threading
+import traceback
+from app.services.db_services import get_db_connection
+from app.services.job_queue import enqueue_job, RESUME_CONDENSATION_JOB
+
+NO_RESUME_TEXT = "No resume provided."
+UNREADABLE_RESUME_TEXT = "The candidate's resume could not be read."
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+# candidate_id -> upload-time extraction still running in this process's pool
+_pending_extractions = {}
+
+
+def extract_resume_text(file_path, max_chars=20000):
+    """
+    Extracts plain text from a PDF, DOCX or text resume.
+    Runs inside the extraction process pool, so it must stay a picklable top-level function
+    and must not touch the Flask app.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    parts = []
+    length = 0
+    if extension == '.pdf':
+        from pypdf import PdfReader
+        for page in PdfReader(file_path).pages:
+            page_text = page.extract_text() or ""
+            parts.append(page_text)
+            length += len(page_text)
+            if length >= max_chars:
+                break  # the rest of a very long document would be truncated anyway
+    elif extension == '.docx':
+        import docx
+        for paragraph in docx.Document(file_path).paragraphs:
+            parts.append(paragraph.text)
+            length += len(paragraph.text)
+            if length >= max_chars:
+                break
+    else:
+        with open(file_path, encoding='utf-8', errors='ignore') as f:
+            parts.append(f.read(max_chars))
+
+    text = "\n".join(parts)
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n\s*\n+', '\n\n', text)
+    return text.strip()[:max_chars]
+
+
+def _get_executor():
+    """
+    Returns this process's extraction pool. Children are started with forkserver/spawn rather
+    than fork, since forking a multi-threaded web worker can copy held locks into the child.
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _executor = ProcessPoolExecutor(max_workers=current_app.config.get('RESUME_EXTRACT_WORKERS', 2),
+                                            mp_context=multiprocessing.get_context(start_method))
+            _executor_pid = os.getpid()
+            _pending_extractions.clear()
+        return _executor
+
+
+def resume_file_path(resume_filepath_db):
+    """Maps the stored '/uploads/resumes/<name>' path to the file on disk."""
+    return os.path.join(current_app.config['RESUME_FOLDER'], os.path.basename(resume_filepath_db))
+
+
+def _save_resume_text(candidate_id, resume_text):
+    """
+    Stores the extracted text and queues the one-time LLM condensation of it. Only the first
+    extraction to land is stored, so an upload-time and a turn-time extraction of the same
+    resume (possibly in different workers) queue a single condensation job.
+    """
+    conn = get_db_connection()
+    if not conn:
+        current_app.logger.error(f"Could not store extracted resume text for candidate {candidate_id}.")
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.execute("UPDATE candidates SET resume_text = %s WHERE id = %s AND resume_text IS NULL",
+                       (resume_text, candidate_id))
+        if cursor.rowcount == 1 and resume_text != UNREADABLE_RESUME_TEXT:
+            enqueue_job(cursor, RESUME_CONDENSATION_JOB, payload={"candidate_id": candidate_id})
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def start_resume_extraction(candidate_id, resume_filepath_db):
+    """
+    Submits the resume to the extraction pool and returns immediately.
+    The text is written to candidates.resume_text when extraction finishes.
+    """
+    app = current_app._get_current_object()
+    future = _get_executor().submit(extract_resume_text, resume_file_path(resume_filepath_db),
+                                    app.config.get('RESUME_MAX_CHARS', 20000))
+    with _executor_lock:
+        _pending_extractions[candidate_id] = future
+
+    def on_done(done_future):
+        with app.app_context():
+            try:
+                resume_text = done_future.result() or UNREADABLE_RESUME_TEXT
+            except Exception as e:
+                app.logger.error(f"Resume extraction failed for candidate {candidate_id}: {e}\n{traceback.format_exc()}")
+                resume_text = UNREADABLE_RESUME_TEXT
+            try:
+                _save_resume_text(candidate_id, resume_text)
+            finally:
+                with _executor_lock:
+                    if _pending_extractions.get(candidate_id) is done_future:
+                        del _pending_extractions[candidate_id]
+
+    future.add_done_callback(on_done)
+    return future
+
+
+def get_resume_text(candidate_row):
+    """
+    Returns the stored resume text for a row selected with candidate_id, resume_text and resume_filename.
+    If the background extraction has not landed yet, this waits for it when it runs in this
+    process; otherwise (another worker, or one that died) the resume is extracted once here and
+    stored, so later turns never touch the file again.
+    """
+    if candidate_row.get('resume_text'):
+        return candidate_row['resume_text']
+    if not candidate_row.get('resume_filename'):
+        return NO_RESUME_TEXT
+
+    try:
+        executor = _get_executor()
+        with _executor_lock:
+            future = _pending_extractions.get(candidate_row.get('candidate_id'))
+        if future is None:
+            future = executor.submit(extract_resume_text, resume_file_path(candidate_row['resume_filename']),
+                                     current_app.config.get('RESUME_MAX_CHARS', 20000))
+        resume_text = future.result(timeout=current_app.config.get('RESUME_EXTRACT_TIMEOUT', 30)) or UNREADABLE_RESUME_TEXT
+    except Exception as e:
+        current_app.logger.error(
+            f"Resume extraction failed for candidate {candidate_row.get('candidate_id')}: {e}\n{traceback.format_exc()}")
+        return UNREADABLE_RESUME_TEXT
+
+    if candidate_row.get('candidate_id'):
+        _save_resume_text(candidate_row['candidate_id'], resume_text)
+    candidate_row['resume_text'] = resume_text
+    return resume_text
@@ -0,0 +1,211 @@
+from flask import current_app
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import json
+import os
+import threading
+import traceback
+import uuid
+from app.services.db_services import get_db_connection
+
+JPEG_MAGIC = b'\xff\xd8\xff'
+
+_thumbnail_executor = None
+_thumbnail_executor_pid = None
+_thumbnail_executor_lock = threading.Lock()
+
+
+def save_screenshot_stream(stream, interview_id, max_bytes, chunk_size=64 * 1024):
+    """
+    Copies an uploaded JPEG from a file-like stream to the screenshots folder in fixed-size chunks,
+    never holding the whole image in memory. Returns (db_path, byte_size), or None if the upload
+    is not a JPEG or exceeds max_bytes (the partial file is removed).
+    """
+    filename = f"{interview_id}_{uuid.uuid4()}.jpg"
+    final_path = os.path.join(current_app.config['SCREENSHOT_FOLDER'], filename)
+    temp_path = final_path + '.part'
+    size = 0
+    try:
+        with open(temp_path, 'wb') as f:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                if size == 0 and not chunk.startswith(JPEG_MAGIC):
+                    raise ValueError("not a JPEG")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError("too large")
+                f.write(chunk)
+        if size == 0:
+            raise ValueError("empty upload")
+        os.replace(temp_path, final_path)
+    except ValueError as e:
+        current_app.logger.warning(f"Rejected screenshot for interview {interview_id}: {e}")
+        if os.path.exists(temp_path): os.remove(temp_path)
+        return None
+    except Exception:
+        if os.path.exists(temp_path): os.remove(temp_path)
+        raise
+    return f"/uploads/screenshots/{filename}", size
+
+
+def record_screenshot(cursor, interview_id, db_path, byte_size, phash=None, is_duplicate=False):
+    """Inserts one row per capture; returns the new screenshot id."""
+    cursor.execute(
+        "INSERT INTO interview_screenshots (interview_id, file_path, byte_size, phash, is_duplicate, captured_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        (interview_id, db_path, byte_size, phash, is_duplicate, datetime.datetime.utcnow()))
+    return cursor.lastrowid
+
+
+def compute_dhash(file_path, hash_size=8):
+    """
+    Returns a 64-bit difference hash of the image: each bit records whether a pixel is brighter than
+    its right-hand neighbour in a 9x8 grayscale copy. Frames that look the same to a reviewer land
+    within a few bits of each other even after JPEG re-encoding. Returns None without Pillow.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    with Image.open(file_path) as image:
+        image.draft('L', (hash_size * 8, hash_size * 8))
+        pixels = list(image.convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR).getdata())
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+def store_screenshot(cursor, interview_id, db_path, byte_size):
+    """
+    Records a saved screenshot unless it is a near-duplicate of the interview's last kept frame.
+    The comparison is against the newest non-duplicate row (an indexed single-row lookup), so a
+    slow drift is still captured once it moves SCREENSHOT_DEDUP_THRESHOLD bits away.
+    Returns (screenshot_id, status) where status is 'kept', 'marked' or 'dropped'; dropped
+    frames are deleted from disk and get no row.
+    """
+    mode = current_app.config.get('SCREENSHOT_DEDUP_MODE', 'drop')
+    phash = None
+    if mode != 'off':
+        try:
+            phash = compute_dhash(screenshot_file_path(db_path))
+        except Exception as e:
+            current_app.logger.warning(f"Could not hash screenshot {db_path}: {e}")
+
+    is_duplicate = False
+    if phash is not None:
+        cursor.execute(
+            "SELECT phash FROM interview_screenshots WHERE interview_id = %s AND is_duplicate = FALSE "
+            "AND phash IS NOT NULL ORDER BY id DESC LIMIT 1", (interview_id,))
+        last_kept = cursor.fetchone()
+        if last_kept:
+            last_hash = last_kept['phash'] if isinstance(last_kept, dict) else last_kept[0]
+            is_duplicate = hamming_distance(phash, int(last_hash)) <= current_app.config.get('SCREENSHOT_DEDUP_THRESHOLD', 6)
+
+    if is_duplicate and mode == 'drop':
+        try:
+            os.remove(screenshot_file_path(db_path))
+        except OSError:
+            pass
+        return None, 'dropped'
+    screenshot_id = record_screenshot(cursor, interview_id, db_path, byte_size, phash, is_duplicate)
+    return screenshot_id, 'marked' if is_duplicate else 'kept'
+
+
+def list_screenshots(cursor, interview_id, legacy_paths_json=None, include_duplicates=False):
+    """
+    Returns the interview's screenshots in capture order as [{"id", "url", "thumbnail_url"}, ...].
+    Frames marked as near-duplicates are left out unless include_duplicates is set.
+    Interviews recorded before the interview_screenshots table fall back to the legacy
+    screenshot_paths_json list, which has no ids or thumbnails.
+    """
+    duplicate_filter = "" if include_duplicates else " AND is_duplicate = FALSE"
+    cursor.execute("SELECT id, file_path, is_duplicate FROM interview_screenshots WHERE interview_id = %s"
+                   f"{duplicate_filter} ORDER BY id", (interview_id,))
+    rows = cursor.fetchall()
+    if rows:
+        return [{"id": row['id'], "url": row['file_path'], "is_duplicate": bool(row['is_duplicate']),
+                 "thumbnail_url": f"/api/admin/interviews/{interview_id}/screenshots/{row['id']}/thumbnail"}
+                for row in rows]
+    if isinstance(legacy_paths_json, str):
+        try:
+            legacy_paths_json = json.loads(legacy_paths_json)
+        except json.JSONDecodeError:
+            legacy_paths_json = None
+    return [{"id": None, "url": path, "is_duplicate": False, "thumbnail_url": None}
+            for path in (legacy_paths_json or [])]
+
+
+def screenshot_file_path(db_path):
+    """Maps a stored '/uploads/screenshots/<name>' path to the file on disk."""
+    return os.path.join(current_app.config['SCREENSHOT_FOLDER'], os.path.basename(db_path))
+
+
+def generate_thumbnail(screenshot_id, db_path):
+    """
+    Writes a small WebP thumbnail of a screenshot and records it on the row.
+    Returns the thumbnail's path on disk, or None if it could not be generated.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        current_app.logger.warning("Pillow is not installed; screenshot thumbnails are disabled.")
+        return None
+
+    thumbnail_folder = current_app.config['SCREENSHOT_THUMBNAIL_FOLDER']
+    os.makedirs(thumbnail_folder, exist_ok=True)
+    thumbnail_name = os.path.splitext(os.path.basename(db_path))[0] + '.webp'
+    thumbnail_path = os.path.join(thumbnail_folder, thumbnail_name)
+    max_size = current_app.config.get('SCREENSHOT_THUMBNAIL_SIZE', 320)
+
+    with Image.open(screenshot_file_path(db_path)) as image:
+        # draft() lets the JPEG decoder downscale while decoding, which is much cheaper than a full decode.
+        image.draft('RGB', (max_size, max_size))
+        image = image.convert('RGB')
+        image.thumbnail((max_size, max_size))
+        image.save(thumbnail_path + '.part', format='WEBP', quality=70, method=4)
+    os.replace(thumbnail_path + '.part', thumbnail_path)
+
+    conn = get_db_connection()
+    if conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("UPDATE interview_screenshots SET thumbnail_path = %s WHERE id = %s",
+                           (f"/uploads/screenshots/thumbs/{thumbnail_name}", screenshot_id))
+            conn.commit()
+        finally:
+            conn.close()
+    return thumbnail_path
+
+
+def _get_thumbnail_executor():
+    global _thumbnail_executor, _thumbnail_executor_pid
+    with _thumbnail_executor_lock:
+        if _thumbnail_executor is None or _thumbnail_executor_pid != os.getpid():
+            _thumbnail_executor = ThreadPoolExecutor(
+                max_workers=current_app.config.get('SCREENSHOT_THUMBNAIL_WORKERS', 2), thread_name_prefix='thumbnail')
+            _thumbnail_executor_pid = os.getpid()
+        return _thumbnail_executor
+
+
+def queue_thumbnail(screenshot_id, db_path):
+    """Generates the thumbnail off the request thread once the upload has been committed."""
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            try:
+                generate_thumbnail(screenshot_id, db_path)
+            except Exception as e:
+                app.logger.error(f"Thumbnail generation failed for screenshot {screenshot_id}: {e}\n{traceback.format_exc()}")
+
+    _get_thumbnail_executor().submit(run)
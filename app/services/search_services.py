@@ -0,0 +1,114 @@
+import html
+import re
+
+# Relative weight of a match in each source when ranking interviews
+SOURCE_WEIGHTS = {"candidate": 3.0, "summary": 1.5, "transcript": 1.0}
+# Transcript turns contributing to an interview's score (so one long rambling interview
+# that repeats a term does not outrank every other candidate)
+MAX_TRANSCRIPT_HITS_PER_INTERVIEW = 3
+SNIPPET_RADIUS = 80
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def parse_search_terms(query, min_length=3):
+    """Splits free text into search words, dropping tokens shorter than InnoDB's innodb_ft_min_token_size."""
+    return [token for token in _TOKEN_RE.findall(query.lower()) if len(token) >= min_length]
+
+
+def build_boolean_query(terms):
+    """Every word must appear; the trailing * lets 'kube' match 'kubernetes'."""
+    return " ".join(f"+{term}*" for term in terms)
+
+
+def highlight_snippet(text, terms, radius=SNIPPET_RADIUS):
+    """
+    Returns an HTML-escaped excerpt of text around the first matching term with every term
+    occurrence wrapped in <mark>, or None if no term occurs in it.
+    """
+    if not text: return None
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in terms) + r')\w*', re.IGNORECASE)
+    first = pattern.search(text)
+    if not first: return None
+    start = max(0, first.start() - radius)
+    end = min(len(text), first.end() + radius)
+    excerpt = text[start:end]
+    parts, last = [], 0
+    for match in pattern.finditer(excerpt):
+        parts.append(html.escape(excerpt[last:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+        last = match.end()
+    parts.append(html.escape(excerpt[last:]))
+    return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
+
+
+def search_interviews(cursor, company_id, query, limit=20, job_id=None):
+    """
+    Ranked full-text search over candidate name/email, AI summaries and transcript turns,
+    answered from the FULLTEXT indexes in the baseline migration and scoped to one company.
+    Returns [{"interview": {...}, "score": float, "snippets": [...]}, ...], best match first.
+    """
+    terms = parse_search_terms(query)
+    if not terms: return []
+    against = build_boolean_query(terms)
+    job_filter = " AND i.job_id = %s" if job_id else ""
+    job_params = [job_id] if job_id else []
+    # Each source returns a bounded number of hits; ranking then happens per interview.
+    hit_limit = limit * 5
+
+    hits = {}
+
+    def add_hit(interview_id, source, relevance, snippet):
+        entry = hits.setdefault(interview_id, {"score": 0.0, "snippets": [], "transcript_hits": 0})
+        if source == "transcript":
+            if entry["transcript_hits"] >= MAX_TRANSCRIPT_HITS_PER_INTERVIEW: return
+            entry["transcript_hits"] += 1
+        entry["score"] += SOURCE_WEIGHTS[source] * float(relevance)
+        if snippet: entry["snippets"].append(snippet)
+
+    cursor.execute(
+        "SELECT i.id AS interview_id, c.name, c.email, MATCH(c.name, c.email) AGAINST (%s IN BOOLEAN MODE) AS relevance "
+        "FROM candidates c JOIN interviews i ON i.candidate_id = c.id "
+        f"WHERE MATCH(c.name, c.email) AGAINST (%s IN BOOLEAN MODE) AND i.company_id = %s{job_filter} "
+        "ORDER BY relevance DESC LIMIT %s",
+        (against, against, company_id, *job_params, hit_limit))
+    for row in cursor.fetchall():
+        text = f"{row['name'] or ''} <{row['email'] or ''}>"
+        add_hit(row['interview_id'], "candidate", row['relevance'],
+                {"source": "candidate", "html": highlight_snippet(text, terms)})
+
+    cursor.execute(
+        "SELECT i.id AS interview_id, i.ai_summary, MATCH(i.ai_summary) AGAINST (%s IN BOOLEAN MODE) AS relevance "
+        f"FROM interviews i WHERE MATCH(i.ai_summary) AGAINST (%s IN BOOLEAN MODE) AND i.company_id = %s{job_filter} "
+        "ORDER BY relevance DESC LIMIT %s",
+        (against, against, company_id, *job_params, hit_limit))
+    for row in cursor.fetchall():
+        add_hit(row['interview_id'], "summary", row['relevance'],
+                {"source": "summary", "html": highlight_snippet(row['ai_summary'], terms)})
+
+    cursor.execute(
+        "SELECT t.interview_id, t.seq, t.actor, t.text, MATCH(t.text) AGAINST (%s IN BOOLEAN MODE) AS relevance "
+        "FROM interview_turns t JOIN interviews i ON t.interview_id = i.id "
+        f"WHERE MATCH(t.text) AGAINST (%s IN BOOLEAN MODE) AND i.company_id = %s{job_filter} "
+        "ORDER BY relevance DESC LIMIT %s",
+        (against, against, company_id, *job_params, hit_limit))
+    for row in cursor.fetchall():
+        add_hit(row['interview_id'], "transcript", row['relevance'],
+                {"source": "transcript", "seq": row['seq'], "actor": row['actor'],
+                 "html": highlight_snippet(row['text'], terms)})
+
+    ranked = sorted(hits.items(), key=lambda item: item[1]["score"], reverse=True)[:limit]
+    if not ranked: return []
+
+    placeholders = ", ".join(["%s"] * len(ranked))
+    cursor.execute(
+        "SELECT i.id, i.job_id, i.status, i.score, i.interview_date, j.title AS job_title, "
+        "c.name AS candidate_name, c.email AS candidate_email "
+        "FROM interviews i JOIN jobs j ON i.job_id = j.id LEFT JOIN candidates c ON i.candidate_id = c.id "
+        f"WHERE i.id IN ({placeholders})",
+        tuple(interview_id for interview_id, _ in ranked))
+    interviews = {row['id']: row for row in cursor.fetchall()}
+
+    return [{"interview": interviews[interview_id], "score": round(entry["score"], 4),
+             "snippets": [snippet for snippet in entry["snippets"] if snippet.get("html")]}
+            for interview_id, entry in ranked if interview_id in interviews]
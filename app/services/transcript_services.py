@@ -0,0 +1,153 @@
+import mysql.connector
+from flask import current_app
+import datetime
+import json
+import traceback
+from app.services.db_services import get_db_connection
+
+# MySQL error raised when two requests append to the same interview at once and pick the same seq.
+# Only the failed statement is rolled back, so it is safe to retry inside the caller's transaction.
+_ER_DUP_ENTRY = 1062
+
+
+def _turn_to_dict(row):
+    return {"seq": row['seq'], "actor": row['actor'], "text": row['text'], "timestamp": row['created_at'].isoformat()}
+
+
+class StaleTurnError(Exception):
+    """
+    Raised when turns were appended after the transcript a reply was generated from, e.g. an answer
+    submitted twice. replay is the AI turn already stored for an identical submission, if there is one.
+    """
+
+    def __init__(self, replay=None, status=None):
+        super().__init__("Transcript changed since this turn was generated")
+        self.replay = replay
+        self.status = status
+
+
+def last_turn_seq(transcript):
+    return transcript[-1]['seq'] if transcript else 0
+
+
+def lock_interview_for_turns(cursor, interview_id, expected_last_seq=None, candidate_text=None):
+    """
+    Locks the interview row so appends to one interview run one at a time (computing seq under
+    InnoDB's next-key locks alone lets two concurrent submits deadlock), and returns its status.
+    With expected_last_seq, raises StaleTurnError if the transcript has moved past that seq.
+    """
+    cursor.execute("SELECT status FROM interviews WHERE id = %s FOR UPDATE", (interview_id,))
+    row = cursor.fetchone()
+    status = (row['status'] if isinstance(row, dict) else row[0]) if row else None
+    if expected_last_seq is None:
+        return status
+
+    cursor.execute("SELECT seq, actor, text, created_at FROM interview_turns WHERE interview_id = %s AND seq > %s "
+                   "ORDER BY seq LIMIT 2", (interview_id, expected_last_seq))
+    newer = [_turn_to_dict(row) for row in cursor.fetchall()]
+    if not newer:
+        return status
+    # The same submission already went through: hand back the reply that was stored for it.
+    expected_actors = (['candidate'] if candidate_text is not None else []) + ['ai']
+    replay = None
+    if [turn['actor'] for turn in newer[:len(expected_actors)]] == expected_actors and \
+            (candidate_text is None or newer[0]['text'] == candidate_text):
+        replay = newer[len(expected_actors) - 1]['text']
+    raise StaleTurnError(replay, status)
+
+
+def append_turn(cursor, interview_id, actor, text, attempts=3):
+    """
+    Appends one transcript turn as a single-row insert and returns its seq. Call
+    lock_interview_for_turns() first in the same transaction; seq is MAX(seq)+1 for the interview,
+    and the UNIQUE (interview_id, seq) key still turns any unserialized append into a retried
+    duplicate-key error.
+    """
+    for attempt in range(attempts):
+        try:
+            cursor.execute(
+                "INSERT INTO interview_turns (interview_id, seq, actor, text, created_at) "
+                "SELECT %s, COALESCE(MAX(seq), 0) + 1, %s, %s, %s FROM interview_turns WHERE interview_id = %s",
+                (interview_id, actor, text, datetime.datetime.utcnow(), interview_id))
+            cursor.execute("SELECT seq FROM interview_turns WHERE id = LAST_INSERT_ID()")
+            row = cursor.fetchone()
+            return row['seq'] if isinstance(row, dict) else row[0]
+        except mysql.connector.Error as err:
+            if err.errno != _ER_DUP_ENTRY or attempt == attempts - 1:
+                raise
+
+
+def _parse_legacy_transcript(transcript_json):
+    if not transcript_json: return []
+    if isinstance(transcript_json, str):
+        try:
+            return json.loads(transcript_json) or []
+        except json.JSONDecodeError:
+            return []
+    return transcript_json
+
+
+def migrate_legacy_transcript(cursor, interview_id, transcript_json):
+    """
+    Copies a legacy interviews.transcript_json blob into interview_turns (seq 1..n).
+    INSERT IGNORE makes it safe to run twice. Returns the number of turns copied.
+    """
+    transcript = _parse_legacy_transcript(transcript_json)
+    if not transcript: return 0
+    rows = []
+    for seq, turn in enumerate(transcript, start=1):
+        try:
+            created_at = datetime.datetime.fromisoformat(turn.get('timestamp'))
+        except (TypeError, ValueError):
+            created_at = datetime.datetime.utcnow()
+        rows.append((interview_id, seq, turn.get('actor'), turn.get('text') or '', created_at))
+    cursor.executemany(
+        "INSERT IGNORE INTO interview_turns (interview_id, seq, actor, text, created_at) VALUES (%s, %s, %s, %s, %s)",
+        rows)
+    return len(rows)
+
+
+def load_transcript(cursor, interview_id, legacy_transcript_json=None):
+    """
+    Assembles the transcript as [{"seq", "actor", "text", "timestamp"}, ...] in turn order.
+    Interviews that predate interview_turns are migrated on first read (the caller commits).
+    """
+    cursor.execute("SELECT seq, actor, text, created_at FROM interview_turns WHERE interview_id = %s ORDER BY seq",
+                   (interview_id,))
+    rows = cursor.fetchall()
+    if not rows and legacy_transcript_json:
+        if migrate_legacy_transcript(cursor, interview_id, legacy_transcript_json):
+            cursor.execute("SELECT seq, actor, text, created_at FROM interview_turns WHERE interview_id = %s ORDER BY seq",
+                           (interview_id,))
+            rows = cursor.fetchall()
+    return [_turn_to_dict(row) for row in rows]
+
+
+def backfill_interview_turns(batch_size=200):
+    """Migrates every legacy transcript_json that has no interview_turns rows yet. Returns interviews migrated."""
+    conn = get_db_connection()
+    if not conn: return 0
+    cursor = conn.cursor(dictionary=True)
+    migrated = 0
+    try:
+        while True:
+            cursor.execute(
+                "SELECT i.id, i.transcript_json FROM interviews i WHERE i.transcript_json IS NOT NULL "
+                "AND NOT EXISTS (SELECT 1 FROM interview_turns t WHERE t.interview_id = i.id) LIMIT %s",
+                (batch_size,))
+            batch = cursor.fetchall()
+            copied_in_batch = 0
+            for interview in batch:
+                if migrate_legacy_transcript(cursor, interview['id'], interview['transcript_json']):
+                    copied_in_batch += 1
+            conn.commit()
+            migrated += copied_in_batch
+            # Rows whose JSON is empty or unparseable never gain turns; stop once a batch makes no progress.
+            if len(batch) < batch_size or copied_in_batch == 0:
+                return migrated
+    except Exception as e:
+        current_app.logger.error(f"Transcript backfill failed after {migrated} interviews: {e}\n{traceback.format_exc()}")
+        if conn.is_connected(): conn.rollback()
+        raise
+    finally:
+        conn.close()
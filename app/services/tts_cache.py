@@ -0,0 +1,171 @@
+from flask import current_app
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+
+class TTSCache:
+    """
+    Content-addressed on-disk cache of synthesized speech.
+    Files are named by hash(text, voice, model, format), so a given file never changes and a hit
+    can be served straight from disk. Every hit touches the file's mtime, and eviction removes
+    the least recently used files once the cache grows past max_bytes.
+    Methods do not need an app context, so they can be called from TTS worker threads.
+    """
+
+    def __init__(self, folder, max_bytes):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        self._stats = {"hits": 0, "misses": 0, "bytes_saved": 0, "bytes_written": 0, "evictions": 0}
+        os.makedirs(folder, exist_ok=True)
+
+    @staticmethod
+    def make_key(text, voice, model, audio_format):
+        payload = json.dumps([text, voice, model, audio_format], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key, audio_format):
+        # Two-level fan-out keeps directory listings small.
+        return os.path.join(self.folder, key[:2], f"{key}.{audio_format}")
+
+    def lookup(self, key, audio_format):
+        """Returns the cached file path and records a hit, or returns None and records a miss."""
+        path = self.path_for(key, audio_format)
+        try:
+            size = os.path.getsize(path)
+            os.utime(path)  # mark as recently used
+        except OSError:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        with self._lock:
+            self._stats["hits"] += 1
+            self._stats["bytes_saved"] += size
+        return path
+
+    def read(self, key, audio_format):
+        """Returns the cached bytes, or None on a miss."""
+        path = self.lookup(key, audio_format)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def open_writer(self, key, audio_format):
+        """Returns a CacheWriter for teeing a streamed response into the cache."""
+        return CacheWriter(self, key, audio_format)
+
+    def store(self, key, audio_format, audio_bytes):
+        writer = self.open_writer(key, audio_format)
+        writer.write(audio_bytes)
+        writer.commit()
+
+    def _record_write(self, size):
+        with self._lock:
+            self._stats["bytes_written"] += size
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total()
+            self._total_bytes += size
+            over_limit = self._total_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _scan_total(self):
+        total = 0
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def evict(self):
+        """Deletes least recently used files until the cache is back under 90% of max_bytes."""
+        entries = []
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                if name.startswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._total_bytes = total
+            self._stats["evictions"] += evicted
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_bytes"] = self._total_bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+        stats["max_bytes"] = self.max_bytes
+        stats["pid"] = os.getpid()
+        return stats
+
+
+class CacheWriter:
+    """Writes to a temp file and atomically renames it into place on commit()."""
+
+    def __init__(self, cache, key, audio_format):
+        self.cache = cache
+        self.final_path = cache.path_for(key, audio_format)
+        directory = os.path.dirname(self.final_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(prefix='.tmp', dir=directory)
+        self._file = os.fdopen(fd, 'wb')
+        self._size = 0
+
+    def write(self, chunk):
+        self._file.write(chunk)
+        self._size += len(chunk)
+
+    def commit(self):
+        self._file.close()
+        if self._size == 0:
+            self.abort()
+            return
+        os.replace(self.temp_path, self.final_path)
+        self.cache._record_write(self._size)
+
+    def abort(self):
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+
+def get_tts_cache():
+    """Returns this app's TTS cache, creating it on first use."""
+    cache = current_app.extensions.get('tts_cache')
+    if cache is None:
+        cache = TTSCache(current_app.config['TTS_CACHE_FOLDER'], current_app.config['TTS_CACHE_MAX_BYTES'])
+        current_app.extensions['tts_cache'] = cache
+    return cache
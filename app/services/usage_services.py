@@ -0,0 +1,266 @@
+from flask import current_app
+import atexit
+import datetime
+import os
+import threading
+import traceback
+import mysql.connector
+from app.services.db_services import get_db_connection, RETRYABLE_TRANSACTION_ERRORS
+
+# call_type for speech synthesis; LLM calls use the LLM_CALL_* call sites from ai_services
+USAGE_CALL_TTS = 'tts'
+USAGE_GROUPS = ('interview', 'job', 'tenant')
+USAGE_GRANULARITIES = ('total', 'day')
+
+_ROLLUP_SUMS = ("calls = calls + VALUES(calls), errors = errors + VALUES(errors), "
+                "prompt_tokens = prompt_tokens + VALUES(prompt_tokens), "
+                "completion_tokens = completion_tokens + VALUES(completion_tokens), "
+                "tts_characters = tts_characters + VALUES(tts_characters), "
+                "latency_ms_total = latency_ms_total + VALUES(latency_ms_total), "
+                "estimated_calls = estimated_calls + VALUES(estimated_calls)")
+# estimated_calls counts calls whose tokens were estimated locally because the provider reported no usage
+_METRIC_COLUMNS = ('calls', 'errors', 'prompt_tokens', 'completion_tokens', 'tts_characters', 'latency_ms_total',
+                   'estimated_calls')
+_METRIC_SUMS = ", ".join(f"SUM({column}) AS {column}" for column in _METRIC_COLUMNS)
+
+# Per-process buffer of (interview_id, call_type, model, prompt_tokens, completion_tokens,
+# tts_characters, latency_ms, ok, estimated, created_at) tuples waiting for the flusher thread.
+_buffer = []
+_buffer_pid = None
+_buffer_lock = threading.Lock()
+_flusher = None
+_flush_wakeup = threading.Event()
+
+
+def record_usage(call_type, latency_seconds, interview_id=None, prompt_tokens=0, completion_tokens=0,
+                 tts_characters=0, ok=True, model=None, estimated=False):
+    """
+    Queues one LLM/TTS call for this process's usage flusher, which writes llm_usage_events and the
+    daily and per-interview rollups in batches (see flush_usage), so the request path does no database
+    work and concurrent calls do not queue on the same rollup row. Never raises: usage accounting
+    must not fail an interview. estimated marks token counts that are a local estimate rather than
+    the provider's reported usage.
+    """
+    event = (interview_id, call_type, model, prompt_tokens or 0, completion_tokens or 0, tts_characters or 0,
+             int(latency_seconds * 1000), bool(ok), bool(estimated), datetime.datetime.utcnow())
+    try:
+        app = current_app._get_current_object()
+        with _buffer_lock:
+            _ensure_flusher(app)
+            _buffer.append(event)
+            full = len(_buffer) >= app.config.get('USAGE_FLUSH_BATCH', 200)
+        if full:
+            _flush_wakeup.set()
+    except Exception as e:
+        current_app.logger.error(f"Could not queue usage for {call_type} call: {e}\n{traceback.format_exc()}")
+
+
+def _ensure_flusher(app):
+    """Starts this process's flusher thread (again after a fork). Call with _buffer_lock held."""
+    global _flusher, _buffer_pid
+    if _flusher is not None and _buffer_pid == os.getpid():
+        return
+    # A forked child must not write the events its parent had buffered at fork time.
+    del _buffer[:]
+    _buffer_pid = os.getpid()
+    _flusher = threading.Thread(target=_flush_loop, args=(app,), name='usage-flusher', daemon=True)
+    _flusher.start()
+    atexit.register(flush_usage, app)
+
+
+def _flush_loop(app):
+    while True:
+        _flush_wakeup.wait(app.config.get('USAGE_FLUSH_INTERVAL', 5))
+        _flush_wakeup.clear()
+        flush_usage(app)
+
+
+def _requeue(app, events):
+    limit = app.config.get('USAGE_BUFFER_MAX', 10000)
+    with _buffer_lock:
+        _buffer[:0] = events
+        dropped = len(_buffer) - limit
+        if dropped > 0:
+            del _buffer[:dropped]
+    if dropped > 0:
+        app.logger.warning(f"Usage buffer full: dropped {dropped} oldest usage events")
+
+
+def _add_metrics(totals, errors, prompt_tokens, completion_tokens, tts_characters, latency_ms, estimated):
+    for index, value in enumerate((1, errors, prompt_tokens, completion_tokens, tts_characters, latency_ms,
+                                   1 if estimated else 0)):
+        totals[index] += value
+
+
+def flush_usage(app=None):
+    """
+    Writes the buffered usage events in one transaction: a batched insert into llm_usage_events,
+    plus one upsert per rollup row touched, with the deltas pre-summed in memory. Rollup rows are
+    upserted in key order so flushes from different workers lock them in the same order.
+    Events are put back for the next flush if the database is unreachable or the transaction
+    deadlocks; other failures drop the batch (logged).
+    """
+    app = app or current_app._get_current_object()
+    with _buffer_lock:
+        if _buffer_pid != os.getpid() or not _buffer:
+            return
+        events = _buffer[:]
+        del _buffer[:]
+
+    with app.app_context():
+        conn = get_db_connection()
+        if not conn:
+            app.logger.warning(f"Usage flush postponed ({len(events)} events): database connection failed")
+            _requeue(app, events)
+            return
+        cursor = conn.cursor()
+        try:
+            interview_ids = sorted({event[0] for event in events if event[0]})
+            contexts = {}
+            if interview_ids:
+                placeholders = ", ".join(["%s"] * len(interview_ids))
+                cursor.execute(f"SELECT id, company_id, job_id FROM interviews WHERE id IN ({placeholders})",
+                               tuple(interview_ids))
+                contexts = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+            event_rows, daily, per_interview = [], {}, {}
+            for (interview_id, call_type, model, prompt_tokens, completion_tokens, tts_characters, latency_ms, ok,
+                 estimated, created_at) in events:
+                company_id, job_id = contexts.get(interview_id, (None, None))
+                errors = 0 if ok else 1
+                metrics = (errors, prompt_tokens, completion_tokens, tts_characters, latency_ms, estimated)
+                event_rows.append((company_id, job_id, interview_id, call_type, model, prompt_tokens,
+                                   completion_tokens, tts_characters, estimated, latency_ms, ok, created_at))
+                totals = daily.setdefault((company_id or '', created_at.date(), job_id or '', call_type),
+                                          [0] * len(_METRIC_COLUMNS))
+                _add_metrics(totals, *metrics)
+                if company_id:
+                    entry = per_interview.setdefault(
+                        (interview_id, call_type),
+                        [company_id, job_id, [0] * len(_METRIC_COLUMNS), created_at, created_at])
+                    _add_metrics(entry[2], *metrics)
+                    entry[3], entry[4] = min(entry[3], created_at), max(entry[4], created_at)
+
+            cursor.executemany(
+                "INSERT INTO llm_usage_events (company_id, job_id, interview_id, call_type, model, prompt_tokens, "
+                "completion_tokens, tts_characters, estimated, latency_ms, success, created_at) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)", event_rows)
+            cursor.executemany(
+                "INSERT INTO llm_usage_daily (company_id, usage_date, job_id, call_type, calls, errors, prompt_tokens, "
+                "completion_tokens, tts_characters, latency_ms_total, estimated_calls) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+                f"ON DUPLICATE KEY UPDATE {_ROLLUP_SUMS}",
+                [(*key, *daily[key]) for key in sorted(daily)])
+            if per_interview:
+                cursor.executemany(
+                    "INSERT INTO llm_usage_interviews (interview_id, call_type, company_id, job_id, calls, errors, "
+                    "prompt_tokens, completion_tokens, tts_characters, latency_ms_total, estimated_calls, first_used_at, "
+                    "last_used_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+                    f"ON DUPLICATE KEY UPDATE {_ROLLUP_SUMS}, last_used_at = GREATEST(last_used_at, VALUES(last_used_at))",
+                    [(*key, company_id, job_id, *totals, first_used_at, last_used_at)
+                     for key, (company_id, job_id, totals, first_used_at, last_used_at) in sorted(per_interview.items())])
+            conn.commit()
+        except Exception as e:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            if isinstance(e, mysql.connector.Error) and e.errno in RETRYABLE_TRANSACTION_ERRORS:
+                app.logger.warning(f"Usage flush aborted ({e.errno}), retrying {len(events)} events on the next flush")
+                _requeue(app, events)
+            else:
+                app.logger.error(f"Could not record {len(events)} usage events: {e}\n{traceback.format_exc()}")
+        finally:
+            conn.close()
+
+
+def _empty_metrics():
+    return {column: 0 for column in _METRIC_COLUMNS}
+
+
+def _finish_metrics(metrics):
+    metrics['avg_latency_ms'] = round(metrics['latency_ms_total'] / metrics['calls']) if metrics['calls'] else 0
+    return metrics
+
+
+def _fold_rows(rows, key_fields):
+    """Groups rollup rows (one per call_type) into entries with overall totals and a per-call-type breakdown."""
+    entries = {}
+    for row in rows:
+        key = tuple(row[field] for field in key_fields)
+        entry = entries.get(key)
+        if entry is None:
+            entry = {field: row[field] for field in key_fields}
+            entry['totals'] = _empty_metrics()
+            entry['by_call_type'] = {}
+            entries[key] = entry
+        metrics = {column: int(row[column] or 0) for column in _METRIC_COLUMNS}
+        entry['by_call_type'][row['call_type']] = _finish_metrics(dict(metrics))
+        for column in _METRIC_COLUMNS:
+            entry['totals'][column] += metrics[column]
+    for entry in entries.values():
+        _finish_metrics(entry['totals'])
+    return list(entries.values())
+
+
+def usage_report(cursor, company_id, group_by, start_date, end_date, granularity='total', job_id=None,
+                 interview_id=None, limit=100):
+    """
+    Aggregated usage for one tenant between start_date and end_date (inclusive dates), read from the
+    rollup tables only. group_by 'tenant' and 'job' can be split per day; 'interview' returns running
+    totals for interviews last used in the range, most recent first.
+    """
+    per_day = granularity == 'day'
+    if group_by == 'interview':
+        query = (f"SELECT u.interview_id, u.job_id, u.call_type, u.first_used_at, u.last_used_at, "
+                 f"{', '.join('u.' + column for column in _METRIC_COLUMNS)} "
+                 "FROM llm_usage_interviews u "
+                 "JOIN (SELECT interview_id FROM llm_usage_interviews WHERE company_id = %s "
+                 "AND last_used_at >= %s AND last_used_at < %s")
+        params = [company_id, start_date, end_date + datetime.timedelta(days=1)]
+        if job_id:
+            query += " AND job_id = %s"
+            params.append(job_id)
+        if interview_id:
+            query += " AND interview_id = %s"
+            params.append(interview_id)
+        query += (" GROUP BY interview_id ORDER BY MAX(last_used_at) DESC LIMIT %s) recent "
+                  "ON recent.interview_id = u.interview_id ORDER BY u.last_used_at DESC")
+        params.append(limit)
+        cursor.execute(query, tuple(params))
+        rows = cursor.fetchall()
+        entries = _fold_rows(rows, ('interview_id', 'job_id'))
+        used_at = {}
+        for row in rows:
+            first, last = used_at.get(row['interview_id'], (row['first_used_at'], row['last_used_at']))
+            used_at[row['interview_id']] = (min(first, row['first_used_at']), max(last, row['last_used_at']))
+        for entry in entries:
+            entry['first_used_at'], entry['last_used_at'] = used_at[entry['interview_id']]
+        return entries
+
+    key_fields = (('job_id',) if group_by == 'job' else ()) + (('usage_date',) if per_day else ())
+    select_keys = "".join(f"{field}, " for field in key_fields)
+    query = (f"SELECT {select_keys}call_type, {_METRIC_SUMS} FROM llm_usage_daily "
+             "WHERE company_id = %s AND usage_date BETWEEN %s AND %s")
+    params = [company_id, start_date, end_date]
+    if group_by == 'job' and job_id:
+        query += " AND job_id = %s"
+        params.append(job_id)
+    query += f" GROUP BY {select_keys}call_type ORDER BY {select_keys}call_type"
+    cursor.execute(query, tuple(params))
+    entries = _fold_rows(cursor.fetchall(), key_fields)
+    if per_day:
+        for entry in entries:
+            entry['usage_date'] = entry['usage_date'].isoformat()
+
+    if group_by == 'job' and entries:
+        job_ids = sorted({entry['job_id'] for entry in entries if entry['job_id']})
+        titles = {}
+        if job_ids:
+            placeholders = ", ".join(["%s"] * len(job_ids))
+            cursor.execute(f"SELECT id, title FROM jobs WHERE company_id = %s AND id IN ({placeholders})",
+                           (company_id, *job_ids))
+            titles = {row['id']: row['title'] for row in cursor.fetchall()}
+        for entry in entries:
+            entry['job_title'] = titles.get(entry['job_id'])
+    return entries
@@ -12,6 +12,15 @@ class Config:
 
     # OpenAI Configuration
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+    # Alternate API endpoint, e.g. http://127.0.0.1:8100/v1 for loadtest/fake_openai.py (unset: api.openai.com)
+    OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL') or None
+    # Shared keep-alive connection pool used by every OpenAI/LangChain client in a worker process
+    OPENAI_HTTP_MAX_CONNECTIONS = int(os.environ.get('OPENAI_HTTP_MAX_CONNECTIONS', 20))
+    OPENAI_HTTP_MAX_KEEPALIVE = int(os.environ.get('OPENAI_HTTP_MAX_KEEPALIVE', 10))
+    OPENAI_HTTP_KEEPALIVE_EXPIRY = float(os.environ.get('OPENAI_HTTP_KEEPALIVE_EXPIRY', 60))
+    # Seconds; the read timeout must cover a full non-streamed generation
+    OPENAI_TIMEOUT = float(os.environ.get('OPENAI_TIMEOUT', 60))
+    OPENAI_CONNECT_TIMEOUT = float(os.environ.get('OPENAI_CONNECT_TIMEOUT', 5))
 
     # Database Configuration
     DB_HOST = os.environ.get('DB_HOST', 'localhost')
@@ -19,6 +28,23 @@ class Config:
     DB_PASSWORD = os.environ.get('DB_PASSWORD')
     DB_NAME = os.environ.get('DB_NAME')
 
+    # Connection pool (per worker process)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    # Seconds a request waits for a free connection before giving up
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+    # Connections older than this many seconds are replaced on borrow (0 disables)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 3600))
+    # Versioned schema migrations applied by `flask db-upgrade` (NNNN_name.sql, in version order)
+    MIGRATIONS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+    # Prometheus /metrics endpoint. Under gunicorn, gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR so all
+    # workers' samples are aggregated; give worker.py the same directory to include background jobs.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ['true', '1', 't']
+    # /metrics answers 404 unless a scraper is allowed in: a bearer token, and/or a comma-separated list
+    # of client IPs/networks (e.g. '10.0.0.0/8,127.0.0.1'). Behind a proxy the client IP is the proxy's.
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    METRICS_ALLOWED_IPS = [ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()]
+
     # Email Configuration
     # IMPORTANT: Update these values in your .env file
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
@@ -33,8 +59,83 @@ class Config:
     # For Gmail, this MUST be a 16-character "App Password", not your regular password.
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
 
+    # Invitations are sent by the background worker; this many messages share one SMTP session.
+    # For local testing point MAIL_SERVER/MAIL_PORT at an SMTP stand-in (e.g. the mailpit service in
+    # docker-compose.yml: MAIL_SERVER=localhost MAIL_PORT=1025 MAIL_USE_SSL=false).
+    INVITE_SMTP_CHUNK_SIZE = int(os.environ.get('INVITE_SMTP_CHUNK_SIZE', 50))
+    # Base URL used for the candidate link in invitation emails
+    INVITE_BASE_URL = os.environ.get('INVITE_BASE_URL', 'http://localhost:5001')
+
+    # Background job queue (see worker.py)
+    JOB_WORKER_CONCURRENCY = int(os.environ.get('JOB_WORKER_CONCURRENCY', 4))
+    # Seconds an idle worker sleeps between polls of the background_jobs table
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 2))
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+    # Base retry delay in seconds; doubled after every failed attempt
+    JOB_RETRY_BACKOFF = int(os.environ.get('JOB_RETRY_BACKOFF', 30))
+    # A running job whose worker has been silent this long is handed to another worker
+    JOB_LOCK_TIMEOUT = int(os.environ.get('JOB_LOCK_TIMEOUT', 600))
+    # Seconds between a worker's refreshes of the locks on the jobs it is running; keep well below JOB_LOCK_TIMEOUT
+    JOB_HEARTBEAT_INTERVAL = int(os.environ.get('JOB_HEARTBEAT_INTERVAL', 60))
+
+    # Number of sentences synthesized in parallel by /api/interview/text-to-speech/stream
+    TTS_PIPELINE_CONCURRENCY = int(os.environ.get('TTS_PIPELINE_CONCURRENCY', 4))
+
     # File Upload Configuration
     UPLOAD_FOLDER = 'uploads'
     RESUME_FOLDER = os.path.join(UPLOAD_FOLDER, 'resumes')
     SCREENSHOT_FOLDER = os.path.join(UPLOAD_FOLDER, 'screenshots')
+    # Largest accepted webcam capture, in bytes
+    SCREENSHOT_MAX_BYTES = int(os.environ.get('SCREENSHOT_MAX_BYTES', 2 * 1024 * 1024))
+    SCREENSHOT_THUMBNAIL_FOLDER = os.path.join(SCREENSHOT_FOLDER, 'thumbs')
+    # Longest edge of generated thumbnails, in pixels
+    SCREENSHOT_THUMBNAIL_SIZE = int(os.environ.get('SCREENSHOT_THUMBNAIL_SIZE', 320))
+    SCREENSHOT_THUMBNAIL_WORKERS = int(os.environ.get('SCREENSHOT_THUMBNAIL_WORKERS', 2))
+    # Near-duplicate suppression: 'drop' deletes frames that match the last kept one, 'mark' keeps
+    # them flagged (hidden from review by default), 'off' stores every frame
+    SCREENSHOT_DEDUP_MODE = os.environ.get('SCREENSHOT_DEDUP_MODE', 'drop')
+    # Maximum dHash Hamming distance (out of 64 bits) still treated as the same scene
+    SCREENSHOT_DEDUP_THRESHOLD = int(os.environ.get('SCREENSHOT_DEDUP_THRESHOLD', 6))
+
+    # Rolling conversation summary: once the verbatim history in a turn's prompt exceeds this many
+    # tokens, older turns are folded into interviews.history_summary by a background job.
+    HISTORY_VERBATIM_TOKEN_BUDGET = int(os.environ.get('HISTORY_VERBATIM_TOKEN_BUDGET', 1500))
+    HISTORY_SUMMARY_MAX_CHARS = int(os.environ.get('HISTORY_SUMMARY_MAX_CHARS', 2000))
+
+    # Seconds a cursor-paged interview list reuses its total count (per worker process)
+    INTERVIEW_COUNT_CACHE_TTL = int(os.environ.get('INTERVIEW_COUNT_CACHE_TTL', 30))
+    # Seconds a worker reuses a company's dashboard summary cards
+    DASHBOARD_SUMMARY_CACHE_TTL = int(os.environ.get('DASHBOARD_SUMMARY_CACHE_TTL', 15))
+
+    # Logged-in admins are cached per worker so Flask-Login does not query the admins table on every request
+    ADMIN_CACHE_TTL = int(os.environ.get('ADMIN_CACHE_TTL', 300))
+    ADMIN_CACHE_SIZE = int(os.environ.get('ADMIN_CACHE_SIZE', 1024))
+
+    # LLM/TTS usage events are buffered per worker and written in batches every USAGE_FLUSH_INTERVAL
+    # seconds, or sooner once USAGE_FLUSH_BATCH are waiting. USAGE_BUFFER_MAX caps what is kept while
+    # the database is unreachable.
+    USAGE_FLUSH_INTERVAL = float(os.environ.get('USAGE_FLUSH_INTERVAL', 5))
+    USAGE_FLUSH_BATCH = int(os.environ.get('USAGE_FLUSH_BATCH', 200))
+    USAGE_BUFFER_MAX = int(os.environ.get('USAGE_BUFFER_MAX', 10000))
+
+    # Resume text extraction (runs in a process pool at upload time)
+    RESUME_EXTRACT_WORKERS = int(os.environ.get('RESUME_EXTRACT_WORKERS', 2))
+    # Seconds a turn waits for extraction if the upload-time extraction has not landed yet
+    RESUME_EXTRACT_TIMEOUT = int(os.environ.get('RESUME_EXTRACT_TIMEOUT', 30))
+    RESUME_MAX_CHARS = int(os.environ.get('RESUME_MAX_CHARS', 20000))
+
+    # Content-addressed cache of synthesized speech (see app/services/tts_cache.py)
+    TTS_CACHE_FOLDER = os.path.join(UPLOAD_FOLDER, 'tts_cache')
+    TTS_CACHE_MAX_BYTES = int(os.environ.get('TTS_CACHE_MAX_BYTES', 500 * 1024 * 1024))
+    # Cache-Control max-age (seconds) sent with synthesized audio
+    TTS_CACHE_MAX_AGE = int(os.environ.get('TTS_CACHE_MAX_AGE', 86400))
+
+    # Serving /uploads/... (resumes and screenshots). File names are UUIDs, so responses are cached as immutable.
+    UPLOADS_CACHE_MAX_AGE = int(os.environ.get('UPLOADS_CACHE_MAX_AGE', 365 * 24 * 3600))
+    # '' serves files from Flask; 'x-accel' hands them to nginx via X-Accel-Redirect, 'x-sendfile'
+    # to Apache/lighttpd via X-Sendfile. Flask still performs the login check in both modes.
+    UPLOADS_OFFLOAD = os.environ.get('UPLOADS_OFFLOAD', '')
+    # nginx 'internal' location aliased to UPLOAD_FOLDER, e.g.
+    #   location /_protected_uploads/ { internal; alias /srv/app/uploads/; }
+    UPLOADS_ACCEL_PREFIX = os.environ.get('UPLOADS_ACCEL_PREFIX', '/_protected_uploads/')
 
@@ -0,0 +1,23 @@
+# Gunicorn settings, picked up automatically by `gunicorn run:app` (see Procfile).
+import os
+import shutil
+import tempfile
+
+# Prometheus multiprocess mode: each worker writes its samples to files in this directory and
+# /metrics aggregates them. It must be in the environment before the app (and prometheus_client)
+# is imported by the workers, and is emptied on every start so stale samples are not reported.
+metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR',
+                                    os.path.join(tempfile.gettempdir(), 'ai_interview_metrics'))
+
+
+def on_starting(server):
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
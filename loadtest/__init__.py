@@ -0,0 +1,3 @@
+"""
+Offline load test for the candidate interview flow. See loadtest/run.py for usage.
+"""
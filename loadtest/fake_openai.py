@@ -0,0 +1,276 @@
+"""
+A local stand-in for the OpenAI API: chat completions (plain, streamed and
+response_format=json_object) and audio/speech. It lets the real get_llm()/get_openai_client()
+code paths, HTTP pooling included, be benchmarked without the network:
+
+    python -m loadtest.fake_openai --port 8100 --latency lognormal:-0.7,0.4 --tokens-per-sec 40 \\
+        --error-429 0.02 --error-500 0.01 --timeouts 0.005
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=fake gunicorn -w 4 run:app
+
+Interview replies are scripted and deterministic: the fake reads the question budget and the
+conversation so far from the prompt, asks the next numbered question, and closes with
+[INTERVIEW_COMPLETE] once the budget (or --questions) is used up. JSON-mode calls get a valid
+scorecard or resume profile depending on the system prompt.
+
+Latency specs: 'fixed:S', 'uniform:LO,HI', 'normal:MEAN,SD', 'lognormal:MU,SIGMA', 'exp:MEAN' (seconds).
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+from flask import Flask, Response, jsonify, request
+
+# Same marker as app.services.ai_services; not imported so the fake runs without the app's AI dependencies.
+COMPLETION_MARKER = "[INTERVIEW_COMPLETE]"
+
+SCRIPTED_QUESTIONS = [
+    "Walk me through the architecture of the most complex system you have worked on. Where were its bottlenecks?",
+    "How would you design an idempotent job queue on top of a relational database?",
+    "Tell me about a production incident you debugged. How did you find the root cause?",
+    "How do you decide between adding an index and denormalizing a table for a slow query?",
+    "What is your approach to testing code that calls external APIs?",
+    "How would you roll out a breaking schema change with zero downtime?",
+    "Describe how you would profile a Python web service whose p99 latency doubled overnight.",
+    "How do you keep a long-lived service's memory usage from growing without bound?",
+]
+
+ANALYSIS_REPLY = {
+    "scorecard": {
+        "technical_proficiency": {"score": 7, "justification": "Solid grasp of the systems discussed."},
+        "communication_skills": {"score": 8, "justification": "Clear, structured answers."},
+        "alignment_with_values": {"score": 7, "justification": "Showed ownership and collaboration."},
+    },
+    "overall_score": 72,
+    "overall_summary": "A capable engineer with good communication; recommended for the next round.",
+}
+
+RESUME_PROFILE_REPLY = {
+    "headline": "Backend engineer focused on Python services",
+    "years_experience": 6,
+    "skills": ["Python", "Flask", "MySQL", "Redis", "Docker", "AWS"],
+    "projects": [{"name": "Billing platform", "summary": "Owned the migration to an event-driven billing pipeline."}],
+    "education": "BSc Computer Science",
+}
+
+HISTORY_SUMMARY_REPLY = ("The interviewer has covered system architecture, job queues and incident debugging. "
+                         "The candidate gave concrete examples and showed solid backend experience.")
+
+
+def parse_latency(spec):
+    """Turns a latency spec such as 'lognormal:-0.7,0.4' into a function of a random.Random."""
+    kind, _, args = spec.partition(':')
+    values = [float(value) for value in args.split(',')] if args else []
+    samplers = {
+        'fixed': (1, lambda rng, s: s),
+        'uniform': (2, lambda rng, lo, hi: rng.uniform(lo, hi)),
+        'normal': (2, lambda rng, mean, sd: rng.gauss(mean, sd)),
+        'lognormal': (2, lambda rng, mu, sigma: rng.lognormvariate(mu, sigma)),
+        'exp': (1, lambda rng, mean: rng.expovariate(1.0 / mean) if mean > 0 else 0.0),
+    }
+    if kind not in samplers or len(values) != samplers[kind][0]:
+        raise argparse.ArgumentTypeError(f"Invalid latency spec: {spec!r}")
+    sampler = samplers[kind][1]
+    return lambda rng: max(0.0, sampler(rng, *values))
+
+
+class FakeSettings:
+    def __init__(self, latency='fixed:0.5', tts_latency='fixed:0.3', tokens_per_sec=50.0, tts_bytes_per_char=400,
+                 error_429=0.0, error_500=0.0, timeouts=0.0, timeout_seconds=600.0, questions=None, seed=0):
+        self.latency = parse_latency(latency)           # time to first token
+        self.tts_latency = parse_latency(tts_latency)
+        self.tokens_per_sec = tokens_per_sec            # 0 sends the whole reply at once
+        self.tts_bytes_per_char = tts_bytes_per_char    # ~48 kbps MP3 at normal speaking pace
+        self.error_429 = error_429                      # fractions of requests failed each way
+        self.error_500 = error_500
+        self.timeouts = timeouts
+        self.timeout_seconds = timeout_seconds          # how long a 'timeout' request hangs
+        self.questions = questions                      # overrides the budget read from the prompt
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+
+    def sample(self, sampler):
+        with self.rng_lock:
+            return sampler(self.rng)
+
+    def roll(self):
+        with self.rng_lock:
+            return self.rng.random()
+
+
+def _openai_error(status, message, error_type, headers=None):
+    response = jsonify({"error": {"message": message, "type": error_type, "param": None, "code": None}})
+    response.status_code = status
+    response.headers.update(headers or {})
+    return response
+
+
+def _injected_failure(settings):
+    """Returns an error response for this request, or None to serve it normally."""
+    roll = settings.roll()
+    if roll < settings.error_429:
+        return _openai_error(429, "Rate limit reached (injected).", "rate_limit_exceeded", {"Retry-After": "1"})
+    roll -= settings.error_429
+    if roll < settings.error_500:
+        return _openai_error(500, "The server had an error (injected).", "server_error")
+    roll -= settings.error_500
+    if roll < settings.timeouts:
+        time.sleep(settings.timeout_seconds)
+        return _openai_error(504, "Timed out (injected).", "timeout")
+    return None
+
+
+def _message_text(message):
+    content = message.get('content') or ''
+    if isinstance(content, list):
+        content = ''.join(part.get('text', '') for part in content if isinstance(part, dict))
+    return content
+
+
+def interview_reply(prompt, questions=None):
+    """Next scripted interviewer turn for the prompt built by build_interview_messages()."""
+    budget = questions
+    if budget is None:
+        match = re.search(r'Total Questions to Ask:\s*(\d+)', prompt)
+        budget = int(match.group(1)) if match else 5
+    history = prompt.split('Conversation History:', 1)[-1]
+    # Once older turns are folded into a summary the prompt carries the total count instead.
+    summarized = re.search(r'Questions asked so far:\s*(\d+)', history)
+    asked = int(summarized.group(1)) if summarized else len(re.findall(r'^ai:', history, re.MULTILINE))
+
+    if asked >= budget:
+        return ("Thank you, that was the last of my questions. The hiring team will review the interview "
+                f"and get back to you within a few days.\n{COMPLETION_MARKER}")
+    question = SCRIPTED_QUESTIONS[asked % len(SCRIPTED_QUESTIONS)]
+    if asked == 0:
+        return f"Hi, I'm Alex and I'll be running this screening interview. Let's begin. {question}"
+    return f"Thanks for that answer. Question {asked + 1} of {budget}: {question}"
+
+
+def chat_reply(messages, json_mode, questions=None):
+    system = ' '.join(_message_text(m) for m in messages if m.get('role') == 'system')
+    user = '\n'.join(_message_text(m) for m in messages if m.get('role') == 'user')
+    if json_mode:
+        if 'scorecard' in system:
+            return json.dumps(ANALYSIS_REPLY)
+        if 'resume' in system.lower():
+            return json.dumps(RESUME_PROFILE_REPLY)
+        return json.dumps({})
+    if 'running summary' in system:
+        return HISTORY_SUMMARY_REPLY
+    return interview_reply(user, questions)
+
+
+def _tokens(text):
+    """Splits text into word-sized pieces that rejoin to the original."""
+    return re.findall(r'\S+\s*|\s+', text)
+
+
+def _usage(messages, completion):
+    prompt_tokens = sum(len(_message_text(m)) for m in messages) // 4
+    completion_tokens = max(1, len(completion) // 4)
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+def create_fake_openai_app(settings):
+    app = Flask(__name__)
+
+    @app.route('/v1/chat/completions', methods=['POST'])
+    def chat_completions():
+        failure = _injected_failure(settings)
+        if failure is not None:
+            return failure
+        body = request.get_json(force=True)
+        messages = body.get('messages') or []
+        model = body.get('model', 'fake-model')
+        json_mode = (body.get('response_format') or {}).get('type') == 'json_object'
+        reply = chat_reply(messages, json_mode, settings.questions)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        delay = 1.0 / settings.tokens_per_sec if settings.tokens_per_sec > 0 else 0.0
+        time.sleep(settings.sample(settings.latency))
+
+        if not body.get('stream'):
+            time.sleep(delay * len(_tokens(reply)))
+            return jsonify({
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply},
+                             "finish_reason": "stop"}],
+                "usage": _usage(messages, reply),
+            })
+
+        include_usage = (body.get('stream_options') or {}).get('include_usage')
+
+        def chunk(delta, finish_reason=None):
+            return "data: " + json.dumps({
+                "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }) + "\n\n"
+
+        def generate():
+            yield chunk({"role": "assistant", "content": ""})
+            for token in _tokens(reply):
+                if delay:
+                    time.sleep(delay)
+                yield chunk({"content": token})
+            yield chunk({}, "stop")
+            if include_usage:
+                yield "data: " + json.dumps({
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [], "usage": _usage(messages, reply),
+                }) + "\n\n"
+            yield "data: [DONE]\n\n"
+
+        return Response(generate(), mimetype='text/event-stream')
+
+    @app.route('/v1/audio/speech', methods=['POST'])
+    def audio_speech():
+        failure = _injected_failure(settings)
+        if failure is not None:
+            return failure
+        body = request.get_json(force=True)
+        text = body.get('input') or ''
+        time.sleep(settings.sample(settings.tts_latency))
+        size = max(417, len(text) * settings.tts_bytes_per_char)
+        # MPEG-1 layer III frame header followed by padding; sized like real speech, not playable.
+        audio = (b'\xff\xfb\x90\x64' + b'\x00' * 413) * (size // 417)
+        return Response(audio, mimetype='audio/mpeg')
+
+    @app.route('/v1/models', methods=['GET'])
+    def models():
+        return jsonify({"object": "list", "data": [{"id": "fake-model", "object": "model", "owned_by": "loadtest"}]})
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local fake of the OpenAI chat and speech APIs.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--latency', default='fixed:0.5', help='Chat time-to-first-token distribution.')
+    parser.add_argument('--tts-latency', default='fixed:0.3', help='Speech synthesis latency distribution.')
+    parser.add_argument('--tokens-per-sec', type=float, default=50.0)
+    parser.add_argument('--tts-bytes-per-char', type=int, default=400)
+    parser.add_argument('--error-429', type=float, default=0.0, help='Fraction of requests answered with 429.')
+    parser.add_argument('--error-500', type=float, default=0.0, help='Fraction of requests answered with 500.')
+    parser.add_argument('--timeouts', type=float, default=0.0, help='Fraction of requests that hang.')
+    parser.add_argument('--timeout-seconds', type=float, default=600.0)
+    parser.add_argument('--questions', type=int, help='Questions before [INTERVIEW_COMPLETE] (default: from prompt).')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for latency sampling and error injection.')
+    args = parser.parse_args(argv)
+    for spec in (args.latency, args.tts_latency):
+        parse_latency(spec)
+
+    settings = FakeSettings(latency=args.latency, tts_latency=args.tts_latency, tokens_per_sec=args.tokens_per_sec,
+                            tts_bytes_per_char=args.tts_bytes_per_char, error_429=args.error_429,
+                            error_500=args.error_500, timeouts=args.timeouts, timeout_seconds=args.timeout_seconds,
+                            questions=args.questions, seed=args.seed)
+    create_fake_openai_app(settings).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
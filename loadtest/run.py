@@ -0,0 +1,321 @@
+"""
+Drives the candidate interview flow with concurrent simulated candidates and reports latency
+percentiles per endpoint, throughput and error rate. Runs offline: LLM and TTS calls are stubbed
+(loadtest/stubs.py) and only the configured MySQL database is needed.
+
+In-process, through Flask's test client (one client per thread):
+
+    python -m loadtest.run --candidates 50 --concurrency 10 --questions 5
+
+Against a running server (start it with loadtest/serve.py so its LLM/TTS are stubbed too):
+
+    python -m loadtest.run --base-url http://127.0.0.1:8000 --candidates 200 --concurrency 40
+
+To include the real OpenAI client code (HTTP pool, SSE parsing) in the measurement, run
+loadtest/fake_openai.py, set OPENAI_BASE_URL to it and pass --no-stubs (or serve run:app).
+
+Each candidate opens their invitation, submits details with a real PDF from the resume folder,
+starts the interview, then for every question uploads a webcam frame, answers and has the question
+spoken (stopping early if the interviewer closes the interview), and finally calls /end.
+--client legacy uses the pre-streaming endpoints instead.
+Seeded rows are deleted afterwards unless --keep-data is given. Post-interview analysis jobs are
+left queued for the worker and are not part of the measurement.
+"""
+import argparse
+import base64
+import io
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from loadtest.seed import seed_interviews, cleanup_company
+from loadtest.stubs import StubSettings, install_stubs
+
+CANDIDATE_ANSWER = ("In my last role I owned the billing service. We shipped a risky migration behind a flag, "
+                    "measured error rates per cohort and rolled forward once the numbers were stable.")
+
+
+class FlaskTestClient:
+    """Issues requests in-process; a Flask test client is not shared between threads."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, json_body=None, body=None, content_type=None, form=None, files=None):
+        kwargs = {}
+        if json_body is not None:
+            kwargs['json'] = json_body
+        elif files is not None:
+            data = dict(form or {})
+            for field, (filename, content, _mime) in files.items():
+                data[field] = (io.BytesIO(content), filename)
+            kwargs.update(data=data, content_type='multipart/form-data')
+        elif body is not None:
+            kwargs.update(data=body, content_type=content_type)
+        response = self.client.open(path, method=method, **kwargs)
+        return response.status_code, response.get_data()
+
+
+class HttpClient:
+    """Issues requests to a running server at base_url over a keep-alive connection."""
+
+    def __init__(self, base_url, timeout):
+        import httpx
+        self.client = httpx.Client(base_url=base_url.rstrip('/'), timeout=timeout)
+
+    def request(self, method, path, json_body=None, body=None, content_type=None, form=None, files=None):
+        kwargs = {}
+        if json_body is not None:
+            kwargs['json'] = json_body
+        elif files is not None:
+            kwargs.update(data=form or {}, files=files)
+        elif body is not None:
+            kwargs.update(content=body, headers={'Content-Type': content_type})
+        response = self.client.request(method, path, **kwargs)
+        return response.status_code, response.content
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.flows_completed = 0
+        self.flows_failed = 0
+
+    def record(self, name, seconds, ok):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(seconds)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def flow_finished(self, ok):
+        with self.lock:
+            if ok:
+                self.flows_completed += 1
+            else:
+                self.flows_failed += 1
+
+
+class FlowError(Exception):
+    pass
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _make_frames(count=4):
+    """A few distinct 640x480 JPEG webcam frames (noise compresses about like a real camera image)."""
+    from PIL import Image
+    frames = []
+    for _ in range(count):
+        image = Image.effect_noise((640, 480), random.randint(20, 60)).convert('RGB')
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=70)
+        frames.append(buffer.getvalue())
+    return frames
+
+
+def _load_resumes(folder):
+    paths = sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.lower().endswith('.pdf'))
+    if not paths:
+        raise SystemExit(f"No PDF resumes found in {folder}")
+    resumes = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            resumes.append((os.path.basename(path), f.read()))
+    return resumes
+
+
+class CandidateFlow:
+    def __init__(self, client, recorder, questions, client_style, resumes, frames):
+        self.client = client
+        self.recorder = recorder
+        self.questions = questions
+        self.client_style = client_style
+        self.resumes = resumes
+        self.frames = frames
+
+    def call(self, name, method, path, **kwargs):
+        started = time.perf_counter()
+        try:
+            status, body = self.client.request(method, path, **kwargs)
+        except Exception as e:
+            self.recorder.record(name, time.perf_counter() - started, ok=False)
+            raise FlowError(f"{name}: {e}") from e
+        # Streamed endpoints report failures inside a 200 response.
+        ok = status < 400 and b'event: error' not in body
+        self.recorder.record(name, time.perf_counter() - started, ok)
+        if not ok:
+            raise FlowError(f"{name}: HTTP {status}")
+        return body
+
+    def _ai_turn(self, name, path, payload=None):
+        body = self.call(name, 'POST', path, json_body=payload if payload is not None else {})
+        if self.client_style == 'legacy':
+            data = json.loads(body)
+            return data['question']['text'], data.get('interview_status')
+        for event in body.decode('utf-8').split('\n\n'):
+            if event.startswith('event: done'):
+                data = json.loads(event.split('data: ', 1)[1])
+                return data['question']['text'], data.get('interview_status')
+        raise FlowError(f"{name}: stream ended without a 'done' event")
+
+    def _speak(self, interview_id, text):
+        if self.client_style == 'legacy':
+            self.call('text-to-speech', 'POST', '/api/interview/text-to-speech', json_body={'text': text})
+        else:
+            self.call('text-to-speech/stream', 'POST', '/api/interview/text-to-speech/stream',
+                      json_body={'text': text, 'interview_id': interview_id})
+
+    def _screenshot(self, interview_id, frame):
+        if self.client_style == 'legacy':
+            data_url = 'data:image/jpeg;base64,' + base64.b64encode(frame).decode('ascii')
+            self.call('screenshot', 'POST', f'/api/interview/{interview_id}/screenshot', json_body={'image': data_url})
+        else:
+            self.call('screenshot/upload', 'POST', f'/api/interview/{interview_id}/screenshot/upload',
+                      body=frame, content_type='image/jpeg')
+
+    def run(self, invitation_link, index):
+        try:
+            body = self.call('initiate', 'GET', f'/api/interview/initiate/{invitation_link}')
+            interview_id = json.loads(body)['interview_id']
+
+            filename, pdf = self.resumes[index % len(self.resumes)]
+            self.call('submit-details', 'POST', f'/api/interview/{interview_id}/submit-details',
+                      form={'candidateName': f'Load Candidate {index}',
+                            'candidateEmail': f'candidate{index}@example.invalid'},
+                      files={'resumeFile': (filename, pdf, 'application/pdf')})
+
+            suffix = '' if self.client_style == 'legacy' else '/stream'
+            question, status = self._ai_turn(f'start{suffix}', f'/api/interview/{interview_id}/start{suffix}')
+            self._speak(interview_id, question)
+            for turn in range(self.questions):
+                if status == 'Completed':
+                    break
+                self._screenshot(interview_id, self.frames[(index + turn) % len(self.frames)])
+                question, status = self._ai_turn(f'next-question{suffix}',
+                                                 f'/api/interview/{interview_id}/next-question{suffix}',
+                                                 {'response_text': CANDIDATE_ANSWER})
+                self._speak(interview_id, question)
+
+            self.call('end', 'POST', f'/api/interview/{interview_id}/end')
+            self.recorder.flow_finished(True)
+        except (FlowError, KeyError, ValueError) as e:
+            self.recorder.flow_finished(False)
+            print(f"candidate {index} aborted: {e}", file=sys.stderr)
+
+
+def build_report(recorder, elapsed, args):
+    endpoints = {}
+    total_requests = total_errors = 0
+    for name in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[name])
+        errors = recorder.errors.get(name, 0)
+        total_requests += len(values)
+        total_errors += errors
+        endpoints[name] = {
+            "count": len(values), "errors": errors,
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p95_ms": round(percentile(values, 95) * 1000, 1),
+            "p99_ms": round(percentile(values, 99) * 1000, 1),
+            "max_ms": round(values[-1] * 1000, 1),
+        }
+    return {
+        "target": args.base_url or "in-process",
+        "client": args.client, "candidates": args.candidates, "concurrency": args.concurrency,
+        "questions": args.questions, "elapsed_s": round(elapsed, 2),
+        "requests": total_requests, "errors": total_errors,
+        "error_rate": round(total_errors / total_requests, 4) if total_requests else 0.0,
+        "throughput_rps": round(total_requests / elapsed, 2) if elapsed else 0.0,
+        "flows_completed": recorder.flows_completed, "flows_failed": recorder.flows_failed,
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report):
+    print(f"\n{report['target']} | client={report['client']} candidates={report['candidates']} "
+          f"concurrency={report['concurrency']} questions={report['questions']}")
+    print(f"{'endpoint':<28}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, row in report['endpoints'].items():
+        print(f"{name:<28}{row['count']:>7}{row['errors']:>8}{row['p50_ms']:>10}{row['p95_ms']:>10}"
+              f"{row['p99_ms']:>10}{row['max_ms']:>10}")
+    print(f"\n{report['requests']} requests in {report['elapsed_s']}s: {report['throughput_rps']} req/s, "
+          f"error rate {report['error_rate']:.2%}, "
+          f"{report['flows_completed']} flows completed, {report['flows_failed']} aborted")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidates', type=int, default=20, help='Simulated candidates (one interview each).')
+    parser.add_argument('--concurrency', type=int, default=5, help='Candidates in flight at once.')
+    parser.add_argument('--questions', type=int, default=5, help='Answered questions per interview.')
+    parser.add_argument('--client', choices=('current', 'legacy'), default='current',
+                        help="'current' uses the streaming/binary endpoints of the served candidate page.")
+    parser.add_argument('--base-url', help='Target a running server instead of an in-process app.')
+    parser.add_argument('--timeout', type=float, default=120.0, help='Per-request timeout with --base-url.')
+    parser.add_argument('--resume-dir', help='Folder of PDF resumes to upload (default: RESUME_FOLDER).')
+    parser.add_argument('--ramp-up', type=float, default=0.0, help='Seconds over which candidates start.')
+    parser.add_argument('--keep-data', action='store_true', help='Keep the seeded company and interviews.')
+    parser.add_argument('--json-out', help='Also write the report as JSON, for comparing runs.')
+    parser.add_argument('--no-stubs', action='store_true',
+                        help="Keep the app's real OpenAI clients (point OPENAI_BASE_URL at loadtest.fake_openai).")
+    stubs = parser.add_argument_group('stubs (in-process only; use LOADTEST_* env vars for loadtest.serve)')
+    stubs.add_argument('--llm-latency', type=float, default=StubSettings().llm_latency)
+    stubs.add_argument('--tokens-per-sec', type=float, default=StubSettings().tokens_per_sec)
+    stubs.add_argument('--tts-latency', type=float, default=StubSettings().tts_latency)
+    stubs.add_argument('--tts-bytes', type=int, default=StubSettings().tts_bytes)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = create_app()
+    if not args.base_url and not args.no_stubs:
+        install_stubs(app, StubSettings(llm_latency=args.llm_latency, tokens_per_sec=args.tokens_per_sec,
+                                        tts_latency=args.tts_latency, tts_bytes=args.tts_bytes))
+
+    resumes = _load_resumes(args.resume_dir or app.config['RESUME_FOLDER'])
+    frames = _make_frames()
+    company_id, links = seed_interviews(app, args.candidates, questions=args.questions)
+    recorder = Recorder()
+    local = threading.local()
+
+    def run_candidate(index):
+        if args.ramp_up:
+            time.sleep(args.ramp_up * index / max(1, args.candidates))
+        if not hasattr(local, 'client'):
+            local.client = HttpClient(args.base_url, args.timeout) if args.base_url else FlaskTestClient(app)
+        CandidateFlow(local.client, recorder, args.questions, args.client, resumes, frames).run(links[index], index)
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix='candidate') as executor:
+            list(executor.map(run_candidate, range(args.candidates)))
+        elapsed = time.perf_counter() - started
+    finally:
+        if not args.keep_data:
+            cleanup_company(app, company_id)
+
+    report = build_report(recorder, elapsed, args)
+    print_report(report)
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Creates a throwaway company, admin, job and invited interviews for a load-test run, and removes
+them again afterwards. Rows are written straight to the configured database.
+"""
+import datetime
+import uuid
+
+from app.services.db_services import get_db_connection, generate_id
+from app.services.dashboard_counters import record_interviews_created, record_job_created
+
+LOADTEST_COMPANY_PREFIX = 'Load test'
+
+
+def seed_interviews(app, count, questions=5):
+    """Returns (company_id, [invitation_link, ...]) for count freshly invited interviews."""
+    with app.app_context():
+        conn = get_db_connection()
+        if not conn: raise RuntimeError("Database connection failed")
+        cursor = conn.cursor()
+        try:
+            now_utc = datetime.datetime.utcnow()
+            company_id = generate_id("comp_")
+            admin_id = generate_id("admin_")
+            job_id = generate_id("job_")
+            cursor.execute("INSERT INTO companies (id, name) VALUES (%s, %s)",
+                           (company_id, f"{LOADTEST_COMPANY_PREFIX} {now_utc:%Y-%m-%d %H:%M:%S}"))
+            cursor.execute(
+                "INSERT INTO admins (id, company_id, name, email, password_hash) VALUES (%s, %s, %s, %s, %s)",
+                (admin_id, company_id, 'Load Test', f"loadtest-{admin_id}@example.invalid", '!'))
+            cursor.execute(
+                "INSERT INTO jobs (id, title, department, description, status, created_at, created_by, company_id, "
+                "number_of_questions, must_ask_topics) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)",
+                (job_id, 'Backend Engineer', 'Engineering',
+                 'Builds and operates Python web services backed by MySQL.', 'Open', now_utc, admin_id,
+                 company_id, questions, 'system design, testing'))
+            record_job_created(cursor, company_id, 'Open')
+
+            links = [str(uuid.uuid4()) for _ in range(count)]
+            cursor.executemany(
+                "INSERT INTO interviews (id, job_id, company_id, invitation_link, status, created_at) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                [(generate_id("int_"), job_id, company_id, link, 'Invited', now_utc) for link in links])
+            record_interviews_created(cursor, company_id, 'Invited', len(links))
+            conn.commit()
+            return company_id, links
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+def cleanup_company(app, company_id):
+    """Deletes everything seed_interviews() created for company_id, including the candidates the run added."""
+    with app.app_context():
+        conn = get_db_connection()
+        if not conn: raise RuntimeError("Database connection failed")
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT candidate_id FROM interviews WHERE company_id = %s AND candidate_id IS NOT NULL",
+                           (company_id,))
+            candidate_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute("DELETE FROM interviews WHERE company_id = %s", (company_id,))
+            if candidate_ids:
+                cursor.executemany("DELETE FROM candidates WHERE id = %s", [(cid,) for cid in candidate_ids])
+            cursor.execute("DELETE FROM jobs WHERE company_id = %s", (company_id,))
+            cursor.execute("DELETE FROM admins WHERE company_id = %s", (company_id,))
+            cursor.execute("DELETE FROM company_status_counts WHERE company_id = %s", (company_id,))
+            for table in ('llm_usage_events', 'llm_usage_daily', 'llm_usage_interviews'):
+                cursor.execute(f"DELETE FROM {table} WHERE company_id = %s", (company_id,))
+            cursor.execute("DELETE FROM companies WHERE id = %s", (company_id,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
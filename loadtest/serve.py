@@ -0,0 +1,15 @@
+"""
+The application with LLM/TTS stubbed out, for load tests that go through a real WSGI server:
+
+    LOADTEST_LLM_LATENCY=0.8 gunicorn -w 4 --threads 8 -b 127.0.0.1:8000 loadtest.serve:app
+    python -m loadtest.run --base-url http://127.0.0.1:8000 --candidates 100 --concurrency 20
+
+Stub timings come from the LOADTEST_* environment variables (see StubSettings.from_env).
+"""
+from app import create_app
+from loadtest.stubs import StubSettings, install_stubs
+
+app = install_stubs(create_app(), StubSettings.from_env())
+
+if __name__ == '__main__':
+    app.run(port=5001, threaded=True)
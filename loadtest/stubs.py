@@ -0,0 +1,132 @@
+"""
+Stand-ins for the OpenAI chat and TTS clients, so the candidate flow can be driven without network
+access or API spend. Latencies are simulated with sleeps, which release the GIL the way real
+network waits do, so worker/thread configurations compare fairly.
+"""
+import os
+import threading
+import time
+import uuid
+
+# An MP3 frame header plus padding; the load test only needs audio-sized bytes, not playable audio.
+_FAKE_MP3_FRAME = b'\xff\xfb\x90\x64' + b'\x00' * 40
+
+
+class StubSettings:
+    def __init__(self, llm_latency=0.5, tokens_per_sec=50.0, tts_latency=0.3, tts_bytes=24000):
+        self.llm_latency = llm_latency          # seconds before the first token
+        self.tokens_per_sec = tokens_per_sec    # streaming rate; 0 returns the whole reply at once
+        self.tts_latency = tts_latency          # seconds per speech synthesis call
+        self.tts_bytes = tts_bytes              # size of each synthesized clip
+
+    @classmethod
+    def from_env(cls):
+        """Reads LOADTEST_* environment variables (used when the stubbed app runs under gunicorn)."""
+        defaults = cls()
+        return cls(llm_latency=float(os.environ.get('LOADTEST_LLM_LATENCY', defaults.llm_latency)),
+                   tokens_per_sec=float(os.environ.get('LOADTEST_TOKENS_PER_SEC', defaults.tokens_per_sec)),
+                   tts_latency=float(os.environ.get('LOADTEST_TTS_LATENCY', defaults.tts_latency)),
+                   tts_bytes=int(os.environ.get('LOADTEST_TTS_BYTES', defaults.tts_bytes)))
+
+
+class _Message:
+    def __init__(self, content):
+        self.content = content
+
+
+class StubChatModel:
+    """
+    Implements the two ChatOpenAI methods the routes use: invoke() and stream(). Interview replies
+    are always another question; the load test ends each interview through /end.
+    """
+
+    def __init__(self, settings, json_mode=False):
+        self.settings = settings
+        self.json_mode = json_mode
+
+    def _reply(self, messages):
+        if self.json_mode:
+            return '{"summary": "Load test analysis.", "score": 70, "strengths": [], "weaknesses": []}'
+        # A unique tag keeps TTS requests for these questions from all hitting the audio cache.
+        return ("Tell me about a project where you had to balance delivery speed against quality, "
+                f"and what you would do differently next time? (ref {uuid.uuid4().hex[:8]})")
+
+    def invoke(self, messages):
+        reply = self._reply(messages)
+        time.sleep(self.settings.llm_latency)
+        if self.settings.tokens_per_sec > 0:
+            time.sleep(len(reply.split()) / self.settings.tokens_per_sec)
+        return _Message(reply)
+
+    def stream(self, messages):
+        reply = self._reply(messages)
+        time.sleep(self.settings.llm_latency)
+        delay = 1.0 / self.settings.tokens_per_sec if self.settings.tokens_per_sec > 0 else 0
+        for word in reply.split(' '):
+            if delay:
+                time.sleep(delay)
+            yield _Message(word + ' ')
+
+
+class _SpeechResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def iter_bytes(self, chunk_size=4096):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+
+class _Speech:
+    def __init__(self, settings):
+        self.settings = settings
+
+    def create(self, model, voice, input, response_format='mp3'):
+        time.sleep(self.settings.tts_latency)
+        repeats = max(1, self.settings.tts_bytes // len(_FAKE_MP3_FRAME))
+        return _SpeechResponse(_FAKE_MP3_FRAME * repeats)
+
+
+class _Audio:
+    def __init__(self, settings):
+        self.speech = _Speech(settings)
+
+
+class StubOpenAIClient:
+    """Implements client.audio.speech.create(...) as used by the TTS routes."""
+
+    def __init__(self, settings):
+        self.audio = _Audio(settings)
+
+
+_installed = threading.Lock()
+
+
+def install_stubs(app, settings):
+    """
+    Points every LLM/TTS call site at the stubs and suppresses outgoing mail. The routes import
+    get_llm/get_openai_client by name, so both modules are patched.
+    """
+    from app.services import ai_services
+    from app.routes import interview_routes
+
+    openai_client = StubOpenAIClient(settings)
+    models = {}
+
+    def get_llm(temperature=0.7, json_mode=False):
+        with _installed:
+            if json_mode not in models:
+                models[json_mode] = StubChatModel(settings, json_mode=json_mode)
+            return models[json_mode]
+
+    def get_openai_client():
+        return openai_client
+
+    for module in (ai_services, interview_routes):
+        module.get_llm = get_llm
+        module.get_openai_client = get_openai_client
+
+    # Flask-Mail reads this per send; invitations are not part of the candidate flow, but the
+    # worker may share this app.
+    app.config['MAIL_SUPPRESS_SEND'] = True
+    return app
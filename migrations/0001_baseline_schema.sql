@@ -0,0 +1,137 @@
+-- Baseline: the schema as mysql_tables.sql left it, with every ad hoc ALTER folded into its
+-- CREATE TABLE and the admin table named `admins` (what the code queries) instead of `admin_users`.
+-- Databases built by hand from mysql_tables.sql should be stamped at this version rather than
+-- upgraded through it: `flask db-stamp 1`, then `flask db-upgrade`.
+
+CREATE TABLE IF NOT EXISTS companies (
+    id VARCHAR(255) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS admins (
+    id VARCHAR(255) PRIMARY KEY,
+    company_id VARCHAR(255),
+    name VARCHAR(255),
+    email VARCHAR(255) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE SET NULL ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id VARCHAR(255) PRIMARY KEY,
+    company_id VARCHAR(255),
+    title VARCHAR(255) NOT NULL,
+    department VARCHAR(255),
+    description TEXT,
+    status VARCHAR(50) DEFAULT 'Open', -- e.g., Open, Closed, Draft
+    applications_count INT DEFAULT 0,
+    number_of_questions INT DEFAULT 5,
+    must_ask_topics TEXT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    created_by VARCHAR(255), -- admins.id
+    FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE SET NULL ON UPDATE CASCADE,
+    FOREIGN KEY (created_by) REFERENCES admins(id) ON DELETE SET NULL ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    id VARCHAR(255) PRIMARY KEY,
+    name VARCHAR(255),
+    email VARCHAR(255) UNIQUE,
+    resume_text TEXT,
+    resume_summary TEXT NULL, -- condensed once by the resume_condensation job
+    resume_summary_version VARCHAR(20) NULL,
+    resume_filename VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FULLTEXT INDEX ft_candidates_name_email (name, email)
+);
+
+CREATE TABLE IF NOT EXISTS interviews (
+    id VARCHAR(255) PRIMARY KEY,
+    job_id VARCHAR(255) NOT NULL,
+    candidate_id VARCHAR(255),
+    company_id VARCHAR(255),
+    interview_date TIMESTAMP NULL,
+    status VARCHAR(50) DEFAULT 'Invited', -- Invited, Resume Submitted, In Progress, Completed, Pending Review, Reviewed, Analysis Failed
+    score INT,
+    detailed_scorecard_json JSON NULL COMMENT 'Stores detailed scores for different categories',
+    ai_summary TEXT,
+    admin_feedback TEXT,
+    transcript_json JSON, -- legacy; turns now live in interview_turns
+    ai_questions_json JSON,
+    screenshot_paths_json JSON, -- legacy; captures now live in interview_screenshots
+    history_summary TEXT NULL,
+    history_summary_upto_seq INT NOT NULL DEFAULT 0,
+    invitation_link VARCHAR(255) UNIQUE,
+    invite_email VARCHAR(255) NULL,
+    invite_batch_id VARCHAR(36) NULL,
+    invite_status VARCHAR(20) NULL, -- pending, sent, failed
+    invite_error TEXT NULL,
+    invite_sent_at TIMESTAMP NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_interviews_invite_batch (invite_batch_id, invite_status),
+    INDEX idx_interviews_job_score (company_id, job_id, score, id),
+    INDEX idx_interviews_job_date (company_id, job_id, interview_date, id),
+    INDEX idx_interviews_job_status (company_id, job_id, status, id),
+    INDEX idx_interviews_company_score (company_id, score, id),
+    FULLTEXT INDEX ft_interviews_ai_summary (ai_summary),
+    FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE,
+    FOREIGN KEY (candidate_id) REFERENCES candidates(id) ON DELETE SET NULL ON UPDATE CASCADE,
+    FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE SET NULL ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS background_jobs (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    job_type VARCHAR(50) NOT NULL,
+    interview_id VARCHAR(255) NULL,
+    payload_json JSON NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued', -- queued, running, succeeded, failed
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 3,
+    last_error TEXT NULL,
+    run_after DATETIME NOT NULL,
+    locked_by VARCHAR(255) NULL,
+    locked_at DATETIME NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    INDEX idx_background_jobs_claim (status, run_after),
+    INDEX idx_background_jobs_interview (interview_id, job_type),
+    FOREIGN KEY (interview_id) REFERENCES interviews(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS interview_turns (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    interview_id VARCHAR(255) NOT NULL,
+    seq INT NOT NULL,
+    actor VARCHAR(20) NOT NULL, -- 'ai' or 'candidate'
+    text TEXT NOT NULL,
+    created_at DATETIME(6) NOT NULL,
+    UNIQUE KEY uq_interview_turns_seq (interview_id, seq),
+    FULLTEXT INDEX ft_interview_turns_text (text),
+    FOREIGN KEY (interview_id) REFERENCES interviews(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS interview_screenshots (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    interview_id VARCHAR(255) NOT NULL,
+    file_path VARCHAR(512) NOT NULL,
+    thumbnail_path VARCHAR(512) NULL,
+    byte_size INT NOT NULL,
+    phash BIGINT UNSIGNED NULL,
+    is_duplicate BOOLEAN NOT NULL DEFAULT FALSE,
+    captured_at DATETIME(6) NOT NULL,
+    INDEX idx_interview_screenshots_interview (interview_id, id),
+    INDEX idx_screenshots_kept (interview_id, is_duplicate, id),
+    FOREIGN KEY (interview_id) REFERENCES interviews(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS company_status_counts (
+    company_id VARCHAR(255) NOT NULL,
+    entity VARCHAR(20) NOT NULL, -- 'job' or 'interview'
+    status VARCHAR(50) NOT NULL,
+    count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_id, entity, status)
+);
@@ -0,0 +1,14 @@
+-- Indexes for the remaining hot queries; `flask db-check-indexes` EXPLAINs each of them.
+
+-- Job list on the dashboard: WHERE company_id = ? ORDER BY created_at DESC
+ALTER TABLE jobs ADD INDEX idx_jobs_company_created (company_id, created_at);
+
+-- Counter rebuilds and status filters: GROUP BY company_id, status / WHERE company_id = ? AND status = ?
+ALTER TABLE jobs ADD INDEX idx_jobs_company_status (company_id, status);
+ALTER TABLE interviews ADD INDEX idx_interviews_company_status (company_id, status);
+
+-- Per-job status breakdown taken before a job (and its interviews) is deleted
+ALTER TABLE interviews ADD INDEX idx_interviews_job_status_only (job_id, status);
+
+-- Stale-lock recovery in the job queue: WHERE status = 'running' AND locked_at < ?
+ALTER TABLE background_jobs ADD INDEX idx_background_jobs_locked (status, locked_at);
@@ -0,0 +1,54 @@
+-- Per-call LLM/TTS usage, tagged with the tenant, job and interview it was spent on.
+-- No foreign keys: usage must outlive deleted interviews and jobs for cost reporting.
+CREATE TABLE IF NOT EXISTS llm_usage_events (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    company_id VARCHAR(255) NULL,
+    job_id VARCHAR(255) NULL,
+    interview_id VARCHAR(255) NULL,
+    call_type VARCHAR(50) NOT NULL, -- interview_turn, analysis, resume_condensation, history_summary, tts
+    model VARCHAR(100) NULL,
+    prompt_tokens INT NOT NULL DEFAULT 0,
+    completion_tokens INT NOT NULL DEFAULT 0,
+    tts_characters INT NOT NULL DEFAULT 0,
+    latency_ms INT NOT NULL,
+    success BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at DATETIME NOT NULL,
+    INDEX idx_llm_usage_events_interview (interview_id, created_at),
+    INDEX idx_llm_usage_events_company (company_id, created_at)
+);
+
+-- Daily rollup per tenant, job and call type, upserted with every event; the usage API reads
+-- only this table and llm_usage_interviews. job_id/company_id are '' when a call had no interview.
+CREATE TABLE IF NOT EXISTS llm_usage_daily (
+    company_id VARCHAR(255) NOT NULL,
+    usage_date DATE NOT NULL,
+    job_id VARCHAR(255) NOT NULL,
+    call_type VARCHAR(50) NOT NULL,
+    calls INT NOT NULL DEFAULT 0,
+    errors INT NOT NULL DEFAULT 0,
+    prompt_tokens BIGINT NOT NULL DEFAULT 0,
+    completion_tokens BIGINT NOT NULL DEFAULT 0,
+    tts_characters BIGINT NOT NULL DEFAULT 0,
+    latency_ms_total BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_id, usage_date, job_id, call_type),
+    INDEX idx_llm_usage_daily_job (company_id, job_id, usage_date)
+);
+
+-- Running totals per interview and call type.
+CREATE TABLE IF NOT EXISTS llm_usage_interviews (
+    interview_id VARCHAR(255) NOT NULL,
+    call_type VARCHAR(50) NOT NULL,
+    company_id VARCHAR(255) NOT NULL,
+    job_id VARCHAR(255) NOT NULL,
+    calls INT NOT NULL DEFAULT 0,
+    errors INT NOT NULL DEFAULT 0,
+    prompt_tokens BIGINT NOT NULL DEFAULT 0,
+    completion_tokens BIGINT NOT NULL DEFAULT 0,
+    tts_characters BIGINT NOT NULL DEFAULT 0,
+    latency_ms_total BIGINT NOT NULL DEFAULT 0,
+    first_used_at DATETIME NOT NULL,
+    last_used_at DATETIME NOT NULL,
+    PRIMARY KEY (interview_id, call_type),
+    INDEX idx_llm_usage_interviews_company (company_id, last_used_at),
+    INDEX idx_llm_usage_interviews_job (company_id, job_id, last_used_at)
+);
@@ -0,0 +1,13 @@
+-- Seeds company_status_counts for every existing company from jobs and interviews.
+-- Counters are maintained by deltas, so a company whose first status change happened before its
+-- first dashboard load would otherwise keep partial (or negative) rows. Same statements as
+-- `flask rebuild-dashboard-counters`; runs in one transaction with the schema_version insert.
+DELETE FROM company_status_counts WHERE company_id IS NOT NULL;
+
+INSERT INTO company_status_counts (company_id, entity, status, count)
+SELECT company_id, 'job', COALESCE(status, ''), COUNT(*) FROM jobs
+WHERE company_id IS NOT NULL GROUP BY company_id, status;
+
+INSERT INTO company_status_counts (company_id, entity, status, count)
+SELECT company_id, 'interview', COALESCE(status, ''), COUNT(*) FROM interviews
+WHERE company_id IS NOT NULL GROUP BY company_id, status;
@@ -0,0 +1,5 @@
+-- Token counts are the provider's billed usage unless the response carried none, in which case
+-- they are a tiktoken estimate. Estimated events are flagged, and the rollups count them.
+ALTER TABLE llm_usage_events ADD COLUMN estimated BOOLEAN NOT NULL DEFAULT FALSE AFTER tts_characters;
+ALTER TABLE llm_usage_daily ADD COLUMN estimated_calls INT NOT NULL DEFAULT 0 AFTER latency_ms_total;
+ALTER TABLE llm_usage_interviews ADD COLUMN estimated_calls INT NOT NULL DEFAULT 0 AFTER latency_ms_total;
@@ -0,0 +1,3 @@
+-- /uploads/... authorizes each file against the company that owns it, looked up by stored path.
+ALTER TABLE candidates ADD INDEX idx_candidates_resume_filename (resume_filename);
+ALTER TABLE interview_screenshots ADD INDEX idx_interview_screenshots_file_path (file_path);
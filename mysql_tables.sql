@@ -1,3 +1,7 @@
+-- Superseded by the versioned migrations in migrations/ (apply with `flask db-upgrade`).
+-- A database already built from this file should be stamped at the baseline with
+-- `flask db-stamp 1` and then upgraded. Kept for reference only; new schema changes go in migrations/.
+
 CREATE DATABASE IF NOT EXISTS ai_interview_portal_db;
 USE ai_interview_portal_db;
 
@@ -90,3 +94,105 @@ ADD COLUMN must_ask_topics TEXT NULL;
 ALTER TABLE interviews
 ADD COLUMN detailed_scorecard_json JSON NULL COMMENT 'Stores detailed scores for different categories' AFTER score;
 
+
+-- Durable queue for work that should not run inside an HTTP request (e.g. post-interview analysis).
+-- Consumed by worker.py; see app/services/job_queue.py.
+CREATE TABLE IF NOT EXISTS background_jobs (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    job_type VARCHAR(50) NOT NULL,
+    interview_id VARCHAR(255) NULL,
+    payload_json JSON NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued', -- queued, running, succeeded, failed
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 3,
+    last_error TEXT NULL,
+    run_after DATETIME NOT NULL,
+    locked_by VARCHAR(255) NULL,
+    locked_at DATETIME NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    INDEX idx_background_jobs_claim (status, run_after),
+    INDEX idx_background_jobs_interview (interview_id, job_type),
+    FOREIGN KEY (interview_id) REFERENCES interviews(id) ON DELETE CASCADE
+);
+
+-- Condensed resume profile generated once per candidate by the resume_condensation job.
+-- resume_summary_version identifies the prompt/format that produced it.
+ALTER TABLE candidates
+ADD COLUMN resume_summary TEXT NULL AFTER resume_text,
+ADD COLUMN resume_summary_version VARCHAR(20) NULL AFTER resume_summary;
+
+-- Append-only transcript: one row per turn instead of rewriting interviews.transcript_json.
+-- interviews.transcript_json is kept for old rows only; migrate them with `flask backfill-interview-turns`
+-- (they are also migrated lazily the first time they are read).
+CREATE TABLE IF NOT EXISTS interview_turns (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    interview_id VARCHAR(255) NOT NULL,
+    seq INT NOT NULL,
+    actor VARCHAR(20) NOT NULL, -- 'ai' or 'candidate'
+    text TEXT NOT NULL,
+    created_at DATETIME(6) NOT NULL,
+    UNIQUE KEY uq_interview_turns_seq (interview_id, seq),
+    FOREIGN KEY (interview_id) REFERENCES interviews(id) ON DELETE CASCADE
+);
+
+-- Running summary of the older part of the conversation (maintained by the history_summary job).
+-- history_summary_upto_seq is the last interview_turns.seq the summary covers.
+ALTER TABLE interviews
+ADD COLUMN history_summary TEXT NULL,
+ADD COLUMN history_summary_upto_seq INT NOT NULL DEFAULT 0;
+
+-- One row per webcam capture (replaces read-modify-write of interviews.screenshot_paths_json,
+-- which is still read for interviews recorded before this table existed).
+CREATE TABLE IF NOT EXISTS interview_screenshots (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    interview_id VARCHAR(255) NOT NULL,
+    file_path VARCHAR(512) NOT NULL,
+    byte_size INT NOT NULL,
+    captured_at DATETIME(6) NOT NULL,
+    INDEX idx_interview_screenshots_interview (interview_id, id),
+    FOREIGN KEY (interview_id) REFERENCES interviews(id) ON DELETE CASCADE
+);
+
+-- Small WebP preview generated in the background after each capture.
+ALTER TABLE interview_screenshots
+ADD COLUMN thumbnail_path VARCHAR(512) NULL AFTER file_path;
+
+-- Perceptual (dHash) fingerprint of each capture, used to suppress near-duplicate frames.
+ALTER TABLE interview_screenshots
+ADD COLUMN phash BIGINT UNSIGNED NULL AFTER byte_size,
+ADD COLUMN is_duplicate BOOLEAN NOT NULL DEFAULT FALSE AFTER phash,
+ADD INDEX idx_screenshots_kept (interview_id, is_duplicate, id);
+
+-- Per-address invitation delivery, filled in by the send_invites background job.
+ALTER TABLE interviews
+ADD COLUMN invite_email VARCHAR(255) NULL,
+ADD COLUMN invite_batch_id VARCHAR(36) NULL,
+ADD COLUMN invite_status VARCHAR(20) NULL, -- pending, sent, failed
+ADD COLUMN invite_error TEXT NULL,
+ADD COLUMN invite_sent_at TIMESTAMP NULL,
+ADD INDEX idx_interviews_invite_batch (invite_batch_id, invite_status);
+
+-- Keyset pagination of the admin interview list: one index per sortable column, ending in id so
+-- "ORDER BY <col>, id" and the "(<col>, id) < (cursor)" seek are both served from the index.
+ALTER TABLE interviews
+ADD INDEX idx_interviews_job_score (company_id, job_id, score, id),
+ADD INDEX idx_interviews_job_date (company_id, job_id, interview_date, id),
+ADD INDEX idx_interviews_job_status (company_id, job_id, status, id),
+ADD INDEX idx_interviews_company_score (company_id, score, id); -- dashboard list across all jobs
+
+-- Full-text search (/api/admin/search) over candidates, AI summaries and transcript turns.
+ALTER TABLE candidates ADD FULLTEXT INDEX ft_candidates_name_email (name, email);
+ALTER TABLE interviews ADD FULLTEXT INDEX ft_interviews_ai_summary (ai_summary);
+ALTER TABLE interview_turns ADD FULLTEXT INDEX ft_interview_turns_text (text);
+
+-- Per-company job/interview counts by status, kept in step with every status change so the
+-- dashboard summary reads a few rows instead of counting the tenant's interviews.
+-- Rebuild from scratch with `flask rebuild-dashboard-counters`.
+CREATE TABLE IF NOT EXISTS company_status_counts (
+    company_id VARCHAR(255) NOT NULL,
+    entity VARCHAR(20) NOT NULL, -- 'job' or 'interview'
+    status VARCHAR(50) NOT NULL,
+    count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_id, entity, status)
+);
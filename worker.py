@@ -0,0 +1,8 @@
+from app import create_app
+from app.services.job_queue import run_worker
+
+app = create_app()
+
+if __name__ == '__main__':
+    # Runs background jobs (post-interview analysis, ...) outside the web workers.
+    run_worker(app)